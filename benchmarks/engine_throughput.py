@@ -0,0 +1,83 @@
+# benchmarks/engine_throughput.py
+# Compare checkout throughput per CPU core between the sync and async engines.
+#
+#   python benchmarks/engine_throughput.py --runs 3
+#
+# Each engine runs the checkout suite in its own pytest process. CPU time is
+# taken from the rusage of the reaped children, so it covers the Python
+# process, the Playwright driver and the browser.
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "report", "benchmarks")
+sys.path.insert(0, REPO_ROOT)
+
+SUITES = {
+    "sync": ["tests/test_main.py::test_complete_checkout_flow"],
+    "async": ["tests/test_async_engine.py"],
+}
+
+
+def children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_engine(engine: str, pytest_args: list) -> dict:
+    """Run the checkout suite once on `engine`; return wall and CPU seconds."""
+    cpu_before, started = children_cpu(), time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "-q", f"--engine={engine}",
+         *SUITES[engine], *pytest_args],
+        cwd=REPO_ROOT,
+    )
+    return {"wall": time.perf_counter() - started, "cpu": children_cpu() - cpu_before, "exit": proc.returncode}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare scenario throughput per CPU core of the sync and async engines.")
+    parser.add_argument("--runs", type=int, default=1, help="runs per engine; the median is reported")
+    parser.add_argument("pytest_args", nargs="*", default=[])
+    args = parser.parse_args()
+
+    from utills.excel_reader import ExcelReader
+    scenarios = len(ExcelReader(os.path.join(REPO_ROOT, "data", "test_data.xlsx")).get_order_test_cases())
+
+    rows = []
+    print(f"{'engine':<8}{'wall (s)':>10}{'cpu (s)':>10}{'scen/min':>10}{'scen/cpu-min':>14}{'failed runs':>13}")
+    for engine in SUITES:
+        samples = [run_engine(engine, args.pytest_args) for _ in range(args.runs)]
+        wall = statistics.median(s["wall"] for s in samples)
+        cpu = statistics.median(s["cpu"] for s in samples)
+        row = {
+            "engine": engine,
+            "scenarios": scenarios,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "scenarios_per_min": 60 * scenarios / wall if wall else None,
+            "scenarios_per_cpu_min": 60 * scenarios / cpu if cpu else None,
+            "failed_runs": sum(1 for s in samples if s["exit"] != 0),
+        }
+        rows.append(row)
+        print(f"{engine:<8}{wall:>10.1f}{cpu:>10.1f}{row['scenarios_per_min'] or 0:>10.2f}"
+              f"{row['scenarios_per_cpu_min'] or 0:>14.2f}{row['failed_runs']:>13}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = os.path.join(RESULTS_DIR, f"engine_throughput_{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+    with open(out, "w") as f:
+        json.dump({"runs": args.runs, "engines": rows}, f, indent=2)
+    print(f"\nResults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# benchmarks/import_time.py
+# Import cost of the modules pytest loads before the first test, against a budget.
+#
+#   python benchmarks/import_time.py                          # report
+#   python benchmarks/import_time.py --check                  # exit 1 when over budget or a deferred module is loaded
+#   python benchmarks/import_time.py --check --deferred-only  # only the deferred modules; what the test suite runs
+#
+# Every target is imported in a fresh `python -X importtime` process, after
+# pytest and the Allure plugin (both are loaded by the time pytest reads
+# conftest.py). The best of --runs is kept to ride out a busy machine.
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ("conftest", "tests.test_main", "tests.test_async_engine")
+# Loaded by the fixtures and page objects that need them, never at collection.
+DEFERRED = ("playwright", "greenlet", "requests", "urllib3", "yaml", "pandas", "numpy", "openpyxl", "PIL",
+            "sqlite3", "_pytest.pytester", "stub_store", "pageobject.home_page", "utills.basepage",
+            "utills.adaptive", "utills.cart_seeder", "utills.context_pool", "utills.har_manager",
+            "utills.network_rules", "utills.screenshot_pipeline")
+BUDGET_MS = 150
+
+MARKER = "-- target --"
+PRELUDE = (
+    "import sys, pytest\n"
+    "try:\n"
+    "    import allure_pytest.plugin\n"
+    "except ImportError:\n"
+    "    pass\n"
+    f"sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()\n"
+)
+
+
+def measure(target: str) -> Tuple[float, List[str]]:
+    """Cumulative import time (ms) of `target` and the modules it loaded itself."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"{PRELUDE}import {target}"],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+    lines = proc.stderr.split(MARKER, 1)[1].splitlines()
+    modules, total_us = [], 0
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():  # the header line
+            continue
+        modules.append(name.strip())
+        if name.strip() == target:
+            total_us = int(cumulative)
+    return total_us / 1000, modules
+
+
+def deferred_in(modules: List[str]) -> List[str]:
+    return sorted({m for m in modules for d in DEFERRED if m == d or m.startswith(d + ".")})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of conftest.py and the test modules.")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per target; the fastest counts")
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="total budget in ms over all targets")
+    parser.add_argument("--check", action="store_true", help="exit 1 on a regression")
+    parser.add_argument("--deferred-only", action="store_true",
+                        help="check only that the deferred modules stay unloaded, not the wall-clock budget")
+    args = parser.parse_args()
+
+    results: Dict[str, float] = {}
+    violations = []
+    print(f"{'module':<28}{'import (ms)':>12}  deferred modules loaded")
+    for target in TARGETS:
+        samples = [measure(target) for _ in range(args.runs)]
+        ms, modules = min(samples, key=lambda sample: sample[0])
+        loaded = deferred_in(modules)
+        results[target] = ms
+        violations += [f"{target} imports {name}" for name in loaded]
+        print(f"{target:<28}{ms:>12.1f}  {', '.join(loaded) or '-'}")
+
+    total = sum(results.values())
+    print(f"{'total':<28}{total:>12.1f}  (budget {args.budget:.0f} ms)")
+    if total > args.budget and not args.deferred_only:
+        violations.append(f"import time {total:.1f} ms is over the {args.budget:.0f} ms budget")
+    for violation in violations:
+        print(f"FAIL: {violation}")
+    return 1 if args.check and violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
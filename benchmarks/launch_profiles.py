@@ -0,0 +1,63 @@
+# benchmarks/launch_profiles.py
+# Compare the checkout flow's time and browser memory between launch profiles.
+#
+#   python benchmarks/launch_profiles.py --profiles fast fidelity -- --stub-store
+#
+# Each profile runs the checkout suite in its own pytest process and run id;
+# the per-test samples it records (see utills/launch_profiles.py) are read
+# back from report/timings/<run id>/profiles.json.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "report", "benchmarks")
+TIMINGS_DIR = os.path.join(REPO_ROOT, "report", "timings")
+SUITE = ["tests/test_main.py::test_complete_checkout_flow"]
+
+
+def run_profile(profile: str, pytest_args: list) -> dict:
+    run_id = f"profile-{profile}-{datetime.now():%Y-%m-%d_%H-%M-%S}"
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "-q", f"--launch-profile={profile}",
+         *SUITE, *pytest_args],
+        cwd=REPO_ROOT, env=dict(os.environ, RUN_ID=run_id),
+    )
+    wall = time.perf_counter() - started
+    try:
+        with open(os.path.join(TIMINGS_DIR, run_id, "profiles.json"), "r") as f:
+            samples = json.load(f)
+    except (OSError, ValueError):
+        samples = {}
+    return {"profile": profile, "run_id": run_id, "wall_s": wall, "exit": proc.returncode, "samples": samples}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare launch profiles on the checkout flow.")
+    parser.add_argument("--profiles", nargs="+", default=["fast", "fidelity"])
+    parser.add_argument("pytest_args", nargs="*", default=[])
+    args = parser.parse_args()
+
+    rows = [run_profile(profile, args.pytest_args) for profile in args.profiles]
+    print(f"\n{'profile':<18}{'wall (s)':>10}{'tests':>7}{'p50 test (s)':>14}{'p50 RSS (MB)':>14}{'exit':>6}")
+    for row in rows:
+        for key, stats in sorted(row["samples"].items()) or [(row["profile"], {})]:
+            print(f"{key:<18}{row['wall_s']:>10.1f}{stats.get('tests', 0):>7}{stats.get('p50_s') or 0:>14.1f}"
+                  f"{stats.get('p50_rss_mb') or 0:>14.0f}{row['exit']:>6}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = os.path.join(RESULTS_DIR, f"launch_profiles_{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+    with open(out, "w") as f:
+        json.dump(rows, f, indent=2)
+    print(f"\nResults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
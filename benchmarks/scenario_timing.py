@@ -0,0 +1,88 @@
+# benchmarks/scenario_timing.py
+# Compare wall-clock time per Excel scenario between two git revisions.
+#
+#   python benchmarks/scenario_timing.py --before <ref> --after HEAD
+#
+# Each revision is checked out into a temporary git worktree and the checkout
+# suite is run there with --junitxml. The per-testcase durations (setup + call
+# + teardown) are then tabulated side by side.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "report", "benchmarks")
+
+
+def run_suite(ref: str, pytest_args: list, workdir: str) -> dict:
+    """Run the suite at `ref` once and return {scenario: seconds}."""
+    tree = os.path.join(workdir, ref.replace("/", "_"))
+    if not os.path.exists(tree):
+        subprocess.run(["git", "worktree", "add", "--detach", tree, ref], cwd=REPO_ROOT, check=True)
+    junit = os.path.join(workdir, f"{ref.replace('/', '_')}.xml")
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", f"--junitxml={junit}", *pytest_args],
+        cwd=tree,
+    )
+    timings = {}
+    for case in ET.parse(junit).getroot().iter("testcase"):
+        name = case.get("name", "")
+        scenario = name[name.find("[") + 1:-1] if "[" in name else name
+        timings[scenario] = float(case.get("time", 0))
+    return timings
+
+
+def collect(ref: str, runs: int, pytest_args: list, workdir: str) -> dict:
+    """Median duration per scenario over `runs` runs."""
+    samples = {}
+    for _ in range(runs):
+        for scenario, seconds in run_suite(ref, pytest_args, workdir).items():
+            samples.setdefault(scenario, []).append(seconds)
+    return {scenario: statistics.median(values) for scenario, values in samples.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare wall-clock time per scenario between two git refs.")
+    parser.add_argument("--before", required=True, help="git ref of the baseline")
+    parser.add_argument("--after", default="HEAD", help="git ref to compare against the baseline")
+    parser.add_argument("--runs", type=int, default=1, help="runs per ref; the median is reported")
+    parser.add_argument("pytest_args", nargs="*", default=["tests/test_main.py"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="scenario-bench-") as workdir:
+        try:
+            before = collect(args.before, args.runs, args.pytest_args, workdir)
+            after = collect(args.after, args.runs, args.pytest_args, workdir)
+        finally:
+            subprocess.run(["git", "worktree", "prune"], cwd=REPO_ROOT)
+
+    print(f"{'Scenario':<20}{'before (s)':>12}{'after (s)':>12}{'delta (s)':>12}{'speedup':>10}")
+    rows = []
+    for scenario in sorted(set(before) | set(after)):
+        b, a = before.get(scenario), after.get(scenario)
+        delta = (a - b) if a is not None and b is not None else None
+        speedup = (b / a) if a and b else None
+        rows.append({"scenario": scenario, "before": b, "after": a, "delta": delta, "speedup": speedup})
+        print(f"{scenario:<20}"
+              f"{b if b is not None else float('nan'):>12.2f}"
+              f"{a if a is not None else float('nan'):>12.2f}"
+              f"{delta if delta is not None else float('nan'):>12.2f}"
+              f"{speedup if speedup is not None else float('nan'):>9.2f}x")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out = os.path.join(RESULTS_DIR, f"scenario_timing_{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+    with open(out, "w") as f:
+        json.dump({"before": args.before, "after": args.after, "runs": args.runs, "scenarios": rows}, f, indent=2)
+    print(f"\nResults written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,99 @@
 # Developer: Bikash
 
+# Playwright, requests, PyYAML, Pillow, the page objects and the helpers only
+# fixtures need (context pool, HAR, network rules, screenshots, and SQLite
+# through utills.adaptive) are imported where they are used, so collection
+# and --collect-only stay fast; benchmarks/import_time.py keeps an eye on it.
+
 import pytest
-from playwright.sync_api import sync_playwright
 import os
 import allure
+import allure_commons
+import copy
 import functools
-import yaml
 import logging
 import json
+import shutil
 from datetime import datetime
-from typing import Dict, Generator
-import requests
+from typing import TYPE_CHECKING, Dict, Generator, Optional
+from locators.registry import registry
 from utills.excel_reader import ExcelReader
+from utills.sharding import DurationStore, balance
+from utills import (allure_store, browser_matrix, forensics, launch_profiles, reruns, run_summary, scenario_planner,
+                    timing)
+
+if TYPE_CHECKING:
+    from utills import adaptive
+    from utills.cart_seeder import GuestCartSeeder
+    from utills.har_manager import HarManager
+    from utills.network_rules import InterceptionEngine
+    from utills.catalog_index import CatalogIndex
+    from utills.checkpoints import ScenarioCheckpoints
+    from utills.state_snapshots import StateSnapshotManager
 
 CONFIG_PATH = 'config/config.yaml'
 SCREENSHOT_DIR = "report/screenshots"
-ALLURE_REPORT_DIR = "report/allure"
 EXCEL_PATH = "data/test_data.xlsx"
+CACHE_DIR = ".cache"
+DURATIONS_PATH = os.path.join(CACHE_DIR, "durations.json")
+CONFIG_CACHE_DIR = os.path.join(CACHE_DIR, "config")
+ENGINES = ("sync", "async")
+LANES = ("all", "stable", "quarantine")
+
+duration_store = DurationStore(DURATIONS_PATH)
+# --alluredir when the content-addressed result store has taken it over.
+allure_results_dir = None
+# Set by the first test report; the Allure scaffolding is only written for runs that produced results.
+results_written = False
+# browser_matrix.Cascade when --cascade runs the other browsers only where the first one passed.
+cascade = None
+# adaptive.enabled; utills.adaptive (and SQLite) is only imported when it is set.
+adaptive_enabled = False
+
+ATTACHMENT_TYPES = {
+    "jpeg": allure.attachment_type.JPG,
+    "png": allure.attachment_type.PNG,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_config(config_path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse the YAML once per version of the file.
+
+    A JSON copy in .cache/config is read while the file is unchanged, so
+    PyYAML is only imported after an edit.
+    """
+    cache_path = os.path.join(CONFIG_CACHE_DIR, os.path.basename(config_path) + ".json")
+    try:
+        with open(cache_path) as file:
+            cached = json.load(file)
+        if cached["mtime_ns"] == mtime_ns and cached["size"] == size:
+            return cached["config"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    import yaml
+    with open(config_path, 'r') as file:
+        config = yaml.safe_load(file)
+    try:
+        # Only plain YAML round-trips through JSON (no dates, no non-string keys).
+        if json.loads(json.dumps(config)) == config:
+            os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump({"mtime_ns": mtime_ns, "size": size, "config": config}, file)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logging.getLogger(__name__).debug(f"Config not cached: {e}")
+    return config
 
 
 def load_yaml_config(config_path: str) -> Dict:
     """Load and validate configuration from YAML file."""
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        stat = os.stat(config_path)
+        # Callers may adjust their copy (the stub store rewrites `urls`).
+        config = copy.deepcopy(_parse_config(config_path, stat.st_mtime_ns, stat.st_size))
         required_keys = ['environment', 'urls', 'credentials', 'timeouts', 'reporting']
         if not all(key in config for key in required_keys):
             raise ValueError(f"Config file missing required sections: {required_keys}")
@@ -32,46 +102,189 @@ def load_yaml_config(config_path: str) -> Dict:
         pytest.fail(f"Failed to load config: {str(e)}")
 
 
+def adaptive_db(cfg: Dict) -> "adaptive.TimingDB":
+    from utills import adaptive
+
+    return adaptive.TimingDB((cfg.get('adaptive') or {}).get('db', adaptive.DB_PATH))
+
+
+def use_stub_store(pytestconfig, cfg: Dict) -> bool:
+    return pytestconfig.getoption("stub_store") or bool((cfg.get('stub_store') or {}).get('enabled'))
+
+
 @pytest.fixture(scope='session')
-def config() -> Dict:
+def config(request) -> Dict:
     """Provide configuration as a session-scoped fixture."""
-    return load_yaml_config(CONFIG_PATH)
+    cfg = load_yaml_config(CONFIG_PATH)
+    if use_stub_store(request.config, cfg):
+        cfg['urls'] = request.getfixturevalue("stub_server").urls()
+    select_launch_profile(request.config, cfg)
+    return cfg
+
 
+def select_launch_profile(pytestconfig, cfg: Dict) -> None:
+    """Apply --launch-profile to cfg, so the async engine sees it too."""
+    if pytestconfig.getoption("launch_profile"):
+        cfg['launch'] = dict(cfg.get('launch') or {}, profile=pytestconfig.getoption("launch_profile"))
 
+
+@pytest.fixture(scope="session")
+def stub_server() -> Generator:
+    """Local Magento storefront stub; one per worker process, each with its own carts."""
+    from stub_store import MagentoStubServer
+
+    settings = load_yaml_config(CONFIG_PATH).get('stub_store') or {}
+    with MagentoStubServer(settings.get('host', "127.0.0.1"), settings.get('port', 0)) as server:
+        logging.getLogger(__name__).info(f"Magento stub serving on {server.base_url}")
+        yield server
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("parallel", "parallel scenario execution")
+    group.addoption("--shard-count", type=int, default=1,
+                    help="Split the scenarios into N cost-balanced shards.")
+    group.addoption("--shard-index", type=int, default=0,
+                    help="Run only this shard (0-based) out of --shard-count.")
+
+    group = parser.getgroup("har", "HAR record and replay")
+    group.addoption("--har-mode", choices=("off", "record", "replay"), default=None,
+                    help="Record storefront traffic per scenario, or replay it offline (overrides har.mode).")
+    group.addoption("--har-dir", default=None, help="Directory of the HAR archives (overrides har.dir).")
+
+    parser.addoption("--lane", choices=LANES, default="all",
+                     help="'stable' skips tests found flaky in past runs; 'quarantine' runs only those, "
+                          "rerunning failures quarantine.reruns times.")
+
+    group = parser.getgroup("matrix", "browser matrix")
+    group.addoption("--browsers", default=None,
+                    help="Run every browser test on each of these browser types, e.g. chromium,firefox,webkit "
+                         "(overrides matrix.browsers).")
+    group.addoption("--cascade", action="store_true", default=None,
+                    help="Run the first of --browsers first and the others only on the tests it passed.")
+
+    group = parser.getgroup("coordinator", "distributed execution")
+    group.addoption("--coordinator", default=None, metavar="HOST:PORT",
+                    help="Run as a worker of python -m utills.coordinator: take scenarios from it one at a time "
+                         "and send back results and Allure files (also unix:/path).")
+
+    parser.addoption("--resume", action="store_true", default=False,
+                     help="Start checkout scenarios from their latest checkpoint of an earlier run "
+                          "(reruns always do).")
+    parser.addoption("--launch-profile", default=None,
+                     help="Browser launch profile from launch.profiles, e.g. fast, fidelity or debug "
+                          "(overrides launch.profile).")
+    parser.addoption("--engine", choices=ENGINES, default=None,
+                     help="Playwright API driving the checkout scenarios (overrides engine.type).")
+    parser.addoption("--stub-store", action="store_true", default=False,
+                     help="Run against the local Magento stub in stub_store/ instead of urls.base_url.")
+
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
     """Configure pytest environment and Allure reporting."""
+    global allure_results_dir, adaptive_enabled
     cfg = load_yaml_config(CONFIG_PATH)
+    if config.getoption("coordinator"):
+        # Takes the coordinator's run id and sets --alluredir, so it comes before both are used.
+        from utills import coordinator
+        coordinator.configure_worker(config, scenario_of)
+    # One id per run, shared by xdist workers and parallel_runner shards through the environment.
+    os.environ.setdefault("RUN_ID", datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
+
+    # Runs before allure-pytest's own pytest_configure: take over --alluredir so
+    # attachments go to the content-addressed store instead of UUID-named copies.
+    store_cfg = cfg['reporting'].get('store') or {}
+    if getattr(config.option, "allure_report_dir", None) and store_cfg.get('enabled', True):
+        allure_results_dir = config.option.allure_report_dir
+        config.option.allure_report_dir = None
+        allure_store.install(config, allure_results_dir, os.environ["RUN_ID"])
+
+    config.addinivalue_line(
+        "markers",
+        "storage_state(name, consume=False): load the named state snapshot (consent, customer, cart) into the "
+        "context; None starts from an empty context. consume=True rebuilds the snapshot after the test."
+    )
+    config.addinivalue_line(
+        "markers",
+        "seeded_cart: needs cart_seeding.enabled and the stub store (--stub-store), the only storefront that "
+        "reads the guest cart from the cart_seeding.cookie cookie."
+    )
+    config.addinivalue_line(
+        "markers",
+        "engine(name): run only when the selected engine (--engine or engine.type) is 'sync' or 'async'; "
+        "unmarked browser tests are sync."
+    )
 
-    # Setup directories
-    os.makedirs(SCREENSHOT_DIR, exist_ok=True)
-    os.makedirs(ALLURE_REPORT_DIR, exist_ok=True)
+    # Step timings: one JSON lines file per worker under a directory per run.
+    timing_cfg = cfg.get('timing') or {}
+    timing.recorder.enabled = timing_cfg.get('enabled', True)
+    if timing.recorder.enabled:
+        allure_commons.plugin_manager.register(timing.recorder, name="step-timing")
+
+    # Wait timeouts learned from the p99 of earlier runs (see utills/adaptive.py).
+    adaptive_enabled = bool((cfg.get('adaptive') or {}).get('enabled'))
+    if adaptive_enabled:
+        from utills import adaptive
+        adaptive.policy.configure(cfg.get('adaptive'), adaptive_db(cfg))
+        adaptive.outcomes.enabled = True
+
+    # Under pytest-xdist, keep each balanced shard on one worker.
+    if getattr(config.option, "dist", "no") == "load":
+        config.option.dist = "loadgroup"
+
+    select_launch_profile(config, cfg)
+    try:
+        launch_profiles.LaunchProfile.from_config(cfg.get('launch'), cfg['environment'])
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+    global cascade
+    browsers = selected_browsers(config, cfg)
+    cascade_enabled = config.getoption("cascade") or (cfg.get('matrix') or {}).get('cascade', False)
+    cascade = browser_matrix.Cascade(browsers) if cascade_enabled and len(browsers) > 1 else None
+
+
+def write_report_scaffolding(report_dir: str, cfg: Dict, browsers) -> None:
+    """Environment, categories and executor files of the Allure report."""
+    os.makedirs(report_dir, exist_ok=True)
 
     # Environment properties
     env_data = cfg['environment']
     env_props = [
-        f"Browser={env_data['browser']}",
+        f"Browser={', '.join(browsers) or env_data['browser']}",
         f"Platform={env_data['platform']}",
         f"TestedBy={env_data['tested_by']}"
     ]
-    with open(os.path.join(ALLURE_REPORT_DIR, "environment.properties"), "w") as f:
-        f.write("\n".join(env_props))
+    allure_store.write_if_changed(os.path.join(report_dir, "environment.properties"), "\n".join(env_props))
 
     # Categories definition
     categories = [
         {"name": "Regression", "matchedStatuses": ["passed", "failed"]},
         {"name": "Known Issues", "matchedStatuses": ["broken"], "traceRegex": ".*known_issue.*"}
     ]
-    with open(os.path.join(ALLURE_REPORT_DIR, "categories.json"), "w") as f:
-        json.dump(categories, f, indent=2)
+    allure_store.write_if_changed(os.path.join(report_dir, "categories.json"), json.dumps(categories, indent=2))
 
     # Executor info
-    with open(os.path.join(ALLURE_REPORT_DIR, "executor.json"), "w") as f:
-        json.dump(cfg['executor'], f, indent=2)
+    allure_store.write_if_changed(os.path.join(report_dir, "executor.json"), json.dumps(cfg['executor'], indent=2))
+
+
+@pytest.fixture(scope="session")
+def excel_reader() -> ExcelReader:
+    """Session-wide access to the Excel test data."""
+    return ExcelReader(EXCEL_PATH)
+
+
+@pytest.fixture(scope="session")
+def customer_data(excel_reader):
+    """Customer row used for the shipping address."""
+    return excel_reader.get_customer()
 
 
 @pytest.fixture(scope="session")
 def api_request(config):
     """Fixture for making API requests with Playwright context."""
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as playwright:
         context = playwright.request.new_context(
             base_url=config['urls']['api_base_url'],
@@ -87,6 +300,8 @@ def api_request(config):
 @pytest.fixture(scope="session")
 def http_session(config):
     """Fixture for making API requests using requests library."""
+    import requests
+
     session = requests.Session()
     session.headers.update({
         "Content-Type": "application/json",
@@ -96,98 +311,394 @@ def http_session(config):
     session.close()
 
 
+@pytest.fixture(scope="session")
+def cart_seeder(config, http_session) -> "GuestCartSeeder":
+    """Guest-cart seeding service on top of the REST session."""
+    from utills.cart_seeder import GuestCartSeeder
+
+    return GuestCartSeeder(http_session, config['urls']['api_base_url'], config.get('cart_seeding'))
+
+
 class AllureScreenshotHandler(logging.Handler):
-    """Custom logging handler for screenshots in Allure."""
-    def __init__(self, page):
-        super().__init__()
+    """Logging handler that queues a screenshot for every captured record.
+
+    Records below the handler level are ignored, and only every
+    `sample_every`-th eligible record below ERROR is captured. The frames are
+    encoded and written by the ScreenshotPipeline thread and attached to Allure
+    when the test finishes.
+    """
+    def __init__(self, page, pipeline, test_id, level=logging.WARNING, sample_every=1):
+        super().__init__(level)
         self.page = page
+        self.pipeline = pipeline
+        self.test_id = test_id
+        self.sample_every = max(1, sample_every)
+        self._eligible = 0
 
     def emit(self, record):
         try:
-            msg = self.format(record)
-            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            screenshot_name = f"{record.levelname}_{timestamp}"
-            screenshot_path = os.path.join(SCREENSHOT_DIR, f"{screenshot_name}.png")
-
-            if self.page:
-                self.page.screenshot(path=screenshot_path)
-                with allure.step(msg):
-                    allure.attach.file(
-                        screenshot_path,
-                        name=screenshot_name,
-                        attachment_type=allure.attachment_type.PNG
-                    )
+            if record.levelno < logging.ERROR:
+                self._eligible += 1
+                if (self._eligible - 1) % self.sample_every:
+                    return
+            if self.page and not self.page.is_closed():
+                self.pipeline.capture(self.page, self.test_id, self.format(record))
         except Exception as e:
-            logging.error(f"Failed to capture screenshot for log: {e}")
+            logging.debug(f"Failed to capture screenshot for log: {e}")
+
+    def attach_frames(self):
+        """Attach the frames of this test that survived the disk budgets."""
+        for frame in self.pipeline.frames_for(self.test_id):
+            with allure.step(frame.title):
+                allure.attach.file(
+                    frame.path,
+                    name=os.path.basename(frame.path),
+                    attachment_type=ATTACHMENT_TYPES.get(self.pipeline.format),
+                    extension=self.pipeline.extension
+                )
+            if allure_results_dir:
+                # The store now holds (a hard link to) the frame; keep a single copy.
+                os.remove(frame.path)
+
+
+@pytest.fixture(scope="session")
+def screenshot_pipeline(config) -> Generator:
+    """Background pipeline shared by all screenshot handlers in this process."""
+    from utills.screenshot_pipeline import create_pipeline
+
+    pipeline = create_pipeline(SCREENSHOT_DIR, config.get('screenshots'))
+    yield pipeline
+    pipeline.close()
+
+
+@pytest.fixture(scope="session")
+def matrix_browser(config) -> str:
+    """Browser type of the current test; parametrized over the matrix when --browsers is given."""
+    return config['environment']['browser']
+
+
+@pytest.fixture(scope="session")
+def launch_profile(config) -> launch_profiles.LaunchProfile:
+    """Launch options, viewport and resource blocking of the selected profile."""
+    return launch_profiles.LaunchProfile.from_config(config.get('launch'), config['environment'])
 
 
 @pytest.fixture(scope="session")
-def browser(config) -> Generator:
-    """Launch browser instance with configuration."""
+def browser(config, matrix_browser, launch_profile) -> Generator:
+    """Launch browser instance with configuration.
+
+    Session scope means one Playwright instance and browser per process, so
+    every pytest-xdist worker or shard process owns its own browser (one per
+    browser type it runs under --browsers).
+    """
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as playwright:
-        browser_type = getattr(playwright, config['environment']['browser'])
-        browser = browser_type.launch(headless=config['environment'].get('headless', False))
+        browser_type = getattr(playwright, matrix_browser)
+        browser = browser_type.launch(**launch_profile.launch_options(matrix_browser))
         yield browser
         browser.close()
 
 
 @pytest.fixture(scope="session")
-def browser_context(config, browser) -> Generator:
-    """Create browser context and block ads/tracking."""
+def state_snapshots(config, browser) -> "StateSnapshotManager":
+    """Per-worker cache of pre-warmed storage_state files."""
+    from utills.state_snapshots import StateSnapshotManager
+
+    return StateSnapshotManager(browser, config)
+
+
+def snapshot_marker(item, cfg: Dict):
+    """Name of the snapshot `item` loads and whether it consumes it; (None, False) without one."""
+    settings = cfg.get('state_snapshots') or {}
+    if not settings.get('enabled'):
+        return None, False
+    marker = item.get_closest_marker("storage_state")
+    if marker is None:
+        return settings.get('default', 'consent'), False
+    return marker.args[0], bool(marker.kwargs.get("consume"))
+
+
+@pytest.fixture(scope="function")
+def storage_state(request, config) -> Generator:
+    """Path of the storage_state snapshot to load, or None.
+
+    A consumed snapshot is discarded after the test, so later tests do not
+    inherit what it changed on the server (e.g. a coupon on the cart's quote).
+    """
+    name, consume = snapshot_marker(request.node, config)
+    if not name:
+        yield None
+        return
+    snapshots = request.getfixturevalue("state_snapshots")
+    yield snapshots.get(name)
+    if consume:
+        snapshots.discard(name)
+
+
+@pytest.fixture(scope="session")
+def interception_engine(config, launch_profile) -> "InterceptionEngine":
+    """Compiled block rules, the launch profile's resource filter and the shared static asset cache."""
+    from utills.network_rules import InterceptionEngine
+
+    return InterceptionEngine.from_config(config.get('network'),
+                                          launch_profile.resource_filter(config['urls']['base_url']))
+
+
+@pytest.fixture(scope="session")
+def har_manager(config, pytestconfig) -> "HarManager":
+    """HAR record/replay settings for this run."""
+    from utills.har_manager import HarManager
+
+    return HarManager(config.get('har'), pytestconfig.getoption("har_mode"), pytestconfig.getoption("har_dir"))
+
+
+@pytest.fixture(scope="function")
+def scenario_id(request) -> str:
+    """Excel scenario ID of the current test, or the test name outside the data-driven tests."""
+    return scenario_of(request.node)
+
+
+@pytest.fixture(scope="session")
+def catalog_index(config) -> Optional["CatalogIndex"]:
+    """Category and product URLs learned in earlier sessions, or None when the index is disabled."""
+    from utills.catalog_index import CACHE_DIR, CatalogIndex
+
+    settings = config.get('catalog_index') or {}
+    if not settings.get('enabled'):
+        return None
+    return CatalogIndex(config['urls']['base_url'], settings.get('dir', CACHE_DIR), settings.get('ttl_seconds', 86400))
+
+
+@pytest.fixture(scope="function")
+def checkpoints(request, config, scenario_id, matrix_browser) -> Optional["ScenarioCheckpoints"]:
+    """Checkpoints of this scenario on this browser, or None when checkpoints are disabled.
+
+    They are saved on every attempt but only resumed from on a rerun or with --resume.
+    """
+    from utills.checkpoints import CACHE_DIR, ScenarioCheckpoints, data_digest
+
+    settings = config.get('checkpoints') or {}
+    if not settings.get('enabled'):
+        return None
+    data = [request.getfixturevalue(name) for name in ("order_test_data", "customer_data")
+            if name in request.fixturenames]
+    resume = request.config.getoption("resume") or getattr(request.node, "execution_count", 1) > 1
+    return ScenarioCheckpoints(f"{scenario_id}-{matrix_browser}", data_digest(config['urls']['base_url'], *data),
+                               settings.get('dir', CACHE_DIR), settings.get('ttl_seconds', 1800), resume)
+
+
+def scenario_of(item) -> str:
+    callspec = getattr(item, "callspec", None)
+    if callspec and "order_test_data" in callspec.params:
+        return str(callspec.params["order_test_data"]["Scenario"])
+    return item.name
+
+
+def new_browser_context(browser, config, storage_state, interception_engine, launch_profile, static_cache=True,
+                        **options):
+    """Create a context with viewport, routes and default timeouts applied."""
     context = browser.new_context(
-        viewport={'width': 1920, 'height': 1080},
-        locale='en-US'
+        viewport=launch_profile.viewport,
+        locale='en-US',
+        storage_state=storage_state,
+        **options
     )
+    interception_engine.install(context, static_cache=static_cache)
+    context.clear_permissions()
+    context.set_default_timeout(config['timeouts']['element_wait'])
+    return context
 
-    def block_ads(route, request):
-        blocked_domains = ["ads", "doubleclick.net", "googlesyndication"]
-        if any(bad in request.url for bad in blocked_domains):
-            route.abort()
-        else:
-            route.continue_()
 
-    context.route("**/*", block_ads)
-    context.clear_cookies()
-    context.clear_permissions()
+@pytest.fixture(scope="session")
+def context_pools(config, browser, interception_engine, launch_profile) -> Generator:
+    """Warm context pools, one per storage_state snapshot."""
+    from utills.context_pool import ContextPool
+
+    settings = config.get('context_pool') or {}
+    pools = {}
+
+    def pool_for(storage_state) -> ContextPool:
+        # A rebuilt snapshot file gets its own pool; the older pool's contexts hold the previous state.
+        key = (storage_state, os.path.getmtime(storage_state) if storage_state else 0)
+        if key not in pools:
+            pools[key] = ContextPool(
+                functools.partial(new_browser_context, browser, config, storage_state, interception_engine,
+                                  launch_profile),
+                storage_state,
+                size=settings.get('size', 2),
+                max_uses=settings.get('max_uses', 20),
+                memory_limit_mb=settings.get('memory_limit_mb', 512)
+            )
+            pools[key].warm()
+        return pools[key]
+
+    yield pool_for
+    for pool in pools.values():
+        pool.close()
+
+
+@pytest.fixture(scope="function")
+def pooled_context(request, config, storage_state, har_manager) -> Generator:
+    """Context and page borrowed from the pool, or None when pooling is off.
+
+    HAR routes are per scenario and video covers a context's whole life, so
+    HAR runs and failure videos always get a fresh context, as do tests that
+    consume their snapshot.
+    """
+    if (not (config.get('context_pool') or {}).get('enabled') or har_manager.enabled
+            or (config.get('forensics') or {}).get('video') or snapshot_marker(request.node, config)[1]):
+        yield None
+        return
+    pool = request.getfixturevalue("context_pools")(storage_state)
+    pooled = pool.acquire()
+    yield pooled
+    pool.release(pooled)
 
-    context.set_default_timeout(config['timeouts']['element_wait'])
+
+@pytest.fixture(scope="function")
+def browser_context(request, config, browser, matrix_browser, storage_state, interception_engine, launch_profile,
+                    har_manager, pooled_context) -> Generator:
+    """Provide an isolated browser context per test, pooled when enabled."""
+    video = forensics.video_options(config.get('forensics'))
+    if pooled_context is not None:
+        context = pooled_context.context
+    else:
+        # Replays must not reach the network, so the static cache is left out.
+        context = new_browser_context(browser, config, storage_state, interception_engine, launch_profile,
+                                      static_cache=har_manager.mode != "replay", **video)
+        # Per test and browser: other tests of the same Excel row load other pages.
+        har_manager.prepare(context, request.node.name, matrix_browser)
+    # Pages are usually closed before this teardown, so remember them for their videos.
+    opened = []
+    if video:
+        context.on("page", opened.append)
 
     yield context
-    context.close()
+    if pooled_context is None:
+        videos = [p.video for p in opened if p.video]
+        context.close()  # finalizes the video files
+        if video:
+            attach_videos(videos, forensics.item_failed(request.node))
+            shutil.rmtree(video["record_video_dir"], ignore_errors=True)
+
+    stats = interception_engine.reset_stats().as_dict()
+    logging.getLogger(__name__).info(f"Network: {stats}")
+    allure.attach(json.dumps(stats, indent=2), name="Network summary",
+                  attachment_type=allure.attachment_type.JSON)
+
+
+def attach_videos(videos, failed: bool) -> None:
+    """Attach the low-resolution videos of a failed test; nothing is kept on a pass."""
+    for index, video in enumerate(videos, 1):
+        try:
+            if failed:
+                allure.attach.file(video.path(), name=f"Video {index}", attachment_type=allure.attachment_type.WEBM)
+            video.delete()
+        except Exception as e:
+            logging.getLogger(__name__).debug(f"Could not handle video: {e}")
 
 
-# @pytest.fixture(scope="session")
-# def browser_context(config, browser) -> Generator:
-#     """Create browser context with timeout settings."""
-#     context = browser.new_context(
-#         viewport={'width': 1920, 'height': 1080},
-#         locale='en-US'
-#     )
-#     context.set_default_timeout(config['timeouts']['page_load'])
-#     yield context
-#     context.close()
+@pytest.fixture(autouse=True)
+def failure_forensics(request, config):
+    """Playwright trace of the test, exported and attached only if the test fails."""
+    settings = config.get('forensics') or {}
+    if not settings.get('trace') or "page" not in request.fixturenames:
+        yield
+        return
+    trace = forensics.FailureTrace(
+        request.getfixturevalue("browser_context"),
+        group_depth=settings.get('group_depth', 2),
+        snapshots=settings.get('snapshots', True),
+        screenshots=settings.get('screenshots', True)
+    )
+    trace.start()
+    yield
+    path = trace.finish(forensics.item_failed(request.node))
+    if path and os.path.exists(path):
+        allure.attach.file(path, name="Trace", extension="zip")
+        allure.attach("Open with: playwright show-trace <attachment>.zip", name="Trace viewer",
+                      attachment_type=allure.attachment_type.TEXT)
+    trace.cleanup()
 
 
 @pytest.fixture(scope="function")
-def page(browser_context) -> Generator:
-    """Provide a fresh page for each test."""
+def page(browser_context, pooled_context) -> Generator:
+    """Provide a page for each test: the recycled pooled page, or a fresh one."""
+    if pooled_context is not None:
+        yield pooled_context.page
+        return
     page = browser_context.new_page()
     yield page
     page.close()
 
 
 @pytest.fixture(autouse=True)
-def setup_logging(page):
-    """Configure logging with Allure integration."""
+def setup_logging(request, config):
+    """Configure logging with Allure integration for tests that use a page."""
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
-    handler = AllureScreenshotHandler(page)
+    if "page" not in request.fixturenames:
+        yield
+        return
+
+    settings = config.get('screenshots') or {}
+    handler = AllureScreenshotHandler(
+        request.getfixturevalue("page"),
+        request.getfixturevalue("screenshot_pipeline"),
+        request.node.nodeid,
+        level=logging.getLevelName(settings.get('capture_level', 'WARNING')),
+        sample_every=settings.get('sample_every', 1)
+    )
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
-    if not any(isinstance(h, AllureScreenshotHandler) for h in logger.handlers):
-        logger.addHandler(handler)
-    yield
     logger.handlers = [h for h in logger.handlers if not isinstance(h, AllureScreenshotHandler)]
+    logger.addHandler(handler)
+    yield
+    logger.removeHandler(handler)
+    handler.attach_frames()
+
+
+def timing_run_dir(config) -> str:
+    return run_summary.timing_run_dir(config, os.environ["RUN_ID"])
+
+
+def process_name(pytestconfig) -> str:
+    """Name of this process's files in the run directory it shares with the other shards and workers."""
+    parts = []
+    worker = pytestconfig.pluginmanager.get_plugin("coordinator-worker")
+    if worker:
+        parts.append(worker.name)
+    if pytestconfig.getoption("shard_count") > 1:
+        parts.append(f"shard{pytestconfig.getoption('shard_index')}")
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        parts.append(os.environ["PYTEST_XDIST_WORKER"])
+    return "-".join(parts) or "main"
+
+
+def runs_whole_session(pytestconfig) -> bool:
+    """False for shards and coordinator workers, whose runner writes the run-wide reports after all exit."""
+    return (not hasattr(pytestconfig, "workerinput") and pytestconfig.getoption("shard_count") <= 1
+            and not pytestconfig.getoption("coordinator"))
+
+
+@pytest.fixture(autouse=True)
+def step_timing(request, config):
+    """Record BasePage action and Allure step timings for this test."""
+    if not timing.recorder.enabled:
+        yield
+        return
+    scenario = request.getfixturevalue("scenario_id")
+    timing.recorder.start_test(request.node.nodeid, scenario, getattr(request.node, "execution_count", 1) - 1)
+    yield
+    rows = timing.recorder.finish_test()
+    timing.write_jsonl(os.path.join(timing_run_dir(config), f"{process_name(request.config)}.jsonl"), rows)
+    if rows:
+        allure.attach(timing.format_table(rows), name="Step timings", attachment_type=allure.attachment_type.TEXT)
+        allure.dynamic.parameter("wait_ms", round(sum(r["wait_ms"] for r in rows if r["kind"] == "action")),
+                                 excluded=True)
+        allure.dynamic.parameter("action_ms", round(sum(r["action_ms"] for r in rows if r["kind"] == "action")),
+                                 excluded=True)
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
@@ -195,23 +706,175 @@ def pytest_runtest_makereport(item, call):
     """Attach screenshots on test failure."""
     outcome = yield
     report = outcome.get_result()
+    # Fixtures read these in teardown to keep traces and videos of failed tests only.
+    setattr(item, f"rep_{report.when}", report)
+    # One outcome per attempt, for flakiness tracking: the call, or a setup that failed.
+    attempt_done = (report.when == "call" or (report.when == "setup" and report.failed)) and not report.skipped
+    if adaptive_enabled and attempt_done:
+        from utills import adaptive
+        adaptive.outcomes.record(item.nodeid, scenario_of(item), getattr(item, "execution_count", 1),
+                                 report.passed)
+    profile = item.funcargs.get("launch_profile")
+    if report.when == "call" and profile is not None:
+        # Taken while the test's context is still open.
+        launch_profiles.recorder.record(profile.name, item.funcargs.get("matrix_browser"), item.nodeid,
+                                        scenario_of(item), report.duration, launch_profiles.browser_rss_mb())
     if report.when == "call" and report.failed:
         page = item.funcargs.get("page")
         if page:
-            screenshot_path = os.path.join(SCREENSHOT_DIR, f"{item.name}_failure.png")
             try:
-                page.screenshot(path=screenshot_path)
-                allure.attach.file(
-                    screenshot_path,
+                quality = ((item.funcargs.get("config") or {}).get('screenshots') or {}).get('quality', 70)
+                allure.attach(
+                    page.screenshot(type="jpeg", quality=quality),
                     name=f"Failure - {item.name}",
-                    attachment_type=allure.attachment_type.PNG
+                    attachment_type=allure.attachment_type.JPG
                 )
             except Exception as e:
                 logging.error(f"Failed to capture failure screenshot: {e}")
 
 
+def selected_engine(pytestconfig, cfg: Dict) -> str:
+    return pytestconfig.getoption("engine") or (cfg.get('engine') or {}).get('type', "sync")
+
+
+def selected_browsers(pytestconfig, cfg: Dict) -> list:
+    """Browser types of the matrix; empty when only environment.browser runs."""
+    try:
+        return browser_matrix.parse_browsers(pytestconfig.getoption("browsers"),
+                                             (cfg.get('matrix') or {}).get('browsers'))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+
+def assign_shards(nodeids, browsers, shards: int) -> Dict[str, int]:
+    if browsers:
+        return browser_matrix.assign(nodeids, browsers, duration_store, shards, cascade=cascade is not None)
+    return balance(nodeids, duration_store, shards)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Select this process' lane and shard and group scenarios for pytest-xdist workers."""
+    cfg = load_yaml_config(CONFIG_PATH)
+    engine = selected_engine(config, cfg)
+    for item in items:
+        marker = item.get_closest_marker("engine")
+        if marker is not None and marker.args[0] != engine:
+            item.add_marker(pytest.mark.skip(reason=f"{marker.args[0]} engine test; the {engine} engine is selected"))
+        elif marker is None and engine != "sync" and "page" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.skip(reason=f"sync engine test; the {engine} engine is selected"))
+
+    cart = (cfg.get('state_snapshots') or {}).get('cart') or {}
+    for item in items:
+        if snapshot_marker(item, cfg)[0] == "cart" and not cart.get('product_url'):
+            # Skipped here, before the fixtures start a browser to build the snapshot.
+            item.add_marker(pytest.mark.skip(reason="state_snapshots.cart.product_url is not configured"))
+    seeding = (cfg.get('cart_seeding') or {}).get('enabled') and use_stub_store(config, cfg)
+    for item in items:
+        if item.get_closest_marker("seeded_cart") and not seeding:
+            item.add_marker(pytest.mark.skip(reason="cart seeding needs cart_seeding.enabled and --stub-store"))
+
+    lane = config.getoption("lane")
+    if lane != "all":
+        from utills import adaptive
+
+        quarantine_cfg = cfg.get('quarantine') or {}
+        flaky = adaptive.flaky_tests(adaptive_db(cfg), quarantine_cfg)
+        for nodeid, score in flaky.items():
+            logging.getLogger(__name__).info(
+                f"Quarantined {nodeid}: {score.flips} flips, {score.failures} failures in {score.runs} runs")
+        in_lane = [item for item in items if (item.nodeid in flaky) == (lane == "quarantine")]
+        deselected = [item for item in items if (item.nodeid in flaky) != (lane == "quarantine")]
+        if lane == "quarantine":
+            for item in in_lane:
+                item.quarantine_reruns = quarantine_cfg.get('reruns', 2)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = in_lane
+
+    browsers = selected_browsers(config, cfg)
+    if cascade is not None:
+        # Each test's first-browser run goes first; sort is stable, so the order is otherwise kept.
+        items.sort(key=lambda item: cascade.order(item.nodeid))
+
+    shard_count = config.getoption("shard_count")
+    if shard_count > 1:
+        assignment = assign_shards([item.nodeid for item in items], browsers, shard_count)
+        shard_index = config.getoption("shard_index")
+        selected = [item for item in items if assignment[item.nodeid] == shard_index]
+        deselected = [item for item in items if assignment[item.nodeid] != shard_index]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 0))
+    if workers > 1:
+        assignment = assign_shards([item.nodeid for item in items], browsers, workers)
+        for item in items:
+            item.add_marker(pytest.mark.xdist_group(name=f"shard{assignment[item.nodeid]}"))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Rerun failed tests of the quarantine lane; failed attempts before the last are reported as reruns."""
+    count = getattr(item, "quarantine_reruns", 0)
+    if not count:
+        return None
+    return reruns.run(item, nextitem, count)
+
+
+def pytest_report_teststatus(report):
+    return reruns.report_status(report)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Skip, before any fixture starts a browser, cascade runs whose first-browser run did not pass."""
+    reason = cascade.skip_reason(item.nodeid) if cascade is not None else None
+    if reason:
+        pytest.skip(reason)
+
+
+def pytest_runtest_logreport(report):
+    """Record how long each scenario took so later runs can balance shards."""
+    global results_written
+    results_written = True
+    duration_store.add(report.nodeid, report.duration)
+    if cascade is not None:
+        cascade.record(report)
+
+
+def pytest_sessionfinish(session):
+    logging.getLogger(__name__).info(f"Locator registry: {registry.stats()}")
+    cfg = load_yaml_config(CONFIG_PATH)
+    # Every process writes its own wait samples and outcomes; SQLite serialises the writers.
+    if adaptive_enabled:
+        from utills import adaptive
+        db = adaptive_db(cfg)
+        adaptive.policy.flush(db, os.environ["RUN_ID"])
+        adaptive.outcomes.flush(db, os.environ["RUN_ID"])
+    launch_profiles.recorder.flush(
+        os.path.join(timing_run_dir(cfg), "profiles", f"{process_name(session.config)}.jsonl"))
+    # Workers report to the controller, which saves durations for the whole run.
+    if not hasattr(session.config, "workerinput"):
+        duration_store.save()
+        report_dir = allure_results_dir or getattr(session.config.option, "allure_report_dir", None)
+        if report_dir and results_written:
+            write_report_scaffolding(report_dir, cfg, selected_browsers(session.config, cfg))
+    if runs_whole_session(session.config):
+        run_summary.write(cfg, os.environ["RUN_ID"], allure_results_dir)
+
+
 def pytest_generate_tests(metafunc):
     if "order_test_data" in metafunc.fixturenames:
         reader = ExcelReader(EXCEL_PATH)
         test_cases = reader.get_order_test_cases()
+        if (load_yaml_config(CONFIG_PATH).get('engine') or {}).get('shared_prefix'):
+            # Rows with the same category and filters back to back: the first one fills the catalog index.
+            test_cases = scenario_planner.order(test_cases)
         metafunc.parametrize("order_test_data", test_cases, ids=[tc['Scenario'] for tc in test_cases])
+    # Last, so the browser ends the test id (see browser_matrix.split_nodeid).
+    if "matrix_browser" in metafunc.fixturenames:
+        browsers = selected_browsers(metafunc.config, load_yaml_config(CONFIG_PATH))
+        if browsers:
+            metafunc.parametrize("matrix_browser", browsers, scope="session")
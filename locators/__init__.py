@@ -0,0 +1,6 @@
+# Importing the package validates every locator class through the registry.
+from locators.registry import LocatorError, Template, registry
+from locators import (account_locators, checkout_locators, home_locators, place_order_locators,  # noqa: F401
+                      product_page_locators)
+
+__all__ = ["LocatorError", "Template", "registry"]
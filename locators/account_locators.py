@@ -0,0 +1,12 @@
+# locators/account_locators.py
+
+from locators.registry import register
+
+
+@register
+class AccountPageLocators:
+    LOGIN_PATH = "customer/account/login/"
+    EMAIL_INPUT = "input#email"
+    PASSWORD_INPUT = "input#pass"
+    SIGN_IN_BUTTON = "button#send2"
+    LOGGED_IN_GREETING = "header .greet.welcome span.logged-in"
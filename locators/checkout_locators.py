@@ -1,5 +1,9 @@
 # locators used for checkout page
 
+from locators.registry import register
+
+
+@register
 class CheckoutPageLocators:
     COUNTRY_SELECT = "select[name='country_id']"
     POSTCODE_INPUT = "input[name='postcode']"
@@ -12,12 +16,24 @@ class CheckoutPageLocators:
 
     SHIPPING_METHOD_ROWS = "table.table-checkout-shipping-method tbody tr"
     SHIPPING_METHOD_TITLE = "td.col.col-carrier"
-    SHIPPING_METHOD_PRICE = "td.col.col-price >> span.price"
+    SHIPPING_METHOD_PRICE = "td.col.col-price span.price"
     SHIPPING_METHOD_RADIO = "input[type='radio']"
 
+    # Field maps for BasePage.extract_records/extract_fields: name -> (selector, "text" or attribute, kind)
+    SHIPPING_METHOD_FIELDS = {
+        "title": (SHIPPING_METHOD_TITLE, "text", "str"),
+        "price": (SHIPPING_METHOD_PRICE, "text", "str"),
+        "amount": (SHIPPING_METHOD_PRICE, "text", "money"),
+        "value": (SHIPPING_METHOD_RADIO, "value", "str"),
+    }
+
     NEXT_BUTTON = "button[data-role='opc-continue']"
     LOADER = ".loading-mask"
 
+    # URL fragments of the checkout XHRs the shipping step waits on
+    ESTIMATE_SHIPPING_XHR = "estimate-shipping-methods"
+    SHIPPING_INFORMATION_XHR = "shipping-information"
+
     DISCOUNT_TOGGLE = "span#block-discount-heading"
     DISCOUNT_INPUT = "input#discount-code"
     APPLY_DISCOUNT_BUTTON = "button.action.action-apply"
@@ -27,3 +43,10 @@ class CheckoutPageLocators:
     DISCOUNT_PRICE = "tr.totals.discount span.price"
     SHIPPING_PRICE = "tr.totals.shipping.excl span.price"
     GRAND_TOTAL_PRICE = "tr.grand.totals span.price"
+
+    TOTALS_FIELDS = {
+        "subtotal": (SUBTOTAL_PRICE, "text", "money"),
+        "discount": (DISCOUNT_PRICE, "text", "money"),
+        "shipping": (SHIPPING_PRICE, "text", "money"),
+        "total": (GRAND_TOTAL_PRICE, "text", "money"),
+    }
@@ -1,13 +1,12 @@
 # locators/home_locators.py
 
-class HomePageLocators:
-    NAVIGATION_MENU = "nav.navigation"
-    SIDEBAR_FILTER = "#narrow-by-list2 a:has-text('{filter_label}')"
+from locators.registry import css, register, xpath
 
-    @staticmethod
-    def nav_menu_item(label: str) -> str:
-        return f"text={label}"
 
-    @staticmethod
-    def subcategory_xpath(label: str) -> str:
-        return f"//a[contains(text(),'{label}')]"
+@register
+class HomePageLocators:
+    NAVIGATION_MENU = "nav.navigation"
+    PAGE_TITLE = "h1.page-title span.base"
+    SIDEBAR_FILTER = css('#narrow-by-list2 a:has-text("{filter_label}")')
+    NAV_MENU_ITEM = css(':text("{label}")')
+    SUBCATEGORY_LINK = xpath("//a[contains(text(),{label})]")
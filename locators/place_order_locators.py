@@ -1,5 +1,9 @@
 # lace_order_locators.py
 
+from locators.registry import register
+
+
+@register
 class PlaceOrderLocators:
     PLACE_ORDER_BUTTON = "button.action.primary.checkout"
     SUCCESS_PAGE_URL = "**/checkout/onepage/success/**"
@@ -1,5 +1,9 @@
 # locators/product_page_locators.py
 
+from locators.registry import css, register
+
+
+@register
 class ProductPageLocators:
     PRODUCT_NAME = "h1.page-title span.base"
     ADD_TO_CART_BUTTON = "button#product-addtocart-button"
@@ -10,3 +14,10 @@ class ProductPageLocators:
     PRODUCT_LINKS = "li.product-item a.product-item-link"
     FILTER_SECTION = "div.filter-options-item"
     FILTER_TITLE = "div.filter-options-title"
+
+    # Layered navigation options and product swatches; values come from the Excel sheet
+    COLOR_FILTER_OPTION = css('a[aria-label="{option}"] div.swatch-option.color')
+    SIZE_FILTER_OPTION = css('a[aria-label="{option}"] div.swatch-option.text')
+    FILTER_OPTION = css('div.filter-options-item:has-text("{filter_name}") a:has-text("{option}")')
+    SIZE_SWATCH = css('div.swatch-option.text[option-label="{size}"]')
+    COLOR_SWATCH = css('div.swatch-option.color[option-label="{color}"]')
@@ -0,0 +1,209 @@
+# locators/registry.py - validated selector templates and memoized Locator objects
+
+import weakref
+from collections import OrderedDict
+from string import Formatter
+from typing import Dict, List, Tuple
+
+_CSS_ESCAPES = {"\\": "\\\\", '"': '\\"'}
+_PAIRS = {"(": ")", "[": "]"}
+
+
+class LocatorError(ValueError):
+    """A locator entry is malformed or a template got the wrong parameters."""
+
+
+def css_string(value: str) -> str:
+    """Escape `value` for use inside a double-quoted CSS / Playwright text string."""
+    return "".join(_CSS_ESCAPES.get(ch, ch) for ch in str(value))
+
+
+def xpath_literal(value: str) -> str:
+    """XPath 1.0 string literal for `value`; strings with both quote kinds use concat()."""
+    value = str(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+
+def _check_balanced(selector: str) -> None:
+    """Brackets and quotes must balance outside of quoted strings."""
+    stack: List[str] = []
+    quote = None
+    escaped = False
+    for ch in selector:
+        if escaped:
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch in _PAIRS:
+            stack.append(_PAIRS[ch])
+        elif ch in ")]":
+            if not stack or stack.pop() != ch:
+                raise LocatorError(f"unbalanced '{ch}'")
+    if quote:
+        raise LocatorError(f"unterminated {quote} string")
+    if stack:
+        raise LocatorError(f"missing '{stack[-1]}'")
+
+
+def validate_selector(selector: str) -> None:
+    if not isinstance(selector, str) or not selector.strip():
+        raise LocatorError("empty selector")
+    _check_balanced(selector)
+
+
+class Template:
+    """A parameterized selector, compiled once.
+
+    CSS templates (Playwright css/text engines) put each `{name}` inside a
+    double-quoted string and values are backslash-escaped. XPath templates
+    use a bare `{name}` and values become XPath string literals, so
+    apostrophes and quotes in Excel values cannot break the selector.
+    """
+
+    __slots__ = ("pattern", "kind", "fields", "_segments")
+
+    def __init__(self, pattern: str, kind: str = "css"):
+        if kind not in ("css", "xpath"):
+            raise LocatorError(f"unknown template kind '{kind}'")
+        self.pattern = pattern
+        self.kind = kind
+        self._segments: List[Tuple[str, str]] = []
+        fields = []
+        rendered_so_far = ""
+        for literal, name, spec, conversion in Formatter().parse(pattern):
+            if name is not None and (not name.isidentifier() or spec or conversion):
+                raise LocatorError(f"placeholder '{{{name}}}' must be a plain name")
+            rendered_so_far += literal
+            if name is not None:
+                inside_quotes = rendered_so_far.count('"') % 2 == 1
+                if kind == "css" and not inside_quotes:
+                    raise LocatorError(f"placeholder '{{{name}}}' must be inside a double-quoted string")
+                if kind == "xpath" and (inside_quotes or rendered_so_far.count("'") % 2):
+                    raise LocatorError(f"placeholder '{{{name}}}' must not be quoted in an XPath template")
+                fields.append(name)
+            self._segments.append((literal, name))
+        self.fields = tuple(dict.fromkeys(fields))
+        validate_selector(self.render({name: "x" for name in self.fields}))
+
+    def render(self, params: Dict[str, object]) -> str:
+        missing = set(self.fields) - set(params)
+        if missing:
+            raise LocatorError(f"template {self.pattern!r} missing parameters: {sorted(missing)}")
+        escape = xpath_literal if self.kind == "xpath" else css_string
+        return "".join(literal + (escape(params[name]) if name is not None else "")
+                       for literal, name in self._segments)
+
+    def format(self, **params) -> str:
+        """Rendered selector, memoized by the registry."""
+        return registry.resolve(self, **params)
+
+    def __repr__(self) -> str:
+        return f"Template({self.pattern!r}, kind={self.kind!r})"
+
+
+def css(pattern: str) -> Template:
+    return Template(pattern, "css")
+
+
+def xpath(pattern: str) -> Template:
+    return Template(pattern, "xpath")
+
+
+class LocatorRegistry:
+    """Validates locator classes and caches rendered selectors and Locator objects.
+
+    Rendered template selectors share one LRU; Locator objects are cached
+    per page (weakly keyed, so closed pages drop out) with their own LRU.
+    """
+
+    def __init__(self, maxsize: int = 512, per_page: int = 256):
+        self.maxsize = maxsize
+        self.per_page = per_page
+        self.entries: Dict[str, object] = {}
+        self._selectors: "OrderedDict[tuple, str]" = OrderedDict()
+        self._locators: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.counters = {"selector_hits": 0, "selector_misses": 0, "locator_hits": 0, "locator_misses": 0}
+
+    def register(self, cls):
+        """Class decorator: validate every selector, template and field map of `cls`."""
+        for name, value in vars(cls).items():
+            if name.startswith("_") or callable(value) or isinstance(value, (staticmethod, classmethod)):
+                continue
+            try:
+                self._validate(value)
+            except LocatorError as e:
+                raise LocatorError(f"{cls.__module__}.{cls.__name__}.{name}: {e}") from None
+            self.entries[f"{cls.__name__}.{name}"] = value
+        return cls
+
+    def _validate(self, value) -> None:
+        if isinstance(value, Template):
+            return  # validated when compiled
+        if isinstance(value, dict):
+            for field, spec in value.items():
+                if not (isinstance(spec, tuple) and len(spec) == 3):
+                    raise LocatorError(f"field '{field}' must be (selector, attribute, kind)")
+                self._validate(spec[0])
+            return
+        validate_selector(value)
+
+    def resolve(self, selector, **params) -> str:
+        if not isinstance(selector, Template):
+            if params:
+                raise LocatorError(f"{selector!r} is not a template")
+            return selector
+        key = (selector.pattern, selector.kind, tuple(sorted((k, str(v)) for k, v in params.items())))
+        rendered = self._selectors.get(key)
+        if rendered is not None:
+            self.counters["selector_hits"] += 1
+            self._selectors.move_to_end(key)
+            return rendered
+        self.counters["selector_misses"] += 1
+        rendered = selector.render(params)
+        self._selectors[key] = rendered
+        if len(self._selectors) > self.maxsize:
+            self._selectors.popitem(last=False)
+        return rendered
+
+    def locator(self, page, selector, first: bool = False, **params):
+        """Memoized `page.locator(selector)` (optionally `.first`) for this page."""
+        resolved = self.resolve(selector, **params)
+        cache = self._locators.get(page)
+        if cache is None:
+            cache = self._locators[page] = OrderedDict()
+        key = (resolved, first)
+        found = cache.get(key)
+        if found is not None:
+            self.counters["locator_hits"] += 1
+            cache.move_to_end(key)
+            return found
+        self.counters["locator_misses"] += 1
+        found = page.locator(resolved)
+        if first:
+            found = found.first
+        cache[key] = found
+        if len(cache) > self.per_page:
+            cache.popitem(last=False)
+        return found
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "selectors_cached": len(self._selectors),
+                "pages_cached": len(self._locators), "entries": len(self.entries)}
+
+    def reset_stats(self) -> None:
+        for key in self.counters:
+            self.counters[key] = 0
+
+
+registry = LocatorRegistry()
+register = registry.register
@@ -0,0 +1,25 @@
+from utills.basepage import BasePage
+from locators.account_locators import AccountPageLocators as Loc
+import allure
+import logging
+
+
+class AccountPage(BasePage):
+    def __init__(self, page, config):
+        super().__init__(page)
+        self.config = config
+        self.timeout = config["timeouts"]["element_wait"]
+        self.logger = logging.getLogger(__name__)
+
+    @allure.step("Signing in as customer: {username}")
+    def login(self, username: str, password: str) -> None:
+        try:
+            self.page.goto(self.config["urls"]["base_url"] + Loc.LOGIN_PATH, timeout=self.config["timeouts"]["page_load"])
+            self.fill(Loc.EMAIL_INPUT, username, timeout=self.timeout)
+            self.page.fill(Loc.PASSWORD_INPUT, password)
+            self.page.click(Loc.SIGN_IN_BUTTON)
+            self.page.wait_for_selector(Loc.LOGGED_IN_GREETING, timeout=self.timeout)
+            self.logger.info(f"Signed in as {username}")
+        except Exception as e:
+            self.logger.error(f"Customer login failed for {username}: {e}")
+            raise
@@ -0,0 +1,4 @@
+# Page objects for the playwright.async_api engine (config: engine.type = async).
+from pageobject.aio.page_factory import AsyncPageFactory
+
+__all__ = ["AsyncPageFactory"]
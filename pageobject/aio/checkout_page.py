@@ -0,0 +1,73 @@
+from utills.async_basepage import AsyncBasePage
+from locators.checkout_locators import CheckoutPageLocators as Loc
+from decimal import Decimal
+
+
+class AsyncCheckoutPage(AsyncBasePage):
+    def __init__(self, page, config, **kwargs):
+        super().__init__(page, **kwargs)
+        self.config = config
+        self.timeout = config["timeouts"]["element_wait"]
+
+    async def fill_shipping_address(self, email, first_name, last_name, street, city, zip_code, country, phone):
+        async with self.step("Filling shipping address"):
+            async with self.expect_network_idle(Loc.ESTIMATE_SHIPPING_XHR, timeout=self.timeout):
+                await self.page.select_option(Loc.COUNTRY_SELECT, label=country)
+                await self.page.wait_for_selector(Loc.POSTCODE_INPUT, timeout=self.timeout)
+                await self.page.wait_for_selector(Loc.TELEPHONE_INPUT, timeout=self.timeout)
+
+                await self.page.locator(Loc.EMAIL_INPUT).fill(email)
+                await self.page.locator(Loc.FIRST_NAME_INPUT).fill(first_name)
+                await self.page.locator(Loc.LAST_NAME_INPUT).fill(last_name)
+                await self.page.locator(Loc.STREET_INPUT).fill(street)
+                await self.page.locator(Loc.CITY_INPUT).fill(city)
+                await self.page.locator(Loc.POSTCODE_INPUT).fill(zip_code)
+                await self.page.locator(Loc.TELEPHONE_INPUT).fill(phone)
+
+            await self.wait_for_loader_to_disappear(timeout=self.timeout)
+
+    async def get_shipping_methods(self):
+        async with self.step("Fetching and selecting available shipping methods"):
+            await self.wait_for_loader_to_disappear()
+            await self.page.wait_for_selector(Loc.SHIPPING_METHOD_ROWS, timeout=self.timeout)
+
+            methods = await self.extract_records(Loc.SHIPPING_METHOD_ROWS, Loc.SHIPPING_METHOD_FIELDS)
+            if not methods:
+                self.logger.warning("No shipping methods found.")
+                return []
+
+            if len(methods) > 1:
+                await self.page.locator(Loc.SHIPPING_METHOD_ROWS).nth(0).locator(Loc.SHIPPING_METHOD_RADIO).click()
+            return methods
+
+    async def click_next_button(self):
+        async with self.step("Clicking 'Next' button to proceed to payment"):
+            await self.wait_for_loader_to_disappear()
+            next_button = self.page.locator(Loc.NEXT_BUTTON)
+            await next_button.wait_for(state="visible", timeout=self.timeout)
+            async with self.expect_network_idle(Loc.SHIPPING_INFORMATION_XHR, timeout=self.timeout):
+                await next_button.click()
+            await self.wait_for_loader_to_disappear()
+
+    async def apply_and_verify_discount(self, coupon_code: str):
+        async with self.step(f"Applying and verifying discount code: {coupon_code}"):
+            await self.page.locator(Loc.DISCOUNT_TOGGLE).click()
+            await self.page.wait_for_selector(Loc.DISCOUNT_INPUT, timeout=self.timeout)
+            await self.page.fill(Loc.DISCOUNT_INPUT, coupon_code)
+            await self.page.click(Loc.APPLY_DISCOUNT_BUTTON)
+
+            await self._wait(f"totals {Loc.TOTALS_DISCOUNT_ROW}", self.config["timeouts"]["totals"],
+                             lambda ms: self.page.wait_for_selector(Loc.TOTALS_DISCOUNT_ROW, timeout=ms))
+            await self.wait_for_loader_to_disappear()
+
+            totals = await self.extract_fields(Loc.TOTALS_FIELDS)
+            missing = [name for name, value in totals.items() if value is None]
+            if missing:
+                raise ValueError(f"Could not read order totals: {', '.join(missing)}")
+
+            discount = abs(totals["discount"])
+            expected_total = totals["subtotal"] - discount + totals["shipping"]
+            assert abs(totals["total"] - expected_total) < Decimal("0.01"), (
+                f"Expected: ${expected_total}, Got: ${totals['total']}"
+            )
+            return {**totals, "discount": discount, "expected_total": expected_total}
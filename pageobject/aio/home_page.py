@@ -0,0 +1,110 @@
+from utills.async_basepage import AsyncBasePage
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+from locators.home_locators import HomePageLocators as Loc
+from utills.catalog_index import SCRAPE_MENU_JS
+import math
+
+
+class AsyncHomePage(AsyncBasePage):
+    def __init__(self, page, config, catalog=None, **kwargs):
+        super().__init__(page, **kwargs)
+        self.timeout = config["timeouts"]["menu_item"]
+        self.page_load_timeout = config["timeouts"]["page_load"]
+        self.catalog = catalog
+
+    def _is_valid(self, cat):
+        return cat and not (isinstance(cat, float) and math.isnan(cat)) and str(cat).strip() != ""
+
+    async def navigate_to_category(self, menu_path: list) -> None:
+        if not menu_path:
+            raise ValueError("Menu path cannot be empty.")
+
+        cleaned_menu_path = [str(cat).strip() for cat in menu_path if self._is_valid(cat)]
+
+        if not cleaned_menu_path:
+            raise ValueError("After cleaning, menu path is empty.")
+
+        async with self.step(f"Navigating through menu path: {cleaned_menu_path}"):
+            if self.catalog is not None and await self._open_indexed_category(cleaned_menu_path):
+                return
+            start_url = self.page.url
+            await self._click_menu_path(cleaned_menu_path)
+            if self.catalog is not None and self.page.url != start_url:
+                self.catalog.remember_category(cleaned_menu_path, self.page.url)
+
+    async def _open_indexed_category(self, menu_path: list) -> bool:
+        if not self.catalog.menu_indexed:
+            self.catalog.learn_menu(await self.page.evaluate(SCRAPE_MENU_JS))
+        url = self.catalog.category_url(menu_path)
+        if url is None:
+            return False
+        await self.page.goto(url, timeout=self.page_load_timeout)
+        try:
+            title = await self.get_text(Loc.PAGE_TITLE, timeout=self.timeout) or ""
+        except PlaywrightTimeout:
+            title = ""
+        if menu_path[-1].lower() not in title.strip().lower():
+            self.logger.warning(f"Catalog index sent {menu_path} to '{title}' at {url}; using the menu instead.")
+            self.catalog.forget_category(menu_path)
+            return False
+        self.logger.info(f"Opened {menu_path} from the catalog index: {url}")
+        return True
+
+    async def _click_menu_path(self, cleaned_menu_path: list) -> None:
+        if cleaned_menu_path[0].lower() == "men":
+            await self.select_MEN_menu_path(cleaned_menu_path)
+            return
+
+        for index, label in enumerate(cleaned_menu_path):
+            selector = Loc.NAV_MENU_ITEM.format(label=label)
+            try:
+                await self._wait(f"menu_item {selector}", self.timeout,
+                                 lambda ms: self.page.wait_for_selector(selector, timeout=ms, state="visible"))
+                if index < len(cleaned_menu_path) - 1:
+                    await self.page.hover(selector)
+                    self.logger.info(f"Hovered on menu: {label}")
+                else:
+                    await self.page.click(selector)
+                    self.logger.info(f"Clicked on menu item: {label}")
+            except Exception as e:
+                self.logger.error(f"Navigation failed at '{label}': {e}")
+                raise
+
+    async def select_MEN_menu_path(self, menu_labels: list):
+        if not menu_labels or not self._is_valid(menu_labels[0]):
+            raise ValueError("Menu path must start with a valid 'Men' category.")
+
+        try:
+            men_label = menu_labels[0].strip()
+            men_locator = self.page.locator(Loc.NAVIGATION_MENU).get_by_text(men_label, exact=True).first
+            await self._wait(f"menu_item {men_label}", self.timeout, lambda ms: men_locator.wait_for(timeout=ms))
+            await men_locator.click()
+            self.logger.info(f"Clicked on top nav menu item: {men_label}")
+        except Exception as e:
+            self.logger.error(f"Failed to click 'Men' top nav: {e}")
+            raise
+
+        if len(menu_labels) > 1 and self._is_valid(menu_labels[1]):
+            sub_label = menu_labels[1].strip()
+            try:
+                sub_locator = self.locate(Loc.SUBCATEGORY_LINK, label=sub_label)
+                await self._wait(f"subcategory_link {sub_label}", self.timeout,
+                                 lambda ms: sub_locator.wait_for(timeout=ms))
+                await sub_locator.click()
+                self.logger.info(f"Clicked subcategory link: {sub_label}")
+            except Exception as e:
+                self.logger.error(f"Failed to click subcategory '{sub_label}': {e}")
+                raise
+
+        if len(menu_labels) > 2 and self._is_valid(menu_labels[2]):
+            filter_label = menu_labels[2].strip()
+            async with self.step(f"Clicking sidebar filter category: {filter_label}"):
+                try:
+                    sidebar_locator = self.locate(Loc.SIDEBAR_FILTER, filter_label=filter_label)
+                    await self._wait(f"sidebar_filter {filter_label}", self.timeout,
+                                     lambda ms: sidebar_locator.wait_for(timeout=ms))
+                    await sidebar_locator.click()
+                    self.logger.info(f"Clicked sidebar filter category: {filter_label}")
+                except Exception as e:
+                    self.logger.error(f"Sidebar filter click failed for '{filter_label}': {e}")
+                    raise
@@ -0,0 +1,50 @@
+# Centralized factory for async page object instances.
+from pageobject.aio.home_page import AsyncHomePage
+from pageobject.aio.product_page import AsyncProductPage
+from pageobject.aio.checkout_page import AsyncCheckoutPage
+from pageobject.aio.place_order import AsyncPlaceOrderPage
+from utills.async_basepage import AsyncBasePage, StepTrace
+
+
+class AsyncPageFactory:
+
+    def __init__(self, page, config, trace: StepTrace, prewarmed: bool = False, catalog=None):
+        self.page = page
+        self.config = config
+        self.trace = trace
+        # True when the page's context was loaded from a storage_state snapshot (consent accepted).
+        self.prewarmed = prewarmed
+        self.catalog = catalog
+
+    async def open_indexed_product(self, menu_path: list, filters: dict) -> bool:
+        url = self.catalog.product_url(menu_path, filters) if self.catalog is not None else None
+        if url is None:
+            return False
+        if await self.product.open_indexed_product(url):
+            return True
+        self.catalog.forget_product(menu_path, filters)
+        return False
+
+    def index_product(self, menu_path: list, filters: dict, url) -> None:
+        if self.catalog is not None and url:
+            self.catalog.remember_product(menu_path, filters, url)
+
+    @property
+    def base(self) -> AsyncBasePage:
+        return AsyncBasePage(self.page, skip_consent=self.prewarmed, trace=self.trace)
+
+    @property
+    def home(self) -> AsyncHomePage:
+        return AsyncHomePage(self.page, self.config, catalog=self.catalog, trace=self.trace)
+
+    @property
+    def product(self) -> AsyncProductPage:
+        return AsyncProductPage(self.page, self.config, trace=self.trace)
+
+    @property
+    def checkout(self) -> AsyncCheckoutPage:
+        return AsyncCheckoutPage(self.page, self.config, trace=self.trace)
+
+    @property
+    def place_order(self) -> AsyncPlaceOrderPage:
+        return AsyncPlaceOrderPage(self.page, self.config, trace=self.trace)
@@ -0,0 +1,28 @@
+from utills.async_basepage import AsyncBasePage
+from locators.place_order_locators import PlaceOrderLocators as Loc
+
+
+class AsyncPlaceOrderPage(AsyncBasePage):
+    def __init__(self, page, config, **kwargs):
+        super().__init__(page, **kwargs)
+        self.timeout = config["timeouts"]["element_wait"]
+        self.success_timeout = config["timeouts"]["order_success"]
+
+    async def place_order_and_capture_number(self):
+        async with self.step("Placing the order and capturing the confirmation number"):
+            try:
+                await self.page.click(Loc.PLACE_ORDER_BUTTON, timeout=self.timeout)
+                await self._wait(f"wait_for_url {Loc.SUCCESS_PAGE_URL}", self.success_timeout,
+                                 lambda ms: self.page.wait_for_url(Loc.SUCCESS_PAGE_URL, timeout=ms))
+
+                await self.page.wait_for_selector(Loc.THANK_YOU_MESSAGE, timeout=self.timeout)
+                confirmation_msg = await self.page.locator(Loc.THANK_YOU_MESSAGE).inner_text()
+                assert "Thank you for your purchase!" in confirmation_msg
+
+                await self.page.wait_for_selector(Loc.ORDER_NUMBER, timeout=self.timeout)
+                order_number = await self.page.locator(Loc.ORDER_NUMBER).inner_text()
+                self.logger.info(f"🧾 Order Number: {order_number}")
+                return order_number
+            except Exception as e:
+                self.logger.error(f"Failed to place order or retrieve confirmation: {e}")
+                raise
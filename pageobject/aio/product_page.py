@@ -0,0 +1,143 @@
+from utills.async_basepage import AsyncBasePage
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+import math
+from locators.product_page_locators import ProductPageLocators as Loc
+from utills.filter_planner import SCRAPE_FILTERS_JS, planner
+
+
+class AsyncProductPage(AsyncBasePage):
+    def __init__(self, page, config, **kwargs):
+        super().__init__(page, **kwargs)
+        self.config = config
+        self.timeout = config["timeouts"]["element_wait"]
+
+    def _is_valid(self, value):
+        return value is not None and str(value).strip() != "" and not (isinstance(value, float) and math.isnan(value))
+
+    async def apply_filters(self, filters: dict) -> None:
+        async with self.step(f"Applying multiple filters: {filters}"):
+            try:
+                await self.wait_for_loader_to_disappear()
+                valid = {}
+                for filter_name, option_text in filters.items():
+                    if not self._is_valid(option_text):
+                        self.logger.warning(f"Skipping filter '{filter_name}' due to invalid value: {option_text}")
+                        continue
+                    valid[filter_name] = option_text
+
+                if valid and await self._apply_filters_by_url(valid):
+                    return
+                for filter_name, option_text in valid.items():
+                    await self._click_filter(filter_name, option_text)
+
+            except Exception as e:
+                self.logger.error(f"Failed to apply filters: {e}")
+                raise
+
+    async def _apply_filters_by_url(self, filters: dict) -> bool:
+        if (self.config.get('filters') or {}).get('strategy', 'url') != 'url':
+            return False
+        category_url = self.page.url
+        if not planner.knows(category_url):
+            planner.learn(category_url, await self.page.evaluate(SCRAPE_FILTERS_JS))
+        url = planner.plan(category_url, filters)
+        if url is None:
+            self.logger.info(f"Filters {filters} are not all in the filter block; clicking them instead.")
+            return False
+        await self.page.goto(url, timeout=self.config['timeouts']['page_load'])
+        await self.wait_for_loader_to_disappear()
+        self.logger.info(f"Filters applied through {url}")
+        return True
+
+    async def _click_filter(self, filter_name: str, option_text) -> None:
+        filter_section = self.page.locator(Loc.FILTER_SECTION, has_text=filter_name).first
+        await filter_section.scroll_into_view_if_needed()
+        await filter_section.locator(Loc.FILTER_TITLE).click(timeout=self.timeout)
+
+        filter_upper = filter_name.strip().upper()
+        if filter_upper == "COLOR":
+            option = self.locate(Loc.COLOR_FILTER_OPTION, first=True, option=option_text)
+        elif filter_upper == "SIZE":
+            option = self.locate(Loc.SIZE_FILTER_OPTION, first=True, option=option_text)
+        else:
+            option = self.locate(Loc.FILTER_OPTION, first=True, filter_name=filter_name, option=option_text)
+        await option.wait_for(state="visible", timeout=self.timeout)
+        await option.scroll_into_view_if_needed()
+        async with self.expect_dom_change(Loc.PRODUCT_LINKS, timeout=self.timeout):
+            await option.click()
+
+        self.logger.info(f"Filter applied: {filter_name} → {option_text}")
+
+    async def open_indexed_product(self, url: str) -> bool:
+        async with self.step(f"Opening product from the catalog index: {url}"):
+            await self.navigate(url, timeout=self.config['timeouts']['page_load'])
+            try:
+                await self.page.locator(Loc.ADD_TO_CART_BUTTON).wait_for(state="visible", timeout=self.timeout)
+                return True
+            except PlaywrightTimeout:
+                self.logger.warning(f"{url} from the catalog index is not a product page anymore.")
+                return False
+
+    async def click_first_visible_product(self) -> None:
+        async with self.step("Clicking first visible product after filters"):
+            first_product = self.locate(Loc.PRODUCT_LINKS, first=True)
+            try:
+                await first_product.wait_for(state="visible", timeout=self.timeout)
+            except PlaywrightTimeout:
+                self.logger.warning("No products found after applying filters.")
+                return
+            await first_product.scroll_into_view_if_needed()
+            await first_product.click()
+            self.logger.info("Clicked first visible product.")
+
+    async def select_size(self, size: str):
+        async with self.step(f"Selecting size: {size}"):
+            await self.locate(Loc.SIZE_SWATCH, size=size).click(timeout=self.timeout)
+            self.logger.info(f"Size selected: {size}")
+
+    async def select_color(self, color: str):
+        async with self.step(f"Selecting color: {color}"):
+            await self.locate(Loc.COLOR_SWATCH, color=color).click(timeout=self.timeout)
+            self.logger.info(f"Color selected: {color}")
+
+    async def set_quantity(self, qty: int):
+        async with self.step(f"Setting quantity to {qty}"):
+            await self.page.locator(Loc.QUANTITY_INPUT).fill(str(qty), timeout=self.timeout)
+            self.logger.info(f"Quantity set to: {qty}")
+
+    async def customize_product_selection(self, size: str, color: str, quantity):
+        if self._is_valid(size):
+            await self.select_size(size)
+        if self._is_valid(color):
+            await self.select_color(color)
+        if self._is_valid(quantity):
+            await self.set_quantity(int(quantity))
+
+    async def add_product_to_cart_and_verify(self):
+        async with self.step("Add product to cart and verify success message"):
+            product_name_element = self.page.locator(Loc.PRODUCT_NAME)
+            await product_name_element.wait_for(state="visible", timeout=self.timeout)
+            product_name = (await product_name_element.inner_text()).strip()
+
+            await self.page.locator(Loc.ADD_TO_CART_BUTTON).click(timeout=self.timeout)
+
+            expected_message = f"You added {product_name} to your shopping cart."
+            success_message = self.page.locator(Loc.SUCCESS_MESSAGE)
+            await success_message.wait_for(state="visible", timeout=self.timeout)
+            actual_message = (await success_message.inner_text()).strip()
+
+            if expected_message.lower() not in actual_message.lower():
+                raise AssertionError(f"Expected success message not found in actual message: {actual_message}")
+            self.logger.info("Success message verified.")
+
+    async def open_mini_cart(self):
+        async with self.step("Opening mini cart"):
+            cart_icon = self.page.locator(Loc.MINI_CART_ICON)
+            await cart_icon.wait_for(state="visible", timeout=self.timeout)
+            await cart_icon.click(timeout=self.timeout)
+
+    async def click_proceed_to_checkout(self):
+        async with self.step("Clicking 'Proceed to Checkout'"):
+            checkout_button = self.page.locator(Loc.CHECKOUT_BUTTON)
+            await checkout_button.wait_for(state="visible", timeout=self.timeout)
+            await checkout_button.click(timeout=self.timeout)
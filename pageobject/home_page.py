@@ -1,13 +1,18 @@
 from utills.basepage import BasePage
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
 from locators.home_locators import HomePageLocators as Loc
+from utills.catalog_index import SCRAPE_MENU_JS
 import allure
 import math
 
 
 class HomePage(BasePage):
-    def __init__(self, page):
+    def __init__(self, page, config, catalog=None):
         super().__init__(page)
         self.page = page
+        self.timeout = config["timeouts"]["menu_item"]
+        self.page_load_timeout = config["timeouts"]["page_load"]
+        self.catalog = catalog
 
     def _is_valid(self, cat):
         return cat and not (isinstance(cat, float) and math.isnan(cat)) and str(cat).strip() != ""
@@ -22,14 +27,43 @@ class HomePage(BasePage):
         if not cleaned_menu_path:
             raise ValueError("After cleaning, menu path is empty.")
 
+        if self.catalog is not None and self._open_indexed_category(cleaned_menu_path):
+            return
+        start_url = self.page.url
+        self._click_menu_path(cleaned_menu_path)
+        if self.catalog is not None and self.page.url != start_url:
+            self.catalog.remember_category(cleaned_menu_path, self.page.url)
+
+    def _open_indexed_category(self, menu_path: list) -> bool:
+        """Go straight to the category URL from the catalog index; False if it has none or it is stale."""
+        if not self.catalog.menu_indexed:
+            self.catalog.learn_menu(self.page.evaluate(SCRAPE_MENU_JS))
+        url = self.catalog.category_url(menu_path)
+        if url is None:
+            return False
+        self.page.goto(url, timeout=self.page_load_timeout)
+        try:
+            title = self.get_text(Loc.PAGE_TITLE, timeout=self.timeout) or ""
+        except PlaywrightTimeout:
+            title = ""
+        # The menu stays on every storefront page, so the click path can start from here.
+        if menu_path[-1].lower() not in title.strip().lower():
+            self.logger.warning(f"Catalog index sent {menu_path} to '{title}' at {url}; using the menu instead.")
+            self.catalog.forget_category(menu_path)
+            return False
+        self.logger.info(f"Opened {menu_path} from the catalog index: {url}")
+        return True
+
+    def _click_menu_path(self, cleaned_menu_path: list) -> None:
         if cleaned_menu_path[0].lower() == "men":
             self.select_MEN_menu_path(cleaned_menu_path)
             return
 
         for index, label in enumerate(cleaned_menu_path):
-            selector = Loc.nav_menu_item(label)
+            selector = Loc.NAV_MENU_ITEM.format(label=label)
             try:
-                self.page.wait_for_selector(selector, timeout=5000, state="visible")
+                self._wait(f"menu_item {selector}", self.timeout,
+                           lambda ms: self.page.wait_for_selector(selector, timeout=ms, state="visible"))
                 if index < len(cleaned_menu_path) - 1:
                     self.page.hover(selector)
                     self.logger.info(f"Hovered on menu: {label}")
@@ -48,7 +82,7 @@ class HomePage(BasePage):
         try:
             men_label = menu_labels[0].strip()
             men_locator = self.page.locator(Loc.NAVIGATION_MENU).get_by_text(men_label, exact=True).first
-            men_locator.wait_for(timeout=5000)
+            self._wait(f"menu_item {men_label}", self.timeout, lambda ms: men_locator.wait_for(timeout=ms))
             men_locator.click()
             self.logger.info(f"Clicked on top nav menu item: {men_label}")
         except Exception as e:
@@ -58,8 +92,9 @@ class HomePage(BasePage):
         if len(menu_labels) > 1 and self._is_valid(menu_labels[1]):
             sub_label = menu_labels[1].strip()
             try:
-                sub_locator = self.page.locator(Loc.subcategory_xpath(sub_label))
-                sub_locator.wait_for(timeout=5000)
+                sub_locator = self.locate(Loc.SUBCATEGORY_LINK, label=sub_label)
+                self._wait(f"subcategory_link {sub_label}", self.timeout,
+                           lambda ms: sub_locator.wait_for(timeout=ms))
                 sub_locator.click()
                 self.logger.info(f"Clicked subcategory link: {sub_label}")
             except Exception as e:
@@ -70,9 +105,9 @@ class HomePage(BasePage):
             filter_label = menu_labels[2].strip()
             with allure.step(f"Clicking sidebar filter category: {filter_label}"):
                 try:
-                    sidebar_selector = Loc.SIDEBAR_FILTER.format(filter_label=filter_label)
-                    sidebar_locator = self.page.locator(sidebar_selector)
-                    sidebar_locator.wait_for(timeout=5000)
+                    sidebar_locator = self.locate(Loc.SIDEBAR_FILTER, filter_label=filter_label)
+                    self._wait(f"sidebar_filter {filter_label}", self.timeout,
+                               lambda ms: sidebar_locator.wait_for(timeout=ms))
                     sidebar_locator.click()
                     self.logger.info(f"Clicked sidebar filter category: {filter_label}")
                 except Exception as e:
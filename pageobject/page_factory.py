@@ -1,34 +1,90 @@
 # Centralized factory for page object instances.
-from pageobject.home_page import HomePage
-from pageobject.product_page import ProductPage
-from utills.basepage import BasePage
-from pageobject.checkout_page import CheckoutPage
-from pageobject.place_order import PlaceOrderPage
+# Page objects are imported on first use, so importing the factory (during
+# test collection) does not load Playwright.
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from pageobject.home_page import HomePage
+    from pageobject.product_page import ProductPage
+    from utills.basepage import BasePage
+    from pageobject.checkout_page import CheckoutPage
+    from pageobject.place_order import PlaceOrderPage
+    from utills.catalog_index import CatalogIndex
+    from utills.checkpoints import ScenarioCheckpoints
 
 
 class PageFactory:
 
-    def __init__(self, page, config):
+    def __init__(self, page, config, prewarmed: bool = False, checkpoints: Optional["ScenarioCheckpoints"] = None,
+                 catalog: Optional["CatalogIndex"] = None):
         self.page = page
         self.config = config
+        # True when the page's context was loaded from a storage_state snapshot (consent accepted).
+        self.prewarmed = prewarmed
+        self.checkpoints = checkpoints
+        self.resumed_stage = None
+        self.catalog = catalog
+
+    def resume(self) -> Optional[str]:
+        """Restore the furthest valid checkpoint when resuming; returns its stage or None."""
+        if self.checkpoints is None or not self.checkpoints.resume:
+            return None
+        checkpoint = self.checkpoints.latest()
+        if checkpoint is not None:
+            self.checkpoints.restore(self.page, checkpoint, self.config['timeouts']['page_load'])
+            self.resumed_stage = checkpoint.stage
+        return self.resumed_stage
+
+    def reached(self, stage: str) -> bool:
+        """Whether the resumed checkpoint is at or past `stage`, so its steps can be skipped."""
+        from utills.checkpoints import STAGES
+        return self.resumed_stage is not None and STAGES.index(self.resumed_stage) >= STAGES.index(stage)
+
+    def checkpoint(self, stage: str) -> None:
+        if self.checkpoints is not None:
+            self.checkpoints.save(self.page, stage)
+
+    def finish(self) -> None:
+        """The scenario completed; its checkpoints no longer describe a live cart."""
+        if self.checkpoints is not None:
+            self.checkpoints.clear()
+
+    def open_indexed_product(self, menu_path: list, filters: dict) -> bool:
+        """Jump to the product the click path found for this menu path and filters before, if indexed."""
+        url = self.catalog.product_url(menu_path, filters) if self.catalog is not None else None
+        if url is None:
+            return False
+        if self.product.open_indexed_product(url):
+            return True
+        self.catalog.forget_product(menu_path, filters)
+        return False
+
+    def index_product(self, menu_path: list, filters: dict, url: Optional[str]) -> None:
+        if self.catalog is not None and url:
+            self.catalog.remember_product(menu_path, filters, url)
 
     @property
-    def base(self) -> BasePage:
-        return BasePage(self.page)
+    def base(self) -> "BasePage":
+        from utills.basepage import BasePage
+        return BasePage(self.page, skip_consent=self.prewarmed)
 
     @property
-    def home(self) -> HomePage:
-        return HomePage(self.page)
+    def home(self) -> "HomePage":
+        from pageobject.home_page import HomePage
+        return HomePage(self.page, self.config, catalog=self.catalog)
 
     @property
-    def product(self) -> ProductPage:
+    def product(self) -> "ProductPage":
+        from pageobject.product_page import ProductPage
         return ProductPage(self.page,self.config)
 
     @property
-    def checkout(self) -> CheckoutPage:
+    def checkout(self) -> "CheckoutPage":
+        from pageobject.checkout_page import CheckoutPage
         return CheckoutPage(self.page, self.config)
 
     @property
-    def place_order(self) -> PlaceOrderPage:
+    def place_order(self) -> "PlaceOrderPage":
+        from pageobject.place_order import PlaceOrderPage
         return PlaceOrderPage(self.page, self.config)
 
@@ -1,13 +1,13 @@
 import allure
-import logging
+from utills.basepage import BasePage
 from locators.place_order_locators import PlaceOrderLocators as Loc
 
 
-class PlaceOrderPage:
+class PlaceOrderPage(BasePage):
     def __init__(self, page, config):
-        self.page = page
+        super().__init__(page)
         self.timeout = config["timeouts"]["element_wait"]
-        self.logger = logging.getLogger(__name__)
+        self.success_timeout = config["timeouts"]["order_success"]
 
     @allure.step("Placing the order and capturing the confirmation number")
     def place_order_and_capture_number(self):
@@ -17,7 +17,8 @@ class PlaceOrderPage:
                 self.logger.info("🛒 Clicked on 'Place Order'.")
 
             with allure.step("Waiting for success page to load"):
-                self.page.wait_for_url(Loc.SUCCESS_PAGE_URL, timeout=30000)
+                self._wait(f"wait_for_url {Loc.SUCCESS_PAGE_URL}", self.success_timeout,
+                           lambda ms: self.page.wait_for_url(Loc.SUCCESS_PAGE_URL, timeout=ms))
                 self.logger.info("Redirected to order success page.")
 
             with allure.step("Verifying thank-you message"):
@@ -37,4 +38,4 @@ class PlaceOrderPage:
         except Exception as e:
             self.logger.error(f"Failed to place order or retrieve confirmation: {e}")
             allure.attach(str(e), name="Order Placement Error", attachment_type=allure.attachment_type.TEXT)
-            return None
+            raise
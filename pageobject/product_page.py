@@ -1,8 +1,10 @@
 from utills.basepage import BasePage
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
 import allure
 import logging
 import math
 from locators.product_page_locators import ProductPageLocators as Loc
+from utills.filter_planner import SCRAPE_FILTERS_JS, planner
 
 
 class ProductPage(BasePage):
@@ -20,48 +22,79 @@ class ProductPage(BasePage):
     def apply_filters(self, filters: dict) -> None:
         try:
             self.wait_for_loader_to_disappear()
+            valid = {}
             for filter_name, option_text in filters.items():
                 if not self._is_valid(option_text):
                     self.logger.warning(f"Skipping filter '{filter_name}' due to invalid value: {option_text}")
                     continue
+                valid[filter_name] = option_text
 
-                self.page.wait_for_timeout(500)
-                self.logger.info(f"Applying filter: {filter_name} → {option_text}")
-
-                filter_section = self.page.locator(Loc.FILTER_SECTION, has_text=filter_name).first
-                filter_section.scroll_into_view_if_needed()
-                filter_section.locator(Loc.FILTER_TITLE).click(timeout=self.timeout)
-
-                filter_upper = filter_name.strip().upper()
-                if filter_upper == "COLOR":
-                    selector = f"a[aria-label='{option_text}'] div.swatch-option.color"
-                elif filter_upper == "SIZE":
-                    selector = f"a[aria-label='{option_text}'] div.swatch-option.text"
-                else:
-                    selector = f"div.filter-options-item:has-text('{filter_name}') a:has-text('{option_text}')"
-
-                option = self.page.locator(selector).first
-                option.wait_for(state="visible", timeout=self.timeout)
-                option.scroll_into_view_if_needed()
-                option.click()
-
-                self.logger.info(f"Filter applied: {filter_name} → {option_text}")
-                self.page.wait_for_timeout(1000)
+            if valid and self._apply_filters_by_url(valid):
+                return
+            for filter_name, option_text in valid.items():
+                self._click_filter(filter_name, option_text)
 
         except Exception as e:
             self.logger.error(f"Failed to apply filters: {e}")
             raise
 
+    def _apply_filters_by_url(self, filters: dict) -> bool:
+        """Load the filtered category URL in one navigation; False if the planner cannot resolve it."""
+        if (self.config.get('filters') or {}).get('strategy', 'url') != 'url':
+            return False
+        category_url = self.page.url
+        if not planner.knows(category_url):
+            planner.learn(category_url, self.page.evaluate(SCRAPE_FILTERS_JS))
+        url = planner.plan(category_url, filters)
+        if url is None:
+            self.logger.info(f"Filters {filters} are not all in the filter block; clicking them instead.")
+            return False
+        self.page.goto(url, timeout=self.config['timeouts']['page_load'])
+        self.wait_for_loader_to_disappear()
+        self.logger.info(f"Filters applied through {url}")
+        return True
+
+    def _click_filter(self, filter_name: str, option_text) -> None:
+        self.logger.info(f"Applying filter: {filter_name} → {option_text}")
+
+        filter_section = self.page.locator(Loc.FILTER_SECTION, has_text=filter_name).first
+        filter_section.scroll_into_view_if_needed()
+        filter_section.locator(Loc.FILTER_TITLE).click(timeout=self.timeout)
+
+        filter_upper = filter_name.strip().upper()
+        if filter_upper == "COLOR":
+            option = self.locate(Loc.COLOR_FILTER_OPTION, first=True, option=option_text)
+        elif filter_upper == "SIZE":
+            option = self.locate(Loc.SIZE_FILTER_OPTION, first=True, option=option_text)
+        else:
+            option = self.locate(Loc.FILTER_OPTION, first=True, filter_name=filter_name, option=option_text)
+        option.wait_for(state="visible", timeout=self.timeout)
+        option.scroll_into_view_if_needed()
+        with self.expect_dom_change(Loc.PRODUCT_LINKS, timeout=self.timeout):
+            option.click()
+
+        self.logger.info(f"Filter applied: {filter_name} → {option_text}")
+
+    @allure.step("Opening product from the catalog index: {url}")
+    def open_indexed_product(self, url: str) -> bool:
+        """Open a product URL from the catalog index; False if it no longer is a product page."""
+        self.navigate(url, timeout=self.config['timeouts']['page_load'])
+        try:
+            self.page.locator(Loc.ADD_TO_CART_BUTTON).wait_for(state="visible", timeout=self.timeout)
+            return True
+        except PlaywrightTimeout:
+            self.logger.warning(f"{url} from the catalog index is not a product page anymore.")
+            return False
+
     @allure.step("Clicking first visible product after filters")
     def click_first_visible_product(self) -> None:
         try:
-            self.page.wait_for_timeout(2000)
-            products = self.page.locator(Loc.PRODUCT_LINKS)
-            if products.count() == 0:
+            first_product = self.locate(Loc.PRODUCT_LINKS, first=True)
+            try:
+                first_product.wait_for(state="visible", timeout=self.timeout)
+            except PlaywrightTimeout:
                 self.logger.warning("No products found after applying filters.")
                 return
-            first_product = products.first
-            first_product.wait_for(state="visible", timeout=self.timeout)
             first_product.scroll_into_view_if_needed()
             first_product.click()
             self.logger.info("Clicked first visible product.")
@@ -71,9 +104,8 @@ class ProductPage(BasePage):
 
     @allure.step("Selecting size: {size}")
     def select_size(self, size: str):
-        selector = f'div.swatch-option.text[option-label="{size}"]'
         try:
-            self.page.locator(selector).click(timeout=self.timeout)
+            self.locate(Loc.SIZE_SWATCH, size=size).click(timeout=self.timeout)
             self.logger.info(f"Size selected: {size}")
         except Exception as e:
             self.logger.error(f"Failed to select size {size}: {e}")
@@ -81,9 +113,8 @@ class ProductPage(BasePage):
 
     @allure.step("Selecting color: {color}")
     def select_color(self, color: str):
-        selector = f'div.swatch-option.color[option-label="{color}"]'
         try:
-            self.page.locator(selector).click(timeout=self.timeout)
+            self.locate(Loc.COLOR_SWATCH, color=color).click(timeout=self.timeout)
             self.logger.info(f"Color selected: {color}")
         except Exception as e:
             self.logger.error(f"Failed to select color {color}: {e}")
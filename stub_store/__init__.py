@@ -0,0 +1,3 @@
+from stub_store.server import MagentoStubServer
+
+__all__ = ["MagentoStubServer"]
@@ -0,0 +1,128 @@
+# stub_store/catalog.py - product data served by the local Magento stub
+
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+# Configurable attribute ids, matching the "super_attribute" ids of the Luma sample data.
+SIZE_ATTRIBUTE_ID = 143
+COLOR_ATTRIBUTE_ID = 93
+
+SIZE_OPTIONS = {"XS": 166, "S": 167, "M": 168, "L": 169, "XL": 170}
+COLOR_OPTIONS = {"Black": 49, "Blue": 50, "Gray": 52, "Green": 53, "Red": 58, "Purple": 57}
+PATTERN_OPTIONS = {"Graphic Print": 195, "Solid": 196, "Striped": 197}
+CLIMATE_OPTIONS = {"All-Weather": 201, "Cold": 203, "Cool": 204, "Indoor": 205, "Rainy": 207, "Warm": 209,
+                   "Windy": 211}
+STYLE_OPTIONS = {"Backpack": 220, "Duffel": 222, "Messenger": 223, "Hooded": 118, "Jacket": 124, "Pullover": 128,
+                 "Tee": 133}
+
+# Layered navigation sections, in page order: (code, title, options, swatch type or None)
+FILTERS = [
+    ("size", "Size", SIZE_OPTIONS, "text"),
+    ("color", "Color", COLOR_OPTIONS, "color"),
+    ("pattern", "Pattern", PATTERN_OPTIONS, None),
+    ("climate", "Climate", CLIMATE_OPTIONS, None),
+    ("style", "Style", STYLE_OPTIONS, None),
+]
+
+SWATCH_COLORS = {"Black": "#000000", "Blue": "#1857f7", "Gray": "#8f8f8f", "Green": "#53a828", "Red": "#ff0000",
+                 "Purple": "#ef3dff"}
+
+# Navigation tree: (name, url path, children). Paths are served as "/<path>.html".
+CATEGORIES = [
+    ("Women", "women", [
+        ("Tops", "women/tops-women", [
+            ("Jackets", "women/tops-women/jackets-women", []),
+            ("Hoodies & Sweatshirts", "women/tops-women/hoodies-and-sweatshirts-women", []),
+        ]),
+    ]),
+    ("Men", "men", [
+        ("Tops", "men/tops-men", [
+            ("Jackets", "men/tops-men/jackets-men", []),
+            ("Hoodies & Sweatshirts", "men/tops-men/hoodies-and-sweatshirts-men", []),
+            ("Tees", "men/tops-men/tees-men", []),
+        ]),
+    ]),
+    ("Gear", "gear", [
+        ("Bags", "gear/bags", []),
+        ("Fitness Equipment", "gear/fitness-equipment", []),
+    ]),
+]
+
+_SIZES = ["XS", "S", "M", "L", "XL"]
+
+# Products listed in a category also appear in all of its parents. Configurable
+# products have "size"/"color" swatches; the other attributes only drive filters.
+PRODUCTS = {
+    "WJ12": {"name": "Olivia 1/4 Zip Light Jacket", "price": Decimal("77.00"),
+             "url_key": "olivia-1-4-zip-light-jacket", "category": "women/tops-women/jackets-women",
+             "size": _SIZES, "color": ["Black", "Blue", "Purple"], "pattern": ["Solid"],
+             "climate": ["Cold", "Cool", "Windy"], "style": ["Jacket"]},
+    "WJ04": {"name": "Ingrid Running Jacket", "price": Decimal("84.00"),
+             "url_key": "ingrid-running-jacket", "category": "women/tops-women/jackets-women",
+             "size": _SIZES, "color": ["Red", "Black"], "pattern": ["Striped"],
+             "climate": ["Cold", "Rainy"], "style": ["Jacket"]},
+    "WH01": {"name": "Mona Pullover Hoodlie", "price": Decimal("57.00"),
+             "url_key": "mona-pullover-hoodlie", "category": "women/tops-women/hoodies-and-sweatshirts-women",
+             "size": _SIZES, "color": ["Green", "Purple", "Gray"], "pattern": ["Solid"],
+             "climate": ["Cool", "Indoor"], "style": ["Pullover"]},
+    "MJ01": {"name": "Beaumont Summit Kit", "price": Decimal("42.00"),
+             "url_key": "beaumont-summit-kit", "category": "men/tops-men/jackets-men",
+             "size": _SIZES, "color": ["Red", "Black"], "pattern": ["Solid"],
+             "climate": ["Cold", "Windy"], "style": ["Jacket"]},
+    "MH01": {"name": "Chaz Kangeroo Hoodie", "price": Decimal("52.00"),
+             "url_key": "chaz-kangeroo-hoodie", "category": "men/tops-men/hoodies-and-sweatshirts-men",
+             "size": _SIZES, "color": ["Black", "Blue", "Gray"], "pattern": ["Solid"],
+             "climate": ["Cold", "Indoor"], "style": ["Hooded"]},
+    "MS04": {"name": "Gobi HeatTec Tee", "price": Decimal("29.00"),
+             "url_key": "gobi-heattec-tee", "category": "men/tops-men/tees-men",
+             "size": _SIZES, "color": ["Black", "Blue", "Red"], "pattern": ["Graphic Print"],
+             "climate": ["Warm"], "style": ["Tee"]},
+    "24-MB01": {"name": "Joust Duffle Bag", "price": Decimal("34.00"),
+                "url_key": "joust-duffle-bag", "category": "gear/bags", "style": ["Duffel"]},
+    "24-MB02": {"name": "Fusion Backpack", "price": Decimal("59.00"),
+                "url_key": "fusion-backpack", "category": "gear/bags", "style": ["Backpack"]},
+    "24-MB04": {"name": "Strive Shoulder Pack", "price": Decimal("32.00"),
+                "url_key": "strive-shoulder-pack", "category": "gear/bags", "style": ["Messenger"]},
+    "24-UG06": {"name": "Affirm Water Bottle", "price": Decimal("7.00"),
+                "url_key": "affirm-water-bottle", "category": "gear/fitness-equipment"},
+}
+
+SHIPPING_METHODS = [
+    {"carrier_code": "flatrate", "method_code": "flatrate", "carrier_title": "Flat Rate",
+     "method_title": "Fixed", "amount_per_item": Decimal("5.00")},
+    {"carrier_code": "tablerate", "method_code": "bestway", "carrier_title": "Best Way",
+     "method_title": "Table Rate", "amount": Decimal("10.00")},
+]
+
+COUPONS = {"20poff": Decimal("0.20")}
+
+
+COUNTRIES = {"US": "United States", "NL": "Netherlands", "DE": "Germany", "FR": "France", "GB": "United Kingdom",
+             "IN": "India"}
+
+
+def shipping_amount(method: dict, qty: int) -> Decimal:
+    if "amount_per_item" in method:
+        return method["amount_per_item"] * qty
+    return method["amount"]
+
+
+def category(path: str) -> Optional[tuple]:
+    """(name, path, children) of the category served at `path`, or None."""
+    stack = list(CATEGORIES)
+    while stack:
+        node = stack.pop()
+        if node[1] == path:
+            return node
+        stack.extend(node[2])
+    return None
+
+
+def products_in(path: str) -> List[Tuple[str, dict]]:
+    """(sku, product) pairs listed in the category at `path`, including its subcategories."""
+    return [(sku, product) for sku, product in PRODUCTS.items()
+            if product.get("category") == path or product.get("category", "").startswith(path + "/")]
+
+
+def product_by_url_key(url_key: str) -> Optional[Tuple[str, dict]]:
+    return next(((sku, p) for sku, p in PRODUCTS.items() if p.get("url_key") == url_key), None)
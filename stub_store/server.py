@@ -0,0 +1,343 @@
+# stub_store/server.py - local stand-in for the Magento storefront and guest-cart REST API
+#
+#   python -m stub_store.server --port 8090
+
+import argparse
+import json
+import logging
+import re
+import threading
+import uuid
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from stub_store import catalog, storefront
+
+CART_PATH = r"/rest(?:/default)?/V1/guest-carts/(?P<cart_id>[^/]+)"
+
+
+class Cart:
+    def __init__(self, cart_id: str):
+        self.cart_id = cart_id
+        self.items = []
+        self.shipping_method: Optional[dict] = None
+        self.address: Optional[dict] = None
+        self.coupon: Optional[str] = None
+        self.order_number: Optional[str] = None
+        self.lock = threading.Lock()
+
+    def qty(self) -> int:
+        return sum(item["qty"] for item in self.items)
+
+    def totals(self) -> dict:
+        subtotal = sum((item["price"] * item["qty"] for item in self.items), Decimal("0"))
+        shipping = catalog.shipping_amount(self.shipping_method, self.qty()) if self.shipping_method else Decimal("0")
+        discount = (subtotal * catalog.COUPONS[self.coupon]).quantize(Decimal("0.01")) if self.coupon else Decimal("0")
+        return {
+            "subtotal": subtotal,
+            "shipping_amount": shipping,
+            "discount_amount": -discount,
+            "grand_total": subtotal + shipping - discount,
+            "items_qty": self.qty(),
+            "coupon_code": self.coupon,
+        }
+
+
+class StoreState:
+    """Carts and orders shared by all request handler threads."""
+
+    def __init__(self):
+        self.carts: Dict[str, Cart] = {}
+        self.orders: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self._order_sequence = 1000
+
+    def new_cart(self) -> Cart:
+        cart = Cart(uuid.uuid4().hex)
+        with self.lock:
+            self.carts[cart.cart_id] = cart
+        return cart
+
+    def cart(self, cart_id: str) -> Optional[Cart]:
+        with self.lock:
+            return self.carts.get(cart_id)
+
+    def next_order_number(self) -> str:
+        with self.lock:
+            self._order_sequence += 1
+            return f"{self._order_sequence:09d}"
+
+    def place_order(self, cart: Cart, email: Optional[str]) -> str:
+        """Turn `cart` into an order once; placing it again returns the same number."""
+        with cart.lock:
+            if cart.order_number is None:
+                cart.order_number = self.next_order_number()
+                order = {"cart_id": cart.cart_id, "email": email, "items": list(cart.items), "totals": cart.totals()}
+                with self.lock:
+                    self.orders[cart.order_number] = order
+            return cart.order_number
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Not JSON serializable: {value!r}")
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MagentoStub/1.0"
+    # Small responses on kept-alive connections: send them without waiting for delayed ACKs,
+    # and let idle browser connections go so their threads are released.
+    disable_nagle_algorithm = True
+    timeout = 15
+    routes = []
+
+    @classmethod
+    def route(cls, method: str, pattern: str):
+        def decorator(func):
+            cls.routes.append((method, re.compile(pattern + r"/?$"), func))
+            return func
+        return decorator
+
+    @property
+    def state(self) -> StoreState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).debug(format % args)
+
+    def _dispatch(self, method: str) -> None:
+        path = self.path.split("?", 1)[0]
+        for route_method, pattern, func in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                try:
+                    func(self, **match.groupdict())
+                except (KeyError, ValueError, TypeError) as e:
+                    self.send_json({"message": f"Bad request: {e}"}, status=400)
+                return
+        self.send_json({"message": f"Request does not match any route: {method} {path}"}, status=404)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def send_json(self, payload, status: int = 200, headers: Optional[dict] = None) -> None:
+        body = json.dumps(payload, default=_json_default).encode()
+        self.send_body(body, "application/json", status, headers)
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200, headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def require_cart(self, cart_id: str) -> Optional[Cart]:
+        cart = self.state.cart(cart_id)
+        if cart is None:
+            self.send_json({"message": f"No such entity with cartId = {cart_id}"}, status=404)
+        return cart
+
+
+route = StubRequestHandler.route
+
+
+@route("POST", r"/rest(?:/default)?/V1/guest-carts")
+def create_guest_cart(handler):
+    handler.send_json(handler.state.new_cart().cart_id)
+
+
+@route("GET", CART_PATH + r"/items")
+def list_items(handler, cart_id):
+    cart = handler.require_cart(cart_id)
+    if cart:
+        handler.send_json(cart.items)
+
+
+@route("POST", CART_PATH + r"/items")
+def add_item(handler, cart_id):
+    cart = handler.require_cart(cart_id)
+    if not cart:
+        return
+    cart_item = handler.read_json()["cartItem"]
+    product = catalog.PRODUCTS.get(cart_item["sku"])
+    if product is None:
+        handler.send_json({"message": f"Product that you trying to add is not available: {cart_item['sku']}"},
+                          status=400)
+        return
+    options = (cart_item.get("product_option") or {}).get("extension_attributes", {}).get(
+        "configurable_item_options", [])
+    with cart.lock:
+        item = {
+            "item_id": len(cart.items) + 1,
+            "sku": cart_item["sku"],
+            "qty": int(cart_item.get("qty", 1)),
+            "name": product["name"],
+            "price": product["price"],
+            "product_type": "configurable" if options else "simple",
+            "quote_id": cart_id,
+            "product_option": {"extension_attributes": {"configurable_item_options": options}},
+        }
+        cart.items.append(item)
+    handler.send_json(item)
+
+
+@route("POST", CART_PATH + r"/estimate-shipping-methods")
+def estimate_shipping_methods(handler, cart_id):
+    cart = handler.require_cart(cart_id)
+    if not cart:
+        return
+    handler.read_json()
+    handler.send_json([
+        {
+            "carrier_code": method["carrier_code"],
+            "method_code": method["method_code"],
+            "carrier_title": method["carrier_title"],
+            "method_title": method["method_title"],
+            "amount": catalog.shipping_amount(method, cart.qty()),
+            "available": True,
+        }
+        for method in catalog.SHIPPING_METHODS
+    ])
+
+
+@route("POST", CART_PATH + r"/shipping-information")
+def shipping_information(handler, cart_id):
+    cart = handler.require_cart(cart_id)
+    if not cart:
+        return
+    info = handler.read_json()["addressInformation"]
+    method = next((m for m in catalog.SHIPPING_METHODS
+                   if m["carrier_code"] == info["shipping_carrier_code"]
+                   and m["method_code"] == info["shipping_method_code"]), None)
+    if method is None:
+        handler.send_json({"message": "The shipping method is missing."}, status=400)
+        return
+    with cart.lock:
+        cart.address = info["shipping_address"]
+        cart.shipping_method = method
+    handler.send_json({
+        "payment_methods": [{"code": "checkmo", "title": "Check / Money order"}],
+        "totals": cart.totals(),
+    })
+
+
+@route("PUT", CART_PATH + r"/coupons/(?P<code>[^/]+)")
+def apply_coupon(handler, cart_id, code):
+    cart = handler.require_cart(cart_id)
+    if not cart:
+        return
+    if code not in catalog.COUPONS:
+        handler.send_json({"message": "The coupon code isn't valid. Verify the code and try again."}, status=404)
+        return
+    cart.coupon = code
+    handler.send_json(True)
+
+
+@route("GET", CART_PATH + r"/totals")
+def totals(handler, cart_id):
+    cart = handler.require_cart(cart_id)
+    if cart:
+        handler.send_json(cart.totals())
+
+
+@route("POST", CART_PATH + r"/payment-information")
+def payment_information(handler, cart_id):
+    cart = handler.require_cart(cart_id)
+    if not cart:
+        return
+    payload = handler.read_json() or {}
+    if not cart.items or cart.shipping_method is None:
+        handler.send_json({"message": "The shipping method is missing. Select the shipping method and try again."},
+                          status=400)
+        return
+    handler.send_json(handler.state.place_order(cart, payload.get("email")))
+
+
+for _method, _pattern, _page in storefront.ROUTES:
+    route(_method, _pattern)(_page)
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Hundreds of browser contexts open connections in bursts; the default backlog of 5 refuses them.
+    request_queue_size = 1024
+
+
+class MagentoStubServer:
+    """Threaded HTTP server implementing the Magento pages and endpoints the suite uses.
+
+    Bind to port 0 to get a free port; `base_url` reports the actual address.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = _StubHTTPServer((host, port), StubRequestHandler)
+        self.httpd.state = StoreState()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> StoreState:
+        return self.httpd.state
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def urls(self) -> Dict[str, str]:
+        """The `urls` config section pointing at this server."""
+        return {
+            "base_url": self.base_url,
+            "checkout_url": self.base_url + "checkout/",
+            "api_base_url": self.base_url + "rest/",
+        }
+
+    def start(self) -> "MagentoStubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="magento-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MagentoStubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the local Magento stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+    server = MagentoStubServer(args.host, args.port)
+    print(f"Magento stub listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
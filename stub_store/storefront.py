@@ -0,0 +1,687 @@
+# stub_store/storefront.py - HTML pages of the local Magento stub
+#
+# The markup follows the DOM contracts in locators/*.py: the ids, classes and
+# attributes the page objects select on. Catalog pages do not depend on the
+# visitor, so each URL is rendered once and served from memory; the cart lives
+# in the REST API (stub_store/server.py) and is driven by the inline script.
+
+import html
+import json
+from decimal import Decimal
+from functools import lru_cache
+from http.cookies import CookieError, SimpleCookie
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
+
+from stub_store import catalog
+
+CART_COOKIE = "guest_cart_id"
+CUSTOMER_COOKIE = "stub_customer"
+
+# (method, pattern, handler) tuples, registered on StubRequestHandler by server.py
+ROUTES = []
+
+
+def page(method: str, pattern: str):
+    def decorator(func):
+        ROUTES.append((method, pattern, func))
+        return func
+    return decorator
+
+
+def _e(value) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def _money(amount: Decimal) -> str:
+    return f"${amount:,.2f}"
+
+
+_CSS = """
+body{font-family:sans-serif;margin:0;color:#333}
+a{color:#1979c3;text-decoration:none}
+.page-header{border-bottom:1px solid #ddd;padding:0 20px}
+.header.links{list-style:none;display:flex;gap:16px;justify-content:flex-end;margin:0;padding:6px 0}
+.header.content{display:flex;justify-content:space-between;align-items:center;padding:10px 0}
+.minicart-wrapper{position:relative}
+.block-minicart{position:absolute;right:0;top:100%;width:300px;background:#fff;border:1px solid #ccc;padding:12px;z-index:20}
+nav.navigation ul{list-style:none;margin:0;padding:0}
+nav.navigation li{position:relative}
+nav.navigation li.level0{display:inline-block}
+nav.navigation a{display:block;padding:8px 12px;white-space:nowrap}
+nav.navigation .submenu{display:none;position:absolute;background:#fff;border:1px solid #ccc;min-width:220px;z-index:10}
+nav.navigation li.level0>.submenu{top:100%;left:0}
+nav.navigation li.level1>.submenu{top:0;left:100%}
+nav.navigation li:hover>.submenu{display:block}
+.page-main{padding:20px}
+.columns{display:flex;gap:30px}
+.sidebar-main{width:260px;flex:none}
+.filter-options-title{cursor:pointer;padding:8px 0;border-top:1px solid #ddd;font-weight:600}
+.filter-options-content .items{list-style:none;padding:0}
+.count{color:#757575;margin-left:4px}
+.swatch-option{display:inline-block;min-width:26px;height:24px;line-height:24px;margin:0 8px 8px 0;padding:0 2px;
+ border:1px solid #ccc;text-align:center;cursor:pointer;box-sizing:border-box}
+.swatch-option.selected{outline:2px solid #ff5501}
+.product-items{list-style:none;display:flex;flex-wrap:wrap;gap:20px;padding:0}
+.product-item{width:220px}
+.product-image-container{display:block;height:160px;background:#f0f0f0}
+.loading-mask{position:fixed;top:0;right:0;bottom:0;left:0;background:rgba(255,255,255,.5);z-index:100}
+.message{padding:10px;margin-bottom:10px}
+.message-success{background:#e5efe5}
+.message-error{background:#fae5e5}
+.mage-error{color:#e02b27}
+.checkout-container{display:flex;gap:40px}
+.opc{list-style:none;padding:0;flex:1}
+.opc-sidebar{width:320px}
+.field{margin-bottom:10px}
+th,td{padding:6px 10px;text-align:left}
+"""
+
+_COMMON_JS = """
+const Stub = {
+  pending: 0,
+  cookie(name) {
+    const match = document.cookie.match('(?:^|; )' + name + '=([^;]*)');
+    return match ? decodeURIComponent(match[1]) : null;
+  },
+  setCookie(name, value, maxAge) {
+    document.cookie = name + '=' + encodeURIComponent(value) + '; path=/' + (maxAge === undefined ? '' : '; max-age=' + maxAge);
+  },
+  async api(method, path, body) {
+    const response = await fetch('/rest/default/V1/' + path, {
+      method, headers: {'Content-Type': 'application/json'},
+      body: body === undefined ? undefined : JSON.stringify(body)
+    });
+    const data = await response.json();
+    if (!response.ok) {
+      const error = new Error(data.message || response.statusText);
+      error.status = response.status;
+      throw error;
+    }
+    return data;
+  },
+  async busy(work) {
+    const mask = document.querySelector('.loading-mask');
+    Stub.pending++;
+    mask.style.display = 'block';
+    try {
+      return await work();
+    } finally {
+      if (--Stub.pending === 0) mask.style.display = 'none';
+    }
+  },
+  money(value) {
+    return (value < 0 ? '-$' : '$') + Math.abs(value).toFixed(2);
+  },
+  message(kind, text) {
+    const box = document.querySelector('.page.messages');
+    const div = document.createElement('div');
+    div.className = 'message-' + kind + ' ' + kind + ' message';
+    div.textContent = text;
+    box.replaceChildren(div);
+  },
+  async cartId(create) {
+    let id = Stub.cookie(CART_COOKIE);
+    if (!id && create) {
+      id = await Stub.api('POST', 'guest-carts');
+      Stub.setCookie(CART_COOKIE, id);
+    }
+    return id;
+  },
+  clearCart() {
+    Stub.setCookie(CART_COOKIE, '', 0);
+  },
+  async refreshMinicart() {
+    const id = await Stub.cartId(false);
+    const list = document.getElementById('mini-cart');
+    if (!id || !list) return;
+    try {
+      const items = await Stub.api('GET', 'guest-carts/' + id + '/items');
+      list.replaceChildren(...items.map(item => {
+        const li = document.createElement('li');
+        li.className = 'item product product-item';
+        li.textContent = item.qty + ' x ' + item.name;
+        return li;
+      }));
+      document.querySelector('.counter-number').textContent = items.reduce((sum, item) => sum + item.qty, 0);
+    } catch (e) {
+      if (e.status === 404) Stub.clearCart();
+    }
+  }
+};
+
+const customer = Stub.cookie(CUSTOMER_COOKIE);
+if (customer) {
+  const greeting = document.createElement('span');
+  greeting.className = 'logged-in';
+  greeting.textContent = 'Welcome, ' + customer + '!';
+  document.querySelector('.greet.welcome').replaceChildren(greeting);
+}
+document.querySelectorAll('a.action.showcart').forEach(link => link.addEventListener('click', event => {
+  event.preventDefault();
+  const block = document.querySelector('.block-minicart');
+  block.style.display = block.style.display === 'none' ? 'block' : 'none';
+  Stub.refreshMinicart();
+}));
+const checkoutButton = document.getElementById('top-cart-btn-checkout');
+if (checkoutButton) checkoutButton.addEventListener('click', () => { location.href = '/checkout/'; });
+document.querySelectorAll('.filter-options-title').forEach(title => title.addEventListener('click', () => {
+  const content = title.nextElementSibling;
+  const open = content.style.display === 'none';
+  document.querySelectorAll('.filter-options-content').forEach(other => { other.style.display = 'none'; });
+  content.style.display = open ? 'block' : 'none';
+}));
+Stub.refreshMinicart();
+"""
+
+_PRODUCT_JS = """
+(() => {
+  const form = document.getElementById('product_addtocart_form');
+  form.querySelectorAll('.swatch-option').forEach(option => option.addEventListener('click', () => {
+    const attribute = option.closest('.swatch-attribute');
+    attribute.querySelectorAll('.swatch-option').forEach(other => other.classList.remove('selected'));
+    option.classList.add('selected');
+    attribute.querySelector('.swatch-attribute-selected-option').textContent = option.getAttribute('option-label');
+    attribute.querySelectorAll('.mage-error').forEach(error => error.remove());
+  }));
+  form.addEventListener('submit', async event => {
+    event.preventDefault();
+    const options = [];
+    let missing = false;
+    form.querySelectorAll('.swatch-attribute').forEach(attribute => {
+      const selected = attribute.querySelector('.swatch-option.selected');
+      if (selected) {
+        options.push({option_id: attribute.getAttribute('attribute-id'), option_value: Number(selected.getAttribute('option-id'))});
+        return;
+      }
+      missing = true;
+      if (!attribute.querySelector('.mage-error')) {
+        attribute.insertAdjacentHTML('beforeend', '<div class="mage-error">This is a required field.</div>');
+      }
+    });
+    if (missing) return;
+    const qty = Math.max(1, parseInt(document.getElementById('qty').value, 10) || 1);
+    const add = async () => {
+      const cartId = await Stub.cartId(true);
+      return Stub.api('POST', 'guest-carts/' + cartId + '/items', {cartItem: {
+        sku: form.dataset.sku, qty, quote_id: cartId,
+        product_option: {extension_attributes: {configurable_item_options: options}}
+      }});
+    };
+    try {
+      // A cart cookie from an earlier server run (e.g. in a storage_state snapshot) is replaced once.
+      await Stub.busy(() => add().catch(e => {
+        if (e.status !== 404) throw e;
+        Stub.clearCart();
+        return add();
+      }));
+      Stub.message('success', 'You added ' + form.dataset.name + ' to your shopping cart.');
+      Stub.refreshMinicart();
+    } catch (e) {
+      Stub.message('error', e.message);
+    }
+  });
+})();
+"""
+
+_CHECKOUT_JS = """
+(() => {
+  const cartId = Stub.cookie(CART_COOKIE);
+  if (!cartId) {
+    document.getElementById('checkout').innerHTML =
+      '<div class="cart-empty"><p>You have no items in your shopping cart.</p></div>';
+    return;
+  }
+  const form = document.getElementById('co-shipping-form');
+  const field = name => form.querySelector('[name="' + name + '"]');
+  const rows = document.querySelector('table.table-checkout-shipping-method tbody');
+  const email = document.getElementById('customer-email');
+  let sequence = 0;
+  let timer = null;
+
+  const address = () => ({
+    firstname: field('firstname').value, lastname: field('lastname').value, street: [field('street[0]').value],
+    city: field('city').value, postcode: field('postcode').value, country_id: field('country_id').value,
+    telephone: field('telephone').value, email: email.value
+  });
+
+  async function estimate() {
+    const current = ++sequence;
+    const methods = await Stub.busy(() => Stub.api('POST', 'guest-carts/' + cartId + '/estimate-shipping-methods',
+      {address: {country_id: field('country_id').value, postcode: field('postcode').value}}));
+    if (current !== sequence) return;
+    rows.replaceChildren(...methods.map(method => {
+      const row = document.createElement('tr');
+      row.className = 'row';
+      row.innerHTML = '<td class="col col-method"><input type="radio" class="radio" name="shipping_method"></td>' +
+        '<td class="col col-price"><span class="price"></span></td>' +
+        '<td class="col col-method"></td><td class="col col-carrier"></td>';
+      row.querySelector('input').value = method.carrier_code + '_' + method.method_code;
+      row.querySelector('.price').textContent = Stub.money(method.amount);
+      row.cells[2].textContent = method.method_title;
+      row.cells[3].textContent = method.carrier_title;
+      return row;
+    }));
+    if (methods.length === 1) rows.querySelector('input').checked = true;
+  }
+
+  const scheduleEstimate = () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => estimate().catch(e => Stub.message('error', e.message)), 200);
+  };
+  field('country_id').addEventListener('change', scheduleEstimate);
+  field('postcode').addEventListener('input', scheduleEstimate);
+  estimate().catch(e => {
+    if (e.status === 404) Stub.clearCart();
+    Stub.message('error', e.message);
+  });
+
+  function renderTotals(totals) {
+    const lines = [['totals sub', 'Cart Subtotal', totals.subtotal]];
+    if (totals.discount_amount) lines.push(['totals discount', 'Discount (' + totals.coupon_code + ')', totals.discount_amount]);
+    lines.push(['totals shipping excl', 'Shipping', totals.shipping_amount], ['grand totals', 'Order Total', totals.grand_total]);
+    document.querySelector('table.table-totals tbody').replaceChildren(...lines.map(([className, label, amount]) => {
+      const row = document.createElement('tr');
+      row.className = className;
+      row.innerHTML = '<th class="mark" scope="row"></th><td class="amount"><span class="price"></span></td>';
+      row.querySelector('th').textContent = label;
+      row.querySelector('.price').textContent = Stub.money(amount);
+      return row;
+    }));
+  }
+
+  document.querySelector("button[data-role='opc-continue']").addEventListener('click', async () => {
+    document.querySelectorAll('#shipping .mage-error').forEach(error => error.remove());
+    const missing = [...document.querySelectorAll('#shipping [required]')].filter(input => !input.value.trim());
+    missing.forEach(input => input.insertAdjacentHTML('afterend', '<div class="mage-error">This is a required field.</div>'));
+    if (missing.length) return;
+    const chosen = rows.querySelector('input:checked');
+    if (!chosen) {
+      Stub.message('error', 'The shipping method is missing. Select the shipping method and try again.');
+      return;
+    }
+    const [carrier, method] = chosen.value.split('_');
+    try {
+      const info = await Stub.busy(() => Stub.api('POST', 'guest-carts/' + cartId + '/shipping-information', {
+        addressInformation: {shipping_address: address(), billing_address: address(),
+                             shipping_carrier_code: carrier, shipping_method_code: method}
+      }));
+      renderTotals(info.totals);
+      document.getElementById('shipping').style.display = 'none';
+      document.getElementById('payment').style.display = 'block';
+      history.replaceState(null, '', '#payment');
+    } catch (e) {
+      Stub.message('error', e.message);
+    }
+  });
+
+  document.getElementById('block-discount-heading').addEventListener('click', () => {
+    const content = document.querySelector('.discount-code .payment-option-content');
+    content.style.display = content.style.display === 'none' ? 'block' : 'none';
+  });
+
+  document.querySelector('button.action.action-apply').addEventListener('click', async () => {
+    const code = document.getElementById('discount-code').value.trim();
+    if (!code) return;
+    try {
+      const totals = await Stub.busy(async () => {
+        await Stub.api('PUT', 'guest-carts/' + cartId + '/coupons/' + encodeURIComponent(code));
+        return Stub.api('GET', 'guest-carts/' + cartId + '/totals');
+      });
+      renderTotals(totals);
+      Stub.message('success', 'Your coupon was successfully applied.');
+    } catch (e) {
+      Stub.message('error', 'The coupon code "' + code + '" is not valid.');
+    }
+  });
+
+  document.querySelector('#payment button.action.primary.checkout').addEventListener('click', async () => {
+    try {
+      await Stub.busy(() => Stub.api('POST', 'guest-carts/' + cartId + '/payment-information', {
+        email: email.value, paymentMethod: {method: 'checkmo'}, billingAddress: address()
+      }));
+      location.href = '/checkout/onepage/success/';
+    } catch (e) {
+      Stub.message('error', e.message);
+    }
+  });
+})();
+"""
+
+_SCRIPT_PRELUDE = f"const CART_COOKIE = {json.dumps(CART_COOKIE)}, CUSTOMER_COOKIE = {json.dumps(CUSTOMER_COOKIE)};"
+
+
+def _navigation_items(nodes, level: int) -> str:
+    items = []
+    for name, path, children in nodes:
+        submenu = f'<ul class="level{level} submenu">{_navigation_items(children, level + 1)}</ul>' if children else ""
+        parent = " parent" if children else ""
+        # Labels sit in a <span> as on Luma, so XPath text() matches only sidebar links.
+        items.append(f'<li class="level{level}{parent}"><a href="/{_e(path)}.html"><span>{_e(name)}</span></a>'
+                     f'{submenu}</li>')
+    return "".join(items)
+
+
+_NAVIGATION = (f'<nav class="navigation" data-action="navigation"><ul>'
+               f'{_navigation_items(catalog.CATEGORIES, 0)}</ul></nav>')
+
+_MINICART = (
+    '<div class="minicart-wrapper" data-block="minicart">'
+    '<a class="action showcart" href="#"><span class="text">My Cart</span>'
+    '<span class="counter qty"><span class="counter-number">0</span></span></a>'
+    '<div class="block block-minicart" style="display:none"><div class="block-content">'
+    '<ol class="minicart-items" id="mini-cart"></ol>'
+    '<div class="actions"><button type="button" id="top-cart-btn-checkout" class="action primary checkout">'
+    'Proceed to Checkout</button></div></div></div></div>'
+)
+
+
+def _layout(title: str, body: str, script: str = "", checkout: bool = False) -> str:
+    """Page shell; the checkout keeps Luma's reduced header without menu and mini cart."""
+    header_extras = "" if checkout else _MINICART
+    navigation = "" if checkout else _NAVIGATION
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{_e(title)}</title>'
+        f'<style>{_CSS}</style></head><body>'
+        f'<header class="page-header"><div class="panel header"><ul class="header links">'
+        f'<li class="greet welcome"></li>'
+        f'<li class="authorization-link"><a href="/customer/account/login/">Sign In</a></li></ul></div>'
+        f'<div class="header content"><a class="logo" href="/">Luma</a>{header_extras}</div>{navigation}</header>'
+        f'<main id="maincontent" class="page-main"><div class="page messages"></div>{body}</main>'
+        f'<div class="loading-mask" style="display:none"><div class="loader"></div></div>'
+        f'<script>{_SCRIPT_PRELUDE}{_COMMON_JS}{script}</script></body></html>'
+    )
+
+
+def _title(text: str) -> str:
+    return f'<div class="page-title-wrapper"><h1 class="page-title"><span class="base">{_e(text)}</span></h1></div>'
+
+
+def _send_html(handler, body, status: int = 200, headers: Optional[dict] = None) -> None:
+    if isinstance(body, str):
+        body = body.encode()
+    handler.send_body(body, "text/html; charset=UTF-8", status, headers)
+
+
+def _redirect(handler, location: str, headers: Optional[dict] = None) -> None:
+    handler.send_body(b"", "text/html; charset=UTF-8", 302, {"Location": location, **(headers or {})})
+
+
+def _cookie(handler, name: str) -> Optional[str]:
+    jar = SimpleCookie()
+    try:
+        jar.load(handler.headers.get("Cookie") or "")
+    except CookieError:
+        return None
+    morsel = jar.get(name)
+    return unquote(morsel.value) if morsel and morsel.value else None
+
+
+def _applied_filters(query: str) -> Tuple[Tuple[str, str], ...]:
+    """Valid (attribute code, option label) pairs of a category URL query, in FILTERS order."""
+    params = dict(parse_qsl(query))
+    applied = []
+    for code, _, options, _ in catalog.FILTERS:
+        value = params.get(code)
+        label = next((label for label, option_id in options.items() if str(option_id) == value), None)
+        if label:
+            applied.append((code, label))
+    return tuple(applied)
+
+
+def _filter_url(path: str, applied, code: Optional[str] = None, label: Optional[str] = None) -> str:
+    options = {filter_code: filter_options for filter_code, _, filter_options, _ in catalog.FILTERS}
+    pairs = [(c, options[c][value]) for c, value in applied if c != code]
+    if label is not None:
+        pairs.append((code, options[code][label]))
+    return f"/{path}.html" + (f"?{urlencode(pairs)}" if pairs else "")
+
+
+def _matches(product: dict, applied) -> bool:
+    return all(label in product.get(code, ()) for code, label in applied)
+
+
+def _filter_option(path: str, applied, code: str, label: str, count: int, swatch: Optional[str]) -> str:
+    url = _e(_filter_url(path, applied, code, label))
+    if swatch == "color":
+        return (f'<a href="{url}" aria-label="{_e(label)}" class="swatch-option-link-layered">'
+                f'<div class="swatch-option color" option-label="{_e(label)}" '
+                f'style="background:{catalog.SWATCH_COLORS[label]}"></div></a>')
+    if swatch == "text":
+        return (f'<a href="{url}" aria-label="{_e(label)}" class="swatch-option-link-layered">'
+                f'<div class="swatch-option text" option-label="{_e(label)}">{_e(label)}</div></a>')
+    return (f'<li class="item"><a href="{url}">{_e(label)}<span class="count">{count}'
+            f'<span class="filter-count-label"> item{"s" if count != 1 else ""}</span></span></a></li>')
+
+
+@lru_cache(maxsize=1024)
+def _category_html(path: str, applied: Tuple[Tuple[str, str], ...]) -> bytes:
+    name, _, children = catalog.category(path)
+    products = [(sku, product) for sku, product in catalog.products_in(path) if _matches(product, applied)]
+
+    current = ""
+    if applied:
+        titles = {code: title for code, title, _, _ in catalog.FILTERS}
+        current = ('<div class="filter-current"><strong class="block-subtitle filter-current-subtitle">'
+                   'Now Shopping by</strong><ol class="items">' + "".join(
+                       f'<li class="item"><span class="filter-label">{_e(titles[code])}</span> '
+                       f'<span class="filter-value">{_e(label)}</span> '
+                       f'<a class="action remove" href="{_e(_filter_url(path, applied, code))}">Remove This Item</a></li>'
+                       for code, label in applied) + '</ol></div>')
+
+    subcategories = []
+    for child_name, child_path, _ in children:
+        count = sum(1 for _, product in catalog.products_in(child_path) if _matches(product, applied))
+        if count:
+            subcategories.append(f'<li class="item"><a href="{_e(_filter_url(child_path, applied))}">{_e(child_name)}'
+                                 f'<span class="count">{count}</span></a></li>')
+    categories = (f'<dl class="filter-options" id="narrow-by-list2"><dt>Category</dt><dd><ol class="items">'
+                  f'{"".join(subcategories)}</ol></dd></dl>') if subcategories else ""
+
+    sections = []
+    applied_codes = {code for code, _ in applied}
+    for code, title, options, swatch in catalog.FILTERS:
+        if code in applied_codes:
+            continue
+        counts = {label: sum(1 for _, product in products if label in product.get(code, ())) for label in options}
+        links = "".join(_filter_option(path, applied, code, label, count, swatch)
+                        for label, count in counts.items() if count)
+        if not links:
+            continue
+        content = (f'<div class="swatch-attribute swatch-layered {code}">{links}</div>' if swatch
+                   else f'<ol class="items">{links}</ol>')
+        sections.append(f'<div class="filter-options-item" data-role="collapsible">'
+                        f'<div class="filter-options-title" data-role="title" role="tab">{_e(title)}</div>'
+                        f'<div class="filter-options-content" data-role="content" style="display:none">'
+                        f'{content}</div></div>')
+
+    if products:
+        items = "".join(
+            f'<li class="item product product-item"><div class="product-item-info">'
+            f'<a class="product photo product-item-photo" href="/{_e(product["url_key"])}.html" tabindex="-1">'
+            f'<span class="product-image-container"></span></a>'
+            f'<div class="product details product-item-details"><strong class="product name product-item-name">'
+            f'<a class="product-item-link" href="/{_e(product["url_key"])}.html">{_e(product["name"])}</a></strong>'
+            f'<div class="price-box"><span class="price">{_money(product["price"])}</span></div></div></div></li>'
+            for _, product in products)
+        listing = f'<div class="products wrapper grid products-grid"><ol class="products list items product-items">' \
+                  f'{items}</ol></div>'
+    else:
+        listing = '<div class="message info empty"><div>We can\'t find products matching the selection.</div></div>'
+
+    body = (f'{_title(name)}<div class="columns"><div class="sidebar sidebar-main">'
+            f'<div class="block filter" id="layered-filter-block"><div class="block-title filter-title">'
+            f'<strong>Shop By</strong></div><div class="block-content filter-content">{current}{categories}'
+            f'<strong class="block-subtitle filter-subtitle">Shopping Options</strong>'
+            f'<div class="filter-options" id="narrow-by-list">{"".join(sections)}</div></div></div></div>'
+            f'<div class="column main">{listing}</div></div>')
+    return _layout(name, body).encode()
+
+
+def _swatch_attribute(code: str, attribute_id: int, title: str, labels, options: dict) -> str:
+    swatches = []
+    for label in labels:
+        if code == "color":
+            swatches.append(f'<div class="swatch-option color" option-id="{options[label]}" '
+                            f'option-label="{_e(label)}" aria-label="{_e(label)}" tabindex="0" '
+                            f'style="background:{catalog.SWATCH_COLORS[label]}"></div>')
+        else:
+            swatches.append(f'<div class="swatch-option text" option-id="{options[label]}" '
+                            f'option-label="{_e(label)}" aria-label="{_e(label)}" tabindex="0">{_e(label)}</div>')
+    return (f'<div class="swatch-attribute {code}" attribute-code="{code}" attribute-id="{attribute_id}">'
+            f'<span class="swatch-attribute-label">{_e(title)}</span> '
+            f'<span class="swatch-attribute-selected-option"></span>'
+            f'<div class="swatch-attribute-options clearfix">{"".join(swatches)}</div></div>')
+
+
+@lru_cache(maxsize=256)
+def _product_html(sku: str) -> bytes:
+    product = catalog.PRODUCTS[sku]
+    swatches = ""
+    if product.get("size"):
+        swatches += _swatch_attribute("size", catalog.SIZE_ATTRIBUTE_ID, "Size", product["size"],
+                                      catalog.SIZE_OPTIONS)
+    if product.get("color"):
+        swatches += _swatch_attribute("color", catalog.COLOR_ATTRIBUTE_ID, "Color", product["color"],
+                                      catalog.COLOR_OPTIONS)
+    body = (f'{_title(product["name"])}<div class="product-info-main">'
+            f'<div class="product-info-price"><span class="price">{_money(product["price"])}</span></div>'
+            f'<div class="product attribute sku"><strong class="type">SKU</strong> '
+            f'<div class="value">{_e(sku)}</div></div>'
+            f'<form id="product_addtocart_form" data-sku="{_e(sku)}" data-name="{_e(product["name"])}">'
+            f'<div class="swatch-opt">{swatches}</div>'
+            f'<div class="field qty"><label class="label" for="qty">Qty</label>'
+            f'<input type="number" name="qty" id="qty" value="1" min="1" class="input-text qty"></div>'
+            f'<button type="submit" id="product-addtocart-button" class="action primary tocart">'
+            f'<span>Add to Cart</span></button></form></div>')
+    return _layout(product["name"], body, _PRODUCT_JS).encode()
+
+
+def _input(name: str, label: str, input_type: str = "text") -> str:
+    return (f'<div class="field required"><label class="label" for="shipping-{_e(name)}">{_e(label)}</label>'
+            f'<div class="control"><input class="input-text" type="{input_type}" id="shipping-{_e(name)}" '
+            f'name="{_e(name)}" required></div></div>')
+
+
+@lru_cache(maxsize=1)
+def _checkout_html() -> bytes:
+    countries = "".join(f'<option value="{code}">{_e(name)}</option>' for code, name in catalog.COUNTRIES.items())
+    shipping = (
+        '<li id="shipping" class="checkout-shipping-address"><div class="step-title">Shipping Address</div>'
+        '<div class="field required"><label class="label" for="customer-email">Email Address</label>'
+        '<div class="control _with-tooltip"><input class="input-text" type="email" id="customer-email" '
+        'name="username" required></div></div>'
+        '<form class="form form-shipping-address" id="co-shipping-form" onsubmit="return false">'
+        + _input("firstname", "First Name") + _input("lastname", "Last Name")
+        + _input("street[0]", "Street Address") + _input("city", "City")
+        + _input("postcode", "Zip/Postal Code")
+        + f'<div class="field required"><label class="label" for="shipping-country_id">Country</label>'
+          f'<div class="control"><select class="select" id="shipping-country_id" name="country_id" required>'
+          f'{countries}</select></div></div>'
+        + _input("telephone", "Phone Number", "tel")
+        + '</form><div id="opc-shipping_method" class="checkout-shipping-method">'
+        '<div class="step-title">Shipping Methods</div><div id="checkout-shipping-method-load">'
+        '<table class="table-checkout-shipping-method"><thead><tr class="row"><th class="col col-method">Select</th>'
+        '<th class="col col-price">Price</th><th class="col col-method">Method</th>'
+        '<th class="col col-carrier">Carrier</th></tr></thead><tbody></tbody></table></div>'
+        '<div class="actions-toolbar" id="shipping-method-buttons-container">'
+        '<button data-role="opc-continue" type="button" class="button action continue primary"><span>Next</span>'
+        '</button></div></div></li>'
+    )
+    payment = (
+        '<li id="payment" class="checkout-payment-method" style="display:none">'
+        '<div class="step-title">Payment Method</div>'
+        '<div class="payment-method _active"><input type="radio" class="radio" id="checkmo" name="payment[method]" '
+        'value="checkmo" checked> <label for="checkmo">Check / Money order</label>'
+        '<div class="actions-toolbar"><button class="action primary checkout" type="button">'
+        '<span>Place Order</span></button></div></div>'
+        '<div class="payment-option discount-code"><div class="payment-option-title">'
+        '<span id="block-discount-heading" role="heading">Apply Discount Code</span></div>'
+        '<div class="payment-option-content" style="display:none">'
+        '<input class="input-text" type="text" id="discount-code" name="discount_code" '
+        'placeholder="Enter discount code"> '
+        '<button class="action action-apply" type="button"><span>Apply Discount</span></button></div></div></li>'
+    )
+    body = (f'<div id="checkout" class="checkout-container"><div class="opc-wrapper"><ol class="opc" id="checkoutSteps">'
+            f'{shipping}{payment}</ol></div><aside class="opc-sidebar"><div class="opc-block-summary">'
+            f'<span class="title">Order Summary</span><table class="data table table-totals"><tbody></tbody></table>'
+            f'</div></aside></div>')
+    return _layout("Checkout", body, _CHECKOUT_JS, checkout=True).encode()
+
+
+@lru_cache(maxsize=1)
+def _home_html() -> bytes:
+    body = (f'{_title("Home Page")}<div class="blocks-promo"><p>Local storefront stub for the checkout suite.</p>'
+            f'</div>')
+    return _layout("Home Page", body).encode()
+
+
+def not_found(handler) -> None:
+    _send_html(handler, _layout("404 Not Found", _title("Whoops, our bad...")), status=404)
+
+
+@page("GET", r"")
+def home(handler):
+    _send_html(handler, _home_html())
+
+
+@page("GET", r"/(?P<path>[a-z0-9/-]+)\.html")
+def catalog_page(handler, path):
+    if catalog.category(path):
+        _send_html(handler, _category_html(path, _applied_filters(urlsplit(handler.path).query)))
+        return
+    found = catalog.product_by_url_key(path)
+    if found:
+        _send_html(handler, _product_html(found[0]))
+    else:
+        not_found(handler)
+
+
+@page("GET", r"/checkout")
+def checkout(handler):
+    _send_html(handler, _checkout_html())
+
+
+@page("GET", r"/checkout/onepage/success")
+def checkout_success(handler):
+    cart_id = _cookie(handler, CART_COOKIE)
+    cart = handler.state.cart(cart_id) if cart_id else None
+    if cart is None or cart.order_number is None:
+        _redirect(handler, "/")
+        return
+    body = (f'{_title("Thank you for your purchase!")}<div class="checkout-success">'
+            f'<p>Your order # is: <span>{_e(cart.order_number)}</span>.</p>'
+            f'<p>We\'ll email you an order confirmation with details and tracking info.</p>'
+            f'<div class="actions-toolbar"><a class="action primary continue" href="/">Continue Shopping</a></div>'
+            f'</div>')
+    # The order is placed; the next add to cart starts a new guest cart.
+    _send_html(handler, _layout("Success Page", body),
+               headers={"Set-Cookie": f"{CART_COOKIE}=; Path=/; Max-Age=0"})
+
+
+@page("GET", r"/customer/account/login")
+def login(handler):
+    body = (f'{_title("Customer Login")}<form class="form form-login" method="post" '
+            f'action="/customer/account/loginPost/">'
+            f'<div class="field email required"><label class="label" for="email">Email</label>'
+            f'<input name="login[username]" id="email" type="text" class="input-text"></div>'
+            f'<div class="field password required"><label class="label" for="pass">Password</label>'
+            f'<input name="login[password]" id="pass" type="password" class="input-text"></div>'
+            f'<button type="submit" class="action login primary" id="send2"><span>Sign In</span></button></form>')
+    _send_html(handler, _layout("Customer Login", body))
+
+
+@page("POST", r"/customer/account/loginPost")
+def login_post(handler):
+    length = int(handler.headers.get("Content-Length") or 0)
+    fields = dict(parse_qsl(handler.rfile.read(length).decode()))
+    username = fields.get("login[username]", "").strip()
+    if not username or not fields.get("login[password]"):
+        _redirect(handler, "/customer/account/login/")
+        return
+    _redirect(handler, "/customer/account/", {"Set-Cookie": f"{CUSTOMER_COOKIE}={quote(username)}; Path=/"})
+
+
+@page("GET", r"/customer/account")
+def account(handler):
+    _send_html(handler, _layout("My Account", _title("My Account")))
@@ -0,0 +1,70 @@
+import pytest
+from utills.adaptive import AdaptiveTimeouts, OutcomeTracker, TimingDB, flaky_tests
+
+
+class Timeout(Exception):
+    pass
+
+
+def policy_with(p99):
+    policy = AdaptiveTimeouts()
+    policy.configure({"enabled": True, "retry_delay_ms": 0})
+    policy.p99 = p99
+    return policy
+
+
+def test_timeouts_follow_the_p99_within_the_configured_ceiling(tmp_path):
+    db = TimingDB(str(tmp_path / "adaptive.sqlite"))
+    db.add_waits([("click #next", ms) for ms in range(1, 101)] + [("click #rare", 50)], run_id="run1")
+    p99 = db.percentiles(99, window=200, min_samples=20)
+    assert set(p99) == {"click #next"} and 99 <= p99["click #next"] <= 100
+
+    policy = policy_with({"menu_item a": 1000})
+    assert policy.plan("menu_item a", 5000) == [1500, 2500]   # p99 x 1.5, then the rest of p99 x 4
+    assert policy.plan("menu_item a", 2000) == [1500, 500]    # never past the caller's timeout
+    assert policy.plan("menu_item b", 5000) == [5000]         # no history: as configured
+
+
+def test_idempotent_waits_are_retried_until_the_last_attempt():
+    policy = policy_with({"wait": 1000})
+    timeouts = []
+
+    def wait(ms):
+        timeouts.append(ms)
+        if len(timeouts) < 2:
+            raise Timeout()
+        return "visible"
+
+    assert policy.run("wait", 10000, wait, (Timeout,)) == "visible"
+    assert timeouts == [1500, 2500]
+
+    with pytest.raises(Timeout):
+        policy.run("wait", 10000, lambda ms: (_ for _ in ()).throw(Timeout()), (Timeout,))
+
+
+def test_only_tests_that_flip_between_pass_and_fail_are_quarantined(tmp_path):
+    db = TimingDB(str(tmp_path / "adaptive.sqlite"))
+    for run, flaky_passed in enumerate([True, False, True, True, False, True]):
+        db.add_outcomes([
+            ("test_main.py::test_order[TC01]", "TC01", 1, True),
+            ("test_main.py::test_order[TC02]", "TC02", 1, flaky_passed),
+            ("test_main.py::test_order[TC03]", "TC03", 1, False),
+        ], run_id=f"run{run}")
+
+    flaky = flaky_tests(db, {"window": 20, "min_runs": 5, "threshold": 0.1})
+    assert list(flaky) == ["test_main.py::test_order[TC02]"]
+    assert flaky["test_main.py::test_order[TC02]"].scenario == "TC02"
+    assert flaky["test_main.py::test_order[TC02]"].flips == 4
+
+
+def test_outcomes_are_not_written_while_adaptive_is_disabled(tmp_path):
+    db = TimingDB(str(tmp_path / "adaptive.sqlite"))
+    tracker = OutcomeTracker()
+    tracker.record("test_main.py::test_order[TC01]", "TC01", 1, False)
+    tracker.flush(db, "run1")
+    assert not (tmp_path / "adaptive.sqlite").exists()
+
+    tracker.enabled = True
+    tracker.record("test_main.py::test_order[TC01]", "TC01", 1, False)
+    tracker.flush(db, "run2")
+    assert db.history() == {"test_main.py::test_order[TC01]": [("TC01", False)]}
@@ -0,0 +1,71 @@
+import json
+import os
+import time
+import zipfile
+from utills.allure_store import MANIFEST_DIR, compact, enforce_retention, list_runs, restore, write_if_changed
+
+
+def write(path, content, age=0):
+    with open(path, "w") as f:
+        f.write(content)
+    if age:
+        past = time.time() - age
+        os.utime(path, (past, past))
+
+
+def make_run(report_dir, run_id, results, age):
+    manifest = os.path.join(report_dir, MANIFEST_DIR, f"{run_id}.jsonl")
+    os.makedirs(os.path.dirname(manifest), exist_ok=True)
+    lines = []
+    for result, attachments in results.items():
+        write(os.path.join(report_dir, result), json.dumps({"name": result}), age)
+        for attachment in attachments:
+            write(os.path.join(report_dir, attachment), f"body of {attachment}", age)
+        lines.append(json.dumps({"file": result, "attachments": attachments}))
+    write(manifest, "\n".join(lines) + "\n", age)
+
+
+def test_old_runs_are_compacted_into_one_archive(tmp_path):
+    report_dir = str(tmp_path / "allure")
+    archive = str(tmp_path / "archive" / "runs.zip")
+    os.makedirs(report_dir)
+    write(os.path.join(report_dir, "0000-result.json"), "{}", age=7200)  # written before the store existed
+    make_run(report_dir, "run1", {"a-result.json": ["shared-attachment.png", "old-attachment.txt"]}, age=3600)
+    make_run(report_dir, "run2", {"b-result.json": ["shared-attachment.png"]}, age=0)
+
+    assert list(list_runs(report_dir)) == ["legacy", "run1", "run2"]
+    assert compact(report_dir, archive, keep_runs=1, protected=["run2"]) == ["legacy", "run1"]
+
+    remaining = set(os.listdir(report_dir))
+    assert {"b-result.json", "shared-attachment.png"} <= remaining
+    assert not {"a-result.json", "old-attachment.txt", "0000-result.json"} & remaining
+    with zipfile.ZipFile(archive) as zf:
+        names = set(zf.namelist())
+    assert {"runs/run1/a-result.json", "attachments/shared-attachment.png",
+            "attachments/old-attachment.txt", "runs/legacy/0000-result.json"} <= names
+
+    target = str(tmp_path / "restored")
+    assert restore(archive, "run1", target) == 1
+    assert sorted(os.listdir(target)) == ["a-result.json", "old-attachment.txt", "shared-attachment.png"]
+
+
+def test_retention_drops_oldest_archived_runs_first(tmp_path):
+    report_dir = str(tmp_path / "allure")
+    archive = str(tmp_path / "runs.zip")
+    os.makedirs(report_dir)
+    make_run(report_dir, "run1", {"a-result.json": ["a-attachment.txt"]}, age=3600)
+    make_run(report_dir, "run2", {"b-result.json": ["b-attachment.txt"]}, age=1800)
+    make_run(report_dir, "run3", {"c-result.json": ["c-attachment.txt"]}, age=0)
+    compact(report_dir, archive, keep_runs=1, protected=["run3"])
+
+    assert enforce_retention(report_dir, archive, max_mb=0, protected=["run3"]) >= 2
+    assert not os.path.exists(archive)
+    assert "c-result.json" in os.listdir(report_dir)
+
+
+def test_scaffolding_is_only_rewritten_on_change(tmp_path):
+    path = str(tmp_path / "executor.json")
+    assert write_if_changed(path, "{}")
+    mtime = os.path.getmtime(path)
+    assert not write_if_changed(path, "{}")
+    assert os.path.getmtime(path) == mtime
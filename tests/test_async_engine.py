@@ -0,0 +1,23 @@
+import asyncio
+import pytest
+import allure
+from utills.async_runner import run_scenarios
+
+
+@allure.tag("regression", "checkout", "async")
+@allure.severity(allure.severity_level.CRITICAL)
+@pytest.mark.engine("async")
+def test_checkout_scenarios_async(config, excel_reader, customer_data, matrix_browser):
+    rows = excel_reader.get_order_test_cases()
+    results = asyncio.run(run_scenarios(config, rows, customer_data, matrix_browser))
+
+    for result in results:
+        status = "passed" if result.passed else f"failed: {result.error}"
+        allure.attach(
+            f"{result.scenario} {status} in {result.seconds:.1f}s\n\n{result.trace.format()}",
+            name=f"Scenario {result.scenario}",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+    failed = [f"{r.scenario}: {r.error}" for r in results if not r.passed]
+    assert not failed, "Async scenarios failed:\n" + "\n".join(failed)
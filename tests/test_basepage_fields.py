@@ -0,0 +1,43 @@
+from decimal import Decimal
+
+import pytest
+
+from utills.basepage import BasePage, parse_money
+
+FIELDS = {
+    "name": ("a.product-item-link", "text", "str"),
+    "url": ("a.product-item-link", "href", "str"),
+    "price": (".price", "text", "money"),
+    "discount": (".discount .price", "text", "money"),
+}
+
+
+@pytest.mark.parametrize("text, amount", [
+    ("$45.00", Decimal("45.00")),
+    ("$1,234.50", Decimal("1234.50")),
+    ("  $5.00\n", Decimal("5.00")),
+    ("-$20.00", Decimal("-20.00")),
+    ("- $20.00", Decimal("-20.00")),
+    ("Free", None),
+    ("", None),
+    (None, None),
+    ("1.2.3", None),
+])
+def test_parse_money(text, amount):
+    assert parse_money(text) == amount
+
+
+def test_field_spec_sends_only_selector_and_attribute_to_the_page():
+    assert BasePage._field_spec(FIELDS) == {
+        "name": ["a.product-item-link", "text"],
+        "url": ["a.product-item-link", "href"],
+        "price": [".price", "text"],
+        "discount": [".discount .price", "text"],
+    }
+
+
+def test_parse_fields_converts_money_and_leaves_missing_fields_none():
+    raw = {"name": "Radiant Tee", "price": "$22.00", "discount": "-$4.40"}
+    assert BasePage._parse_fields(raw, FIELDS) == {
+        "name": "Radiant Tee", "url": None, "price": Decimal("22.00"), "discount": Decimal("-4.40")}
+    assert BasePage._parse_fields({}, FIELDS) == dict.fromkeys(FIELDS)
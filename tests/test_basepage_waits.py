@@ -0,0 +1,143 @@
+from types import SimpleNamespace
+
+import asyncio
+
+import pytest
+
+from utills import async_basepage, basepage
+from utills.async_basepage import AsyncBasePage
+from utills.basepage import BasePage, PlaywrightTimeout
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+
+
+class FakePage:
+    """Replays scripted (event, request) pairs while BasePage waits for an event.
+
+    A wait returns at the first scripted event it is waiting for; when the
+    script runs out it times out and the clock moves on by its timeout.
+    """
+
+    def __init__(self, clock, *script):
+        self.clock = clock
+        self.script = list(script)
+        self.listeners = {}
+        self.waits = []
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def emit(self, event, request):
+        for handler in list(self.listeners.get(event, ())):
+            handler(request)
+
+    def wait_for_event(self, event, predicate, timeout):
+        self.waits.append((event, timeout))
+        while self.script:
+            name, request = self.script.pop(0)
+            self.emit(name, request)
+            if name == event and predicate(request):
+                return request
+        self.clock.now += timeout / 1000
+        raise PlaywrightTimeout(f"Timeout {timeout}ms exceeded")
+
+
+def xhr(path):
+    return SimpleNamespace(url=f"https://shop.test{path}")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(basepage, "time", clock)
+    monkeypatch.setattr(async_basepage, "time", clock)
+    return clock
+
+
+def settle(page, fired=(), **options):
+    with BasePage(page).expect_network_idle("/estimate-shipping", **options):
+        for request in fired:
+            page.emit("request", request)
+
+
+def test_waits_for_the_requests_fired_in_the_block_then_a_quiet_window(clock):
+    first, asset = xhr("/rest/estimate-shipping"), xhr("/static/logo.png")
+    page = FakePage(clock, ("request", asset), ("requestfinished", asset), ("requestfinished", first))
+    settle(page, [first, asset])
+    assert page.waits == [("requestfinished", 500), ("request", 500)]
+    assert all(not handlers for handlers in page.listeners.values())
+
+
+def test_a_request_started_in_the_quiet_window_is_waited_for_too(clock):
+    first, second = xhr("/rest/estimate-shipping"), xhr("/rest/estimate-shipping?retry=1")
+    page = FakePage(clock, ("requestfinished", first), ("request", second), ("requestfinished", second))
+    settle(page, [first])
+    assert page.waits == [("requestfinished", 500), ("request", 500), ("requestfinished", 500), ("request", 500)]
+
+
+def test_a_failed_request_counts_as_settled(clock):
+    failed = xhr("/rest/estimate-shipping")
+    page = FakePage(clock, ("requestfailed", failed))
+    settle(page, [failed])
+    assert page.waits == [("requestfinished", 500), ("request", 500)]
+
+
+def test_a_stalled_request_times_out_at_the_deadline(clock):
+    page = FakePage(clock)
+    with pytest.raises(PlaywrightTimeout, match="did not settle"):
+        settle(page, [xhr("/rest/estimate-shipping")], timeout=1250)
+    assert page.waits == [("requestfinished", 500), ("requestfinished", 500), ("requestfinished", 250)]
+    assert clock.now == 1.25
+
+
+def test_the_async_page_enforces_the_same_deadline(clock):
+    class AsyncFakePage(FakePage):
+        async def wait_for_event(self, event, predicate, timeout):
+            return FakePage.wait_for_event(self, event, predicate, timeout)
+
+    async def settle_async(page):
+        async with AsyncBasePage(page).expect_network_idle("/estimate-shipping", timeout=1250):
+            page.emit("request", xhr("/rest/estimate-shipping"))
+
+    page = AsyncFakePage(clock)
+    with pytest.raises(PlaywrightTimeout, match="did not settle"):
+        asyncio.run(settle_async(page))
+    assert page.waits == [("requestfinished", 500), ("requestfinished", 500), ("requestfinished", 250)]
+
+
+class DomPage:
+    def __init__(self, changed=True):
+        self.changed = changed
+        self.calls = []
+
+    def evaluate(self, script, selector):
+        self.calls.append(("evaluate", selector))
+        return "https://shop.test/men.html|a,b"
+
+    def wait_for_function(self, script, arg, timeout):
+        self.calls.append(("wait_for_function", arg, timeout))
+        if not self.changed:
+            raise PlaywrightTimeout(f"Timeout {timeout}ms exceeded")
+
+
+def test_dom_change_waits_for_a_new_signature():
+    page = DomPage()
+    with BasePage(page).expect_dom_change(".product-item-link", timeout=3000):
+        page.calls.append("click filter")
+    assert page.calls == [("evaluate", ".product-item-link"), "click filter",
+                          ("wait_for_function", [".product-item-link", "https://shop.test/men.html|a,b"], 3000)]
+
+    with pytest.raises(PlaywrightTimeout):
+        with BasePage(DomPage(changed=False)).expect_dom_change(".product-item-link"):
+            pass
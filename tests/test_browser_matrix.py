@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+from utills.browser_matrix import Cascade, assign, parse_browsers, split_nodeid
+from utills.sharding import DurationStore
+
+BROWSERS = ["chromium", "firefox", "webkit"]
+TEST = "tests/test_main.py::test_complete_checkout_flow"
+
+
+def matrix(scenarios):
+    return [f"{TEST}[{scenario}-{browser}]" for scenario in scenarios for browser in BROWSERS]
+
+
+def report(nodeid, when, outcome):
+    return SimpleNamespace(nodeid=nodeid, when=when, passed=outcome == "passed", failed=outcome == "failed")
+
+
+def test_browsers_are_validated_and_taken_from_the_option_first():
+    assert parse_browsers("webkit, chromium,webkit", ["firefox"]) == ["webkit", "chromium"]
+    assert parse_browsers(None, ["firefox"]) == ["firefox"]
+    with pytest.raises(ValueError):
+        parse_browsers("edge", None)
+    assert split_nodeid(f"{TEST}[TC01-firefox]@shard2", BROWSERS) == (f"{TEST}[TC01]", "firefox")
+    assert split_nodeid("tests/test_async_engine.py::test_checkout_scenarios_async[webkit]", BROWSERS) == \
+        ("tests/test_async_engine.py::test_checkout_scenarios_async", "webkit")
+
+
+def test_shards_are_split_between_browsers_unless_cascading(tmp_path):
+    store = DurationStore(str(tmp_path / "durations.json"))
+    nodeids = matrix(["TC01", "TC02", "TC03", "TC04"])
+
+    assignment = assign(nodeids, BROWSERS, store, shards=6)
+    for shard in range(6):
+        browsers = {split_nodeid(n, BROWSERS)[1] for n, s in assignment.items() if s == shard}
+        assert len(browsers) == 1   # one browser type to launch per process
+
+    assignment = assign(nodeids, BROWSERS, store, shards=6, cascade=True)
+    for scenario in ("TC01", "TC02", "TC03", "TC04"):
+        assert len({assignment[f"{TEST}[{scenario}-{browser}]"] for browser in BROWSERS}) == 1
+
+
+def test_cascade_runs_other_browsers_only_where_the_first_passed():
+    cascade = Cascade(BROWSERS)
+    nodeids = sorted(matrix(["TC01", "TC02", "TC03"]), key=cascade.order)
+    assert [split_nodeid(n, BROWSERS)[1] for n in nodeids[:3]] == ["chromium"] * 3
+
+    cascade.record(report(f"{TEST}[TC01-chromium]", "call", "passed"))
+    cascade.record(report(f"{TEST}[TC02-chromium]", "call", "failed"))
+    cascade.record(report(f"{TEST}[TC03-chromium]", "setup", "skipped"))
+
+    assert cascade.skip_reason(f"{TEST}[TC01-firefox]") is None
+    assert cascade.skip_reason(f"{TEST}[TC02-webkit]") == "cascade: failed on chromium"
+    assert cascade.skip_reason(f"{TEST}[TC03-webkit]") == "cascade: not run on chromium"
+    assert cascade.skip_reason(f"{TEST}[TC02-chromium]") is None
@@ -0,0 +1,43 @@
+import pytest
+import requests
+from stub_store import MagentoStubServer
+from utills.cart_seeder import GuestCartSeeder
+
+
+@pytest.fixture(scope="module")
+def stub_store():
+    with MagentoStubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def seeder(config, stub_store):
+    session = requests.Session()
+    yield GuestCartSeeder(session, stub_store.base_url + "rest/", config['cart_seeding'])
+    session.close()
+
+
+def test_seed_cart_from_excel_row(seeder, stub_store, excel_reader, customer_data):
+    row = excel_reader.get_order_test_cases()[0]
+    cart = seeder.seed_from_row(row, customer_data)
+
+    stored = stub_store.state.cart(cart.cart_id)
+    assert stored is not None
+    assert stored.items[0]["sku"] == seeder.resolve_sku(row)
+    assert stored.items[0]["qty"] == (int(row["Quantity"]) if row.get("Quantity") else 1)
+    assert cart.shipping["totals"]["grand_total"] > 0
+
+
+def test_seed_cart_resolves_configurable_options(seeder, stub_store):
+    row = {"Scenario": "TC001", "Size": "XS", "Color": "Blue", "Quantity": 2}
+    cart = seeder.seed_from_row(row)
+
+    options = stub_store.state.cart(cart.cart_id).items[0]["product_option"]["extension_attributes"][
+        "configurable_item_options"]
+    assert {"option_id": "143", "option_value": 166} in options
+    assert {"option_id": "93", "option_value": 50} in options
+
+
+def test_unknown_option_is_rejected(seeder):
+    with pytest.raises(ValueError):
+        seeder.resolve_options({"Size": "XXXL"})
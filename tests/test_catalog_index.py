@@ -0,0 +1,49 @@
+import json
+
+from utills.catalog_index import CatalogIndex, product_key
+
+BASE = "https://shop.example/"
+MENU = [
+    {"labels": ["Women"], "href": "https://shop.example/women.html"},
+    {"labels": ["Women", "Tops"], "href": "https://shop.example/women/tops-women.html"},
+    {"labels": ["Women", "Tops", "Jackets"], "href": "https://shop.example/women/tops-women/jackets-women.html"},
+]
+FILTERS = {"SIZE": "M", "COLOR": "Blue", "Pattern": float("nan"), "Climate": "", "Style": None}
+
+
+def test_menu_paths_resolve_from_one_menu_scrape(tmp_path):
+    index = CatalogIndex(BASE, str(tmp_path))
+    assert not index.menu_indexed
+    index.learn_menu(MENU)
+    assert index.category_url(["women", " Tops ", "Jackets"]) == MENU[2]["href"]
+    assert index.category_url(["Women", "Tops", float("nan")]) == MENU[1]["href"]   # empty Excel cell
+    assert index.category_url(["Men", "Tops"]) is None
+
+    # Persisted relative to the base URL, so a storefront on another port reuses it.
+    stub = CatalogIndex("http://shop.example:8090/", str(tmp_path))
+    assert stub.menu_indexed
+    assert stub.category_url(["Women", "Tops"]) == "http://shop.example:8090/women/tops-women.html"
+
+
+def test_products_are_keyed_by_menu_path_and_the_filters_that_were_set(tmp_path):
+    index = CatalogIndex(BASE, str(tmp_path))
+    assert product_key(["Women", "Tops"], FILTERS) == product_key(["women", "tops"], {"COLOR": "blue", "SIZE": "M"})
+    index.remember_product(["Women", "Tops"], FILTERS, "https://shop.example/olivia-jacket.html")
+    assert CatalogIndex(BASE, str(tmp_path)).product_url(["Women", "Tops"], {"SIZE": "M", "COLOR": "Blue"}) == \
+        "https://shop.example/olivia-jacket.html"
+    assert index.product_url(["Women", "Tops"], {"SIZE": "L", "COLOR": "Blue"}) is None
+
+    index.forget_product(["Women", "Tops"], FILTERS)
+    assert CatalogIndex(BASE, str(tmp_path)).product_url(["Women", "Tops"], FILTERS) is None
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    CatalogIndex(BASE, str(tmp_path)).learn_menu(MENU)
+    path = tmp_path / "shop.example.json"
+    data = json.loads(path.read_text())
+    data["categories"]["women"]["saved"] -= 7200
+    path.write_text(json.dumps(data))
+
+    index = CatalogIndex(BASE, str(tmp_path), ttl_seconds=3600)
+    assert index.category_url(["Women"]) is None
+    assert index.category_url(["Women", "Tops"]) == MENU[1]["href"]
@@ -0,0 +1,60 @@
+import json
+import time
+from types import SimpleNamespace
+
+from utills.checkpoints import ScenarioCheckpoints, data_digest
+
+ROW = {"Scenario": "TC01", "Size": "M", "Color": "Blue"}
+
+
+class FakeContext:
+    def __init__(self, cookies):
+        self.cookies = cookies
+
+    def storage_state(self, path):
+        with open(path, "w") as f:
+            json.dump({"cookies": self.cookies, "origins": []}, f)
+
+
+def fake_page(url, cookies=()):
+    return SimpleNamespace(url=url, context=FakeContext(list(cookies)))
+
+
+def store(tmp_path, row=ROW, ttl=1800):
+    return ScenarioCheckpoints("TC01-chromium", data_digest("http://shop", row), str(tmp_path), ttl, resume=True)
+
+
+def test_latest_is_the_furthest_stage_and_saving_drops_later_ones(tmp_path):
+    checkpoints = store(tmp_path)
+    assert checkpoints.latest() is None
+    checkpoints.save(fake_page("http://shop/product.html"), "cart_built")
+    checkpoints.save(fake_page("http://shop/checkout/#payment", [{"name": "PHPSESSID"}]), "payment_reached")
+    latest = checkpoints.latest()
+    assert (latest.stage, latest.url) == ("payment_reached", "http://shop/checkout/#payment")
+    with open(latest.state_path) as f:
+        assert json.load(f)["cookies"] == [{"name": "PHPSESSID"}]
+
+    # A rerun that got past cart_built again must not resume from the old attempt's payment step.
+    checkpoints.save(fake_page("http://shop/product.html"), "cart_built")
+    assert checkpoints.latest().stage == "cart_built"
+
+
+def test_checkpoints_of_a_changed_excel_row_or_past_their_ttl_are_discarded(tmp_path):
+    store(tmp_path).save(fake_page("http://shop/checkout/"), "shipping_filled")
+    assert store(tmp_path, row=dict(ROW, Size="L")).latest() is None
+    assert store(tmp_path).latest() is None   # deleted, not just skipped
+
+    store(tmp_path).save(fake_page("http://shop/checkout/"), "shipping_filled")
+    meta = tmp_path / "TC01-chromium.shipping_filled.json"
+    data = json.loads(meta.read_text())
+    meta.write_text(json.dumps(dict(data, saved=time.time() - 3600)))
+    assert store(tmp_path).latest() is None
+    assert not meta.exists()
+
+
+def test_clear_removes_every_stage(tmp_path):
+    checkpoints = store(tmp_path)
+    for stage in ("cart_built", "shipping_filled"):
+        checkpoints.save(fake_page("http://shop/"), stage)
+    checkpoints.clear()
+    assert list(tmp_path.iterdir()) == []
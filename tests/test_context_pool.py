@@ -0,0 +1,137 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utills.context_pool import ContextPool
+
+MB = 1024 * 1024
+
+
+class FakePage:
+    def __init__(self):
+        self.main_frame = SimpleNamespace(url="about:blank")
+        self.closed = False
+        self.responsive = True
+        self.heap = 10 * MB
+        self.fail_reset = False
+        self.resets = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def is_closed(self):
+        return self.closed
+
+    def wait_for_function(self, expression, timeout):
+        if not self.responsive:
+            raise TimeoutError("page does not respond")
+
+    def evaluate(self, script, arg=None):
+        if "usedJSHeapSize" in script:
+            return self.heap
+        if self.fail_reset:
+            raise RuntimeError("page navigated away")
+        self.resets.append(arg)
+
+    def goto(self, url):
+        self.main_frame.url = url
+        self.handlers["framenavigated"](self.main_frame)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cookies = [{"name": "visited", "value": "1"}]
+        self.closed = False
+
+    def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def clear_permissions(self):
+        pass
+
+    def add_cookies(self, cookies):
+        self.cookies += cookies
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / "consent.json"
+    path.write_text(json.dumps({"cookies": [{"name": "consent", "value": "yes"}],
+                                "origins": [{"origin": "https://shop", "localStorage": []}]}))
+    return str(path)
+
+
+def pool_with(snapshot=None, **options):
+    return ContextPool(FakeContext, snapshot, **options)
+
+
+def test_a_released_context_is_reset_to_the_snapshot_and_reused(snapshot):
+    pool = pool_with(snapshot, size=1)
+    pool.warm()
+    pooled = pool.acquire()
+    pooled.page.goto("https://shop/checkout/")
+    extra = pooled.context.new_page()
+    pool.release(pooled)
+
+    assert pooled.context.cookies == [{"name": "consent", "value": "yes"}]
+    assert pooled.page.resets == [[{"origin": "https://shop", "localStorage": []}]]
+    assert pooled.page.main_frame.url == "about:blank" and extra.closed
+    assert pool.acquire() is pooled
+    assert pool.created == 1
+
+
+def test_a_context_is_recycled_after_max_uses():
+    pool = pool_with(size=1, max_uses=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)                             # second use
+    assert first.context.closed and pool.recycled == 1
+    assert pool.acquire() is not first
+
+
+@pytest.mark.parametrize("break_it", [
+    lambda pooled: setattr(pooled.page, "responsive", False),
+    lambda pooled: setattr(pooled, "crashed", True),
+    lambda pooled: setattr(pooled.page, "heap", 600 * MB),
+    lambda pooled: setattr(pooled.page, "fail_reset", True),
+], ids=["unresponsive", "crashed", "over-memory", "reset-fails"])
+def test_a_broken_context_is_recycled_on_release(break_it):
+    pool = pool_with(size=1, memory_limit_mb=512)
+    pooled = pool.acquire()
+    break_it(pooled)
+    pool.release(pooled)
+    assert pooled.context.closed and pool.recycled == 1
+    assert pool.acquire() is not pooled
+
+
+def test_a_context_that_visited_another_origin_is_recycled():
+    pool = pool_with(size=1)
+    pooled = pool.acquire()
+    pooled.page.goto("https://shop/")
+    pooled.page.goto("https://payments.example/authorize")
+    pool.release(pooled)
+    assert pooled.context.closed and pool.recycled == 1
+
+
+def test_an_idle_context_that_stopped_responding_is_not_handed_out():
+    pool = pool_with(size=2)
+    pool.warm()
+    stale, fresh = list(pool._idle)
+    stale.page.responsive = False
+    assert pool.acquire() is fresh
+    assert stale.context.closed
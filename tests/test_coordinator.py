@@ -0,0 +1,98 @@
+import base64
+import socket
+import time
+from types import SimpleNamespace
+
+from utills.coordinator import Channel, Coordinator, WorkerPlugin, parse_address, serve
+
+
+def connect(address, name):
+    family, target = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(target)
+    channel = Channel(sock)
+    channel.send({"type": "hello", "worker": name})
+    assert channel.receive()["type"] == "welcome"
+    return channel
+
+
+def take(channel):
+    channel.send({"type": "next"})
+    return channel.receive()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    assert condition()
+
+
+def test_results_and_allure_files_are_merged(tmp_path):
+    coordinator = Coordinator(["TC01", "TC02"], str(tmp_path), "run-1")
+    server, address = serve(coordinator, "127.0.0.1:0", 10, 30)
+    try:
+        worker = connect(address, "a")
+        for _ in range(2):
+            scenario = take(worker)["scenario"]
+            worker.send({"type": "file", "name": "abc-attachment.png", "data": base64.b64encode(b"png").decode()})
+            worker.send({"type": "file", "name": f"{scenario}-result.json", "data": base64.b64encode(b"{}").decode()})
+            worker.send({"type": "manifest", "lines": [f'{{"file": "{scenario}-result.json"}}\n']})
+            worker.send({"type": "result", "scenario": scenario, "seconds": 1.0,
+                         "tests": {f"t[{scenario}]": "passed"}})
+        assert take(worker) == {"type": "done"}
+        wait_for(lambda: coordinator.finished)
+    finally:
+        server.shutdown()
+    assert {r["status"] for r in coordinator.results.values()} == {"passed"}
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_file()) == \
+        ["TC01-result.json", "TC02-result.json", "abc-attachment.png"]
+    assert len((tmp_path / ".runs" / "run-1.jsonl").read_text().splitlines()) == 2
+
+
+def test_scenarios_of_a_worker_that_goes_away_are_dispatched_again(tmp_path):
+    coordinator = Coordinator(["TC01"], str(tmp_path), "run-1", max_attempts=2)
+    server, address = serve(coordinator, "127.0.0.1:0", 10, 30)
+    try:
+        first = connect(address, "a")
+        assert take(first)["scenario"] == "TC01"
+        first.close()                                   # crashed mid-scenario
+        second = connect(address, "b")
+        assert take(second)["scenario"] == "TC01"
+        second.close()
+        wait_for(lambda: coordinator.finished)
+    finally:
+        server.shutdown()
+    assert coordinator.results["TC01"]["status"] == "lost"
+    assert coordinator.results["TC01"]["attempts"] == 2
+
+
+def test_a_silent_worker_is_dropped_after_the_heartbeat_timeout(tmp_path):
+    coordinator = Coordinator(["TC01"], str(tmp_path), "run-1")
+    server, address = serve(coordinator, "127.0.0.1:0", 0.1, 0.3)
+    try:
+        hung = connect(address, "hung")
+        assert take(hung)["scenario"] == "TC01"         # then never speaks again
+        wait_for(lambda: "TC01" in coordinator.pending)
+        alive = connect(address, "alive")
+        assert take(alive)["scenario"] == "TC01"
+    finally:
+        server.shutdown()
+
+
+def test_a_worker_dropped_by_the_coordinator_ends_its_loop_cleanly(tmp_path):
+    coordinator = Coordinator(["TC01"], str(tmp_path), "run-1")
+    server, address = serve(coordinator, "127.0.0.1:0", 10, 0.3)   # heartbeats too rare for the timeout
+    try:
+        worker = WorkerPlugin(address, scenario_of=lambda item: "TC01", name="slow")
+        item = SimpleNamespace(fixturenames=["order_test_data"], parent=None,
+                               config=SimpleNamespace(hook=SimpleNamespace(
+                                   pytest_runtest_protocol=lambda item, nextitem: time.sleep(0.6))))
+        session = SimpleNamespace(items=[item], shouldfail=False, shouldstop=False,
+                                  config=SimpleNamespace(option=SimpleNamespace(collectonly=False)),
+                                  _setupstate=SimpleNamespace(teardown_exact=lambda nextitem: None))
+        assert worker.pytest_runtestloop(session) is True
+        worker.pytest_unconfigure(session.config)
+    finally:
+        server.shutdown()
+    assert "TC01" in coordinator.pending
@@ -0,0 +1,64 @@
+import os
+import pickle
+
+import pytest
+
+from utills.data_provider import DataProvider, Record
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def write_workbook(path, customers):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Customer_Details"
+    sheet.append(["email", "zip_code", "phone", None])
+    sheet.append([None, None, None, None])                  # blank rows are dropped
+    for row in customers:
+        sheet.append(row)
+    workbook.create_sheet("Order_Details").append(["scenario", "quantity"])
+    workbook.save(path)
+
+
+def test_rows_keep_their_cell_types(tmp_path):
+    path = str(tmp_path / "data.xlsx")
+    write_workbook(path, [["a@example.com", "02134", 5551234567, "ignored"]])
+    customer = DataProvider(path, cache_dir=str(tmp_path / "cache")).get_customer()
+
+    assert customer["zip_code"] == "02134"                  # a string zip keeps its leading zero
+    assert customer["phone"] == 5551234567 and str(customer["phone"]) == "5551234567"
+    assert list(customer) == ["email", "zip_code", "phone"]
+    assert customer.get("country", "US") == "US" and "country" not in customer
+    assert pickle.loads(pickle.dumps(customer)) == customer
+    assert DataProvider(path, cache_dir=str(tmp_path / "cache")).get_order_test_cases() == []
+
+
+def test_the_cache_is_rebuilt_only_when_the_workbook_content_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / "data.xlsx")
+    cache_dir = str(tmp_path / "cache")
+    write_workbook(path, [["a@example.com", "02134", 5551234567]])
+    assert DataProvider(path, cache_dir).get_customer()["email"] == "a@example.com"
+
+    builds = []
+    build = DataProvider._build
+    monkeypatch.setattr(DataProvider, "_build", lambda self, *args: builds.append(1) or build(self, *args))
+
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))     # touched, same bytes: the hash still matches
+    assert DataProvider(path, cache_dir).get_customer()["email"] == "a@example.com"
+    assert builds == []
+
+    write_workbook(path, [["b@example.com", "10001", 5559876543]])
+    os.utime(path, (stat.st_atime, stat.st_mtime + 20))
+    provider = DataProvider(path, cache_dir)
+    assert provider.get_customer().to_dict() == {"email": "b@example.com", "zip_code": "10001", "phone": 5559876543}
+    assert builds == [1]
+
+
+def test_a_record_reads_through_the_shared_column_index():
+    index = {"email": 0, "phone": 1}
+    first, second = Record(index, ("a@example.com", 1)), Record(index, ("b@example.com", 2))
+    assert (first["phone"], second["phone"]) == (1, 2)
+    assert first._index is second._index
+    with pytest.raises(KeyError):
+        first["zip_code"]
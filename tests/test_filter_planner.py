@@ -0,0 +1,36 @@
+from utills.filter_planner import FilterPlanner
+
+CATEGORY = "http://shop/women/tops-women/jackets-women.html"
+SECTIONS = [
+    {"title": "Size", "options": [{"label": "M", "href": f"{CATEGORY}?size=168"},
+                                  {"label": "L", "href": f"{CATEGORY}?size=169"}]},
+    {"title": "Color", "options": [{"label": "Blue", "href": f"{CATEGORY}?color=50"}]},
+    {"title": "Climate", "options": [{"label": "Cold", "href": f"{CATEGORY}?climate=204"}]},
+]
+
+
+def test_labels_resolve_to_one_filtered_url():
+    planner = FilterPlanner()
+    assert planner.plan(CATEGORY, {"SIZE": "M"}) is None   # nothing scraped for this category yet
+    planner.learn(CATEGORY, SECTIONS)
+    assert planner.knows(CATEGORY + "?size=168")
+    assert planner.plan(CATEGORY, {"SIZE": "M", "COLOR": "blue", "Climate": "Cold"}) == \
+        f"{CATEGORY}?size=168&color=50&climate=204"
+
+
+def test_unknown_filters_or_options_fall_back_to_clicking():
+    planner = FilterPlanner()
+    planner.learn(CATEGORY, SECTIONS)
+    assert planner.plan(CATEGORY, {"SIZE": "XXL"}) is None
+    assert planner.plan(CATEGORY, {"Pattern": "Solid"}) is None
+
+
+def test_options_of_a_filtered_page_add_only_their_own_parameter():
+    planner = FilterPlanner()
+    filtered = f"{CATEGORY}?size=168"
+    planner.learn(filtered, [{"title": "Color", "options": [
+        {"label": "Blue", "href": f"{CATEGORY}?size=168&color=50"},
+        {"label": "Women", "href": "http://shop/women.html?size=168"},   # category link, not a filter
+    ]}])
+    assert planner.plan(filtered, {"Color": "Blue", "Size": "L"}) is None
+    assert planner.plan(filtered, {"Color": "Blue"}) == f"{CATEGORY}?size=168&color=50"
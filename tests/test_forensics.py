@@ -0,0 +1,71 @@
+import os
+from types import SimpleNamespace
+
+from utills.forensics import FailureTrace
+
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **options):
+        self.calls.append("start")
+
+    def group(self, name):
+        self.calls.append(f"group {name}")
+
+    def group_end(self):
+        self.calls.append("group_end")
+
+    def stop(self, path=None):
+        self.calls.append(f"stop {os.path.basename(path)}" if path else "stop")
+        if path:
+            with open(path, "w") as f:
+                f.write("trace")
+
+
+def failure_trace(**options):
+    return FailureTrace(SimpleNamespace(tracing=FakeTracing()), **options)
+
+
+def steps(trace, *titles, depth=1):
+    for title in titles:
+        for level in range(depth):
+            trace.start_step(None, title if level == 0 else f"{title} > {level}", {})
+        for _ in range(depth):
+            trace.stop_step(None, None, None, None)
+
+
+def test_a_passing_test_discards_the_trace_without_writing_it():
+    trace = failure_trace()
+    trace.start()
+    steps(trace, "Open home", "Place order", depth=3)
+    assert trace.finish(failed=False) is None
+    assert trace.context.tracing.calls[-1] == "stop"
+    assert os.listdir(trace.work_dir) == []
+    assert trace.finish(failed=True) is None        # already stopped
+    trace.cleanup()
+    assert not os.path.exists(trace.work_dir)
+
+
+def test_a_failing_test_exports_the_trace_once():
+    trace = failure_trace()
+    trace.start()
+    steps(trace, "Open home", "Apply filters")
+    path = trace.finish(failed=True)
+    assert os.path.exists(path) and os.listdir(trace.work_dir) == ["trace.zip"]
+    assert trace.context.tracing.calls == ["start", "group Open home", "group_end", "group Apply filters",
+                                           "group_end", "stop trace.zip"]
+    trace.cleanup()
+
+
+def test_steps_deeper_than_group_depth_stay_in_their_parent_group():
+    shallow, deep = failure_trace(group_depth=1), failure_trace(group_depth=2)
+    for trace in (shallow, deep):
+        trace.start()
+        steps(trace, "Checkout", depth=3)
+        trace.finish(failed=False)
+        trace.cleanup()
+    assert shallow.context.tracing.calls == ["start", "group Checkout", "group_end", "stop"]
+    assert deep.context.tracing.calls == ["start", "group Checkout", "group Checkout > 1", "group_end",
+                                          "group_end", "stop"]
@@ -0,0 +1,37 @@
+import json
+
+from utills.har_diff import configured_volatile_params, diff
+from utills.har_manager import HarManager
+
+
+def write_har(path, urls):
+    entries = [{"request": {"method": "GET", "url": url},
+                "response": {"status": 200, "content": {"mimeType": "application/json", "text": "{}"}}}
+               for url in urls]
+    path.write_text(json.dumps({"log": {"entries": entries}}))
+    return str(path)
+
+
+def test_tests_of_the_same_scenario_get_their_own_archive(tmp_path):
+    manager = HarManager({"dir": str(tmp_path)}, mode="record")
+    paths = {manager.path_for("test_complete_checkout_flow[TC001]", "chromium"),
+             manager.path_for("test_checkout_with_seeded_cart[TC001]", "chromium")}
+    assert len(paths) == 2
+    assert all(path.endswith(".har") and "[" not in path for path in paths)
+
+
+def test_each_browser_of_the_matrix_gets_its_own_archive(tmp_path):
+    manager = HarManager({"dir": str(tmp_path)}, mode="record")
+    paths = {manager.path_for("test_complete_checkout_flow[TC001]", browser)
+             for browser in ("chromium", "firefox", "webkit")}
+    assert len(paths) == 3
+
+
+def test_diff_ignores_the_configured_volatile_params(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("har:\n  volatile_params: [form_key, uenc, force_new_section_timestamp]\n")
+    params = configured_volatile_params(str(config))
+    old = write_har(tmp_path / "old.har", ["http://shop/customer/section/load/?force_new_section_timestamp=1&uenc=a"])
+    new = write_har(tmp_path / "new.har", ["http://shop/customer/section/load/?force_new_section_timestamp=2&uenc=b"])
+    assert diff(old, new, params) == []
+    assert diff(old, new, ("form_key",)) != []
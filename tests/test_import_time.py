@@ -0,0 +1,15 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_collection_does_not_import_deferred_modules():
+    # conftest.py needs Allure; the wall-clock budget is left to benchmarks/import_time.py --check.
+    pytest.importorskip("allure")
+    proc = subprocess.run([sys.executable, os.path.join("benchmarks", "import_time.py"), "--check",
+                           "--deferred-only", "--runs", "1"], cwd=REPO_ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
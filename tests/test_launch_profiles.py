@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import time
+
+from utills.launch_profiles import LaunchProfile, ProfileRecorder, browser_rss_mb, summarize
+
+ENVIRONMENT = {"browser": "chromium", "headless": False}
+LAUNCH = {
+    "profile": "fast",
+    "profiles": {
+        "fast": {"headless": True, "viewport": {"width": 1280, "height": 800}, "chromium_args": ["--disable-gpu"],
+                 "block_resource_types": ["font", "media"], "block_third_party_images": True},
+        "fidelity": {},
+    },
+}
+
+
+def test_without_launch_settings_the_browser_launches_as_before():
+    profile = LaunchProfile.from_config(None, ENVIRONMENT)
+    assert profile.name == "fidelity"
+    assert profile.launch_options("chromium") == {"headless": False}
+    assert profile.viewport == {"width": 1920, "height": 1080}
+    assert profile.resource_filter("https://shop.example.com/") is None
+
+
+def test_fast_profile_blocks_fonts_media_and_third_party_images():
+    profile = LaunchProfile.from_config(LAUNCH, ENVIRONMENT)
+    assert profile.launch_options("chromium") == {"headless": True, "args": ["--disable-gpu"]}
+    assert profile.launch_options("firefox") == {"headless": True}
+
+    rules = profile.resource_filter("https://shop.example.com/")
+    routed = ["https://shop.example.com/static/fonts/Luma-Icons.woff2",
+              "https://shop.example.com/media/promo.mp4?autoplay=1",
+              "https://cdn.other.net/banner.png",
+              "https://tracker.other.net/pixel"]
+    assert all(rules.pattern.match(url) for url in routed)
+    assert not rules.pattern.match("https://shop.example.com/media/catalog/product/wj12.jpg")
+    assert not rules.pattern.match("https://img.shop.example.com/static/styles.css")
+
+    assert rules.blocks("font", routed[0])
+    assert rules.blocks("image", "https://cdn.other.net/banner.png")
+    assert not rules.blocks("image", "https://img.shop.example.com/logo.svg")
+    assert not rules.blocks("xhr", "https://tracker.other.net/pixel")
+
+
+def test_samples_are_summarized_per_profile(tmp_path):
+    child = subprocess.Popen([sys.executable, "-c", "import time; data = bytearray(20 * 2**20); time.sleep(30)"])
+    try:
+        rss = None
+        for _ in range(50):
+            rss = browser_rss_mb()
+            if rss and rss >= 20:
+                break
+            time.sleep(0.05)
+        assert rss is not None and rss >= 20
+    finally:
+        child.kill()
+        child.wait()
+
+    recorder = ProfileRecorder()
+    for seconds, rss in ((10.0, 300.0), (12.0, 340.0), (11.0, None)):
+        recorder.record("fast", "chromium", "test_checkout[TC01]", "TC01", seconds, rss)
+    recorder.flush(str(tmp_path / "profiles" / "main.jsonl"))
+
+    report = summarize(str(tmp_path))
+    assert "fast/chromium" in open(report).read()
@@ -0,0 +1,62 @@
+import pytest
+from locators.home_locators import HomePageLocators
+from locators.product_page_locators import ProductPageLocators
+from locators.registry import LocatorError, LocatorRegistry, css, xpath
+
+
+class FakePage:
+    def __init__(self):
+        self.calls = []
+
+    def locator(self, selector):
+        self.calls.append(selector)
+        return FakeLocator(selector)
+
+
+class FakeLocator:
+    def __init__(self, selector):
+        self.selector = selector
+
+    @property
+    def first(self):
+        return FakeLocator(self.selector + " >> nth=0")
+
+
+def test_values_with_quotes_are_escaped():
+    assert ProductPageLocators.SIZE_SWATCH.format(size='30"') == 'div.swatch-option.text[option-label="30\\""]'
+    assert HomePageLocators.NAV_MENU_ITEM.format(label="Men's") == ':text("Men\'s")'
+    assert HomePageLocators.SUBCATEGORY_LINK.format(label="Men's") == '//a[contains(text(),"Men\'s")]'
+    assert (HomePageLocators.SUBCATEGORY_LINK.format(label='It\'s "new"')
+            == '//a[contains(text(),concat("It\'s ", \'"\', "new", \'"\', ""))]')
+
+
+def test_templates_are_validated_when_compiled():
+    with pytest.raises(LocatorError):
+        css("a[aria-label={label}]")
+    with pytest.raises(LocatorError):
+        xpath("//a[text()='{label}']")
+    with pytest.raises(LocatorError):
+        css('a:has-text("{label}"')
+
+
+def test_register_rejects_malformed_selectors():
+    registry = LocatorRegistry()
+    with pytest.raises(LocatorError, match="Broken.BUTTON"):
+        @registry.register
+        class Broken:
+            BUTTON = "button[name='go'"
+
+
+def test_locators_are_memoized_per_page_with_counters():
+    registry = LocatorRegistry(per_page=2)
+    page = FakePage()
+    first = registry.locator(page, ProductPageLocators.COLOR_SWATCH, color="Red")
+    assert registry.locator(page, ProductPageLocators.COLOR_SWATCH, color="Red") is first
+    assert page.calls == ['div.swatch-option.color[option-label="Red"]']
+    assert registry.stats()["locator_hits"] == 1
+    assert registry.stats()["selector_hits"] == 1
+
+    registry.locator(page, "a.one")
+    registry.locator(page, "a.two")
+    assert registry.locator(page, ProductPageLocators.COLOR_SWATCH, color="Red") is not first
+    assert registry.stats()["locator_misses"] == 4
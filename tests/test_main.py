@@ -1,35 +1,30 @@
 import time
 import pytest
 import allure
-from utills.excel_reader import ExcelReader
 from pageobject.page_factory import PageFactory
 
-EXCEL_PATH = "data/test_data.xlsx"
-
 
 @allure.tag("regression", "checkout")
 @allure.severity(allure.severity_level.CRITICAL)
 @pytest.mark.order(1)
-def test_complete_checkout_flow(config, page, order_test_data):
-    factory = PageFactory(page, config)
-    customer_data = ExcelReader(EXCEL_PATH).get_customer()
+def test_complete_checkout_flow(config, page, storage_state, order_test_data, customer_data, checkpoints,
+                                catalog_index):
+    factory = PageFactory(page, config, prewarmed=storage_state is not None, checkpoints=checkpoints,
+                          catalog=catalog_index)
 
     base_url = config['urls']['base_url']
     timeouts = config['timeouts']
 
-    with allure.step("Open Magento Homepage"):
-        factory.base.navigate(base_url, timeout=timeouts['page_load'])
+    resumed = factory.resume()
+    if resumed:
+        allure.dynamic.parameter("resumed_from", resumed, excluded=True)
 
-    with allure.step("Navigate to Category from Excel"):
+    if not factory.reached("cart_built"):
         category_path = [
             order_test_data.get("Category"),
             order_test_data.get("SubCategory1"),
             order_test_data.get("SubCategory2")
         ]
-
-        factory.home.navigate_to_category(category_path)
-
-    with allure.step("Apply Product Filters"):
         filters = {
             "SIZE": order_test_data["Size"],
             "COLOR": order_test_data["Color"],
@@ -37,26 +32,93 @@ def test_complete_checkout_flow(config, page, order_test_data):
             "Climate": order_test_data["Climate"],
             "Style": order_test_data["Style"]
         }
-        factory.product.apply_filters(filters)
 
-    with allure.step("Click first visible product"):
-        factory.product.click_first_visible_product()
+        product_url = None
+        if not factory.open_indexed_product(category_path, filters):
+            with allure.step("Open Magento Homepage"):
+                factory.base.navigate(base_url, timeout=timeouts['page_load'])
+
+            with allure.step("Navigate to Category from Excel"):
+                factory.home.navigate_to_category(category_path)
+
+            with allure.step("Apply Product Filters"):
+                factory.product.apply_filters(filters)
+
+            with allure.step("Click first visible product"):
+                factory.product.click_first_visible_product()
+                product_url = page.url
+
+        with allure.step("Select product size"):
+            factory.product.customize_product_selection(
+                size=order_test_data["Size"],
+                color=order_test_data["Color"],
+                quantity=order_test_data["Quantity"]
+            )
+
+        with allure.step("Add product to cart and verify"):
+            factory.product.add_product_to_cart_and_verify()
+        factory.index_product(category_path, filters, product_url)
+        factory.checkpoint("cart_built")
+
+    if not factory.reached("shipping_filled"):
+        with allure.step("Open mini cart"):
+            factory.product.open_mini_cart()
+
+        with allure.step("Proceed to checkout"):
+            factory.product.click_proceed_to_checkout()
+
+        with allure.step("Fill shipping address"):
+            factory.checkout.fill_shipping_address(
+                email=customer_data["email"],
+                first_name=customer_data["first_name"],
+                last_name=customer_data["last_name"],
+                street=customer_data["street"],
+                city=customer_data["city"],
+                zip_code=customer_data["zip_code"],
+                country=customer_data["country"],
+                phone=str(customer_data["phone"])
+            )
+        factory.checkpoint("shipping_filled")
+
+    if not factory.reached("payment_reached"):
+        with allure.step("Get available shipping methods"):
+            shipping_methods = factory.checkout.get_shipping_methods()
+            assert shipping_methods, "No shipping methods available"
+
+        with allure.step("Click Next"):
+            factory.checkout.click_next_button()
+        factory.checkpoint("payment_reached")
 
-    with allure.step("Select product size"):
-        factory.product.customize_product_selection(
-            size=order_test_data["Size"],
-            color=order_test_data["Color"],
-            quantity=order_test_data["Quantity"]
+    with allure.step(f"Apply discount code: {order_test_data['DiscountCode']}"):
+        discount_result = factory.checkout.apply_and_verify_discount(order_test_data["DiscountCode"])
+        assert discount_result is not None, "Discount application failed"
+        allure.attach(
+            f"""
+            Subtotal: ${discount_result['subtotal']}
+            Discount: -${discount_result['discount']}
+            Shipping: ${discount_result['shipping']}
+            Total: ${discount_result['total']}
+            """.strip(),
+            name="Discount Summary",
+            attachment_type=allure.attachment_type.TEXT
         )
 
-    with allure.step("Add product to cart and verify"):
-        factory.product.add_product_to_cart_and_verify()
+    with allure.step("Place order and capture number"):
+        order_number = factory.place_order.place_order_and_capture_number()
+        assert order_number is not None, "Order number was not captured."
+    factory.finish()
 
-    with allure.step("Open mini cart"):
-        factory.product.open_mini_cart()
 
-    with allure.step("Proceed to checkout"):
-        factory.product.click_proceed_to_checkout()
+@allure.tag("checkout", "totals")
+@allure.severity(allure.severity_level.NORMAL)
+# The coupon changes the snapshot's quote, so the snapshot is rebuilt for the next test.
+@pytest.mark.storage_state("cart", consume=True)
+def test_checkout_totals_with_prefilled_cart(config, page, storage_state, excel_reader, customer_data):
+    factory = PageFactory(page, config, prewarmed=storage_state is not None)
+    discount_code = excel_reader.get_order_test_cases()[0]["DiscountCode"]
+
+    with allure.step("Open checkout with the pre-filled cart"):
+        factory.base.navigate(config['urls']['checkout_url'], timeout=config['timeouts']['page_load'])
 
     with allure.step("Fill shipping address"):
         factory.checkout.fill_shipping_address(
@@ -71,26 +133,46 @@ def test_complete_checkout_flow(config, page, order_test_data):
         )
 
     with allure.step("Get available shipping methods"):
-        shipping_methods = factory.checkout.get_shipping_methods()
-        assert shipping_methods, "No shipping methods available"
+        assert factory.checkout.get_shipping_methods(), "No shipping methods available"
 
     with allure.step("Click Next"):
         factory.checkout.click_next_button()
 
-    with allure.step(f"Apply discount code: {order_test_data['DiscountCode']}"):
-        discount_result = factory.checkout.apply_and_verify_discount(order_test_data["DiscountCode"])
-        assert discount_result is not None, "Discount application failed"
-        allure.attach(
-            f"""
-            Subtotal: ${discount_result['subtotal']}
-            Discount: -${discount_result['discount']}
-            Shipping: ${discount_result['shipping']}
-            Total: ${discount_result['total']}
-            """.strip(),
-            name="Discount Summary",
-            attachment_type=allure.attachment_type.TEXT
+    with allure.step(f"Apply discount code: {discount_code}"):
+        factory.checkout.apply_and_verify_discount(discount_code)
+
+
+@allure.tag("checkout", "api-seeded")
+@allure.severity(allure.severity_level.NORMAL)
+@pytest.mark.seeded_cart
+def test_checkout_with_seeded_cart(config, browser_context, page, storage_state, cart_seeder, order_test_data,
+                                   customer_data):
+    factory = PageFactory(page, config, prewarmed=storage_state is not None)
+
+    with allure.step("Seed guest cart through the REST API"):
+        cart = cart_seeder.seed_from_row(order_test_data)
+        cart_seeder.attach_to_context(browser_context, cart, config['urls']['base_url'])
+
+    with allure.step("Open checkout with the seeded cart"):
+        factory.base.navigate(config['urls']['checkout_url'], timeout=config['timeouts']['page_load'])
+
+    with allure.step("Fill shipping address"):
+        factory.checkout.fill_shipping_address(
+            email=customer_data["email"],
+            first_name=customer_data["first_name"],
+            last_name=customer_data["last_name"],
+            street=customer_data["street"],
+            city=customer_data["city"],
+            zip_code=customer_data["zip_code"],
+            country=customer_data["country"],
+            phone=str(customer_data["phone"])
         )
 
-    with allure.step("Place order and capture number"):
-        order_number = factory.place_order.place_order_and_capture_number()
-        assert order_number is not None, "Order number was not captured."
+    with allure.step("Get available shipping methods"):
+        assert factory.checkout.get_shipping_methods(), "No shipping methods available"
+
+    with allure.step("Click Next"):
+        factory.checkout.click_next_button()
+
+    with allure.step(f"Apply discount code: {order_test_data['DiscountCode']}"):
+        factory.checkout.apply_and_verify_discount(order_test_data["DiscountCode"])
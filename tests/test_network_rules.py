@@ -0,0 +1,84 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utills.network_rules import InterceptionEngine, StaticAssetCache, compile_rules, glob_to_regex
+
+BLOCK = compile_rules(domains=["doubleclick.net", ".googlesyndication.com"], globs=["*://ads.*/**", "**/ads/**"])
+
+
+@pytest.mark.parametrize("url, blocked", [
+    ("https://doubleclick.net/pixel", True),
+    ("https://stats.g.doubleclick.net:443/collect?v=1", True),
+    ("https://tpc.GoogleSyndication.com/safeframe.html", True),
+    ("https://ads.example.com/banner.js", True),
+    ("https://shop.example.com/static/ads/slot.js", True),
+    ("https://notdoubleclick.net/pixel", False),
+    ("https://shop.example.com/?ref=doubleclick.net", False),
+    ("https://shop.example.com/uploads/banner.js", False),
+])
+def test_domains_and_globs_compile_into_one_pattern(url, blocked):
+    assert bool(BLOCK.search(url)) is blocked
+
+
+def test_single_star_stays_within_a_path_segment():
+    pattern = compile_rules(globs=["https://shop/*.js"])
+    assert pattern.search("https://shop/app.js")
+    assert not pattern.search("https://shop/static/app.js")
+    assert glob_to_regex("**/rest/**") == "^.*/rest/.*$"
+    assert compile_rules() is None
+
+
+class FakeRoute:
+    def __init__(self, body=b"console.log(1)", status=200, headers=None):
+        self.response = SimpleNamespace(status=status, body=lambda: body,
+                                        headers=headers or {"content-type": "text/javascript",
+                                                            "content-encoding": "gzip"})
+        self.fetched = 0
+        self.fulfilled = None
+
+    def fetch(self):
+        self.fetched += 1
+        return self.response
+
+    def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    def fallback(self):
+        self.fulfilled = "fallback"
+
+
+def serve(engine, url, route=None, method="GET"):
+    route = route or FakeRoute()
+    engine._serve_static(route, SimpleNamespace(url=url, method=method))
+    return route
+
+
+def test_static_assets_are_fetched_once_then_served_from_disk(tmp_path):
+    engine = InterceptionEngine.from_config({"static_cache": {"enabled": True, "dir": str(tmp_path)}})
+    assert engine.static_pattern.search("https://shop/static/app.js?v=3")
+    assert not engine.static_pattern.search("https://shop/checkout/")
+
+    first = serve(engine, "https://shop/static/app.js")
+    assert first.fetched == 1 and first.fulfilled["headers"] == {"content-type": "text/javascript"}
+    second = serve(engine, "https://shop/static/app.js")
+    assert second.fetched == 0 and os.path.exists(second.fulfilled["path"])
+    assert engine.reset_stats().as_dict() == {"blocked": 0, "cached": 1, "cached_bytes": 14, "fetched": 1,
+                                              "fetched_bytes": 14}
+    assert serve(engine, "https://shop/static/app.js", method="POST").fulfilled == "fallback"
+
+
+def test_expired_and_uncacheable_responses_are_fetched_again(tmp_path):
+    cache = StaticAssetCache(str(tmp_path), max_age_seconds=60)
+    cache.put("https://shop/app.css", 200, {}, b"body{}")
+    assert cache.get("https://shop/app.css") is not None
+    meta_path, _ = cache._paths("https://shop/app.css")
+    os.utime(meta_path, (time.time() - 120, time.time() - 120))
+    assert cache.get("https://shop/app.css") is None
+
+    engine = InterceptionEngine(None, compile_rules(globs=["**/*.css"]), cache)
+    no_store = FakeRoute(headers={"cache-control": "no-store"})
+    serve(engine, "https://shop/theme.css", no_store)
+    assert serve(engine, "https://shop/theme.css").fetched == 1
@@ -0,0 +1,47 @@
+import sys
+
+import pytest
+
+from utills import parallel_runner
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """Runs parallel_runner.main with shard processes that exit with the given codes."""
+    commands, summaries = [], []
+
+    def run(*exit_codes):
+        codes = iter(exit_codes)
+
+        class Proc:
+            def __init__(self, cmd):
+                commands.append(cmd)
+                self.code = next(codes)
+
+            def wait(self):
+                return self.code
+
+        monkeypatch.setattr(parallel_runner.subprocess, "Popen", Proc)
+        monkeypatch.setattr(parallel_runner.run_summary, "load_config", lambda: {})
+        monkeypatch.setattr(parallel_runner.run_summary, "write",
+                            lambda cfg, run_id, results_dir: summaries.append(results_dir))
+        monkeypatch.setattr(sys, "argv", ["parallel_runner", "-n", str(len(exit_codes)), "tests/test_main.py",
+                                          "--alluredir", "out"])
+        monkeypatch.setenv("RUN_ID", "run-1")
+        return parallel_runner.main()
+
+    run.commands, run.summaries = commands, summaries
+    return run
+
+
+def test_empty_shards_do_not_fail_the_run(runner):
+    assert runner(0, 5, 5) == 0
+    assert [cmd[3:5] for cmd in runner.commands] == [
+        ["--shard-index=0", "--shard-count=3"], ["--shard-index=1", "--shard-count=3"],
+        ["--shard-index=2", "--shard-count=3"]]
+    assert runner.summaries == ["out"]
+
+
+def test_the_worst_failing_shard_sets_the_exit_code(runner):
+    assert runner(1, 5, 2) == 2
+    assert runner.summaries == ["out"]     # the run summary is written all the same
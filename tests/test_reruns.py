@@ -0,0 +1,87 @@
+import pytest
+
+# Loaded only when this module is collected, not in every session of the suite.
+pytest_plugins = ["pytester"]
+
+# Mirrors the quarantine lane hooks of the repository conftest.
+CONFTEST = """
+import pytest
+from utills import reruns
+
+
+def pytest_collection_modifyitems(items):
+    for item in items:
+        item.quarantine_reruns = 2
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    return reruns.run(item, nextitem, item.quarantine_reruns)
+
+
+def pytest_report_teststatus(report):
+    return reruns.report_status(report)
+"""
+
+FIXTURES = """
+import pytest
+
+
+def log(event):
+    with open("events.log", "a") as f:
+        f.write(event + "\\n")
+
+
+@pytest.fixture(scope="module")
+def browser():
+    log("browser up")
+    yield
+    log("browser down")
+
+
+@pytest.fixture
+def page(browser):
+    log("page up")
+    yield
+    log("page down")
+"""
+
+
+@pytest.fixture
+def suite(pytester):
+    pytester.makeconftest(CONFTEST)
+    return pytester
+
+
+def events(suite):
+    return (suite.path / "events.log").read_text().splitlines()
+
+
+def test_a_test_that_passes_on_a_rerun_is_reported_passed_once(suite):
+    suite.makepyfile(FIXTURES + """
+attempts = []
+
+
+def test_flaky(page):
+    attempts.append(1)
+    assert len(attempts) == 2
+""")
+    result = suite.runpytest()
+    assert result.parseoutcomes() == {"passed": 1, "rerun": 1}
+    # The module fixture stays up between attempts; the function fixture does not.
+    assert events(suite) == ["browser up", "page up", "page down", "page up", "page down", "browser down"]
+
+
+def test_a_test_failing_every_attempt_fails_once_after_its_reruns(suite):
+    suite.makepyfile(FIXTURES + """
+def test_broken(page):
+    assert False
+
+
+def test_next(page):
+    pass
+""")
+    result = suite.runpytest()
+    assert result.parseoutcomes() == {"failed": 1, "passed": 1, "rerun": 2}
+    result.stdout.fnmatch_lines(["FAILED *test_broken*"])
+    assert events(suite) == ["browser up"] + ["page up", "page down"] * 4 + ["browser down"]
@@ -0,0 +1,20 @@
+from utills import run_summary
+from utills.timing import write_jsonl
+
+
+def test_the_report_covers_the_lines_of_every_shard(tmp_path):
+    cfg = {"timing": {"output_dir": str(tmp_path)}, "reporting": {}}
+    run_dir = tmp_path / "run-1"
+    for shard, ms in (("shard0", 100.0), ("shard1", 300.0)):
+        write_jsonl(str(run_dir / f"{shard}.jsonl"), [{
+            "scenario": "TC01", "test": "t", "attempt": 0, "kind": "step", "name": "Place order", "selector": None,
+            "page_object": None, "wait_ms": 0.0, "action_ms": 0.0, "total_ms": ms, "retries": 0, "status": "passed"}])
+    run_summary.write(cfg, "run-1", None)
+    line = next(line for line in (run_dir / "summary.txt").read_text().splitlines() if "Place order" in line)
+    assert line.split()[:2] == ["0.40", "2"]
+
+
+def test_option_value_reads_both_spellings():
+    assert run_summary.option_value(["-x", "--alluredir", "out"], "--alluredir") == "out"
+    assert run_summary.option_value(["--alluredir=out", "-x"], "--alluredir") == "out"
+    assert run_summary.option_value(["--alluredir"], "--alluredir") is None
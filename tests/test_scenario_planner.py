@@ -0,0 +1,34 @@
+from utills.scenario_planner import build_tree, order, step_counts
+
+
+def row(scenario, category="Women", sub="Jackets", size="M", color="Blue", qty=1, code="20poff"):
+    return {"Scenario": scenario, "Category": category, "SubCategory1": sub, "SubCategory2": float("nan"),
+            "Size": size, "Color": color, "Pattern": "", "Climate": "", "Style": "", "Quantity": qty,
+            "DiscountCode": code}
+
+
+ROWS = [
+    row("TC01"),
+    row("TC02", category="Gear", sub="Bags", size="", color=""),
+    row("TC03", qty=3, code=""),                    # same navigation as TC01
+    row("TC04", color="Black"),                     # same category as TC01, other filters
+]
+
+
+def test_rows_branch_by_category_then_filters():
+    root = build_tree(ROWS)
+    assert [len(node.rows) for node in root.children.values()] == [3, 1]
+    women = next(iter(root.children.values()))
+    assert women.step == "category"
+    assert [[r["Scenario"] for r in node.rows] for node in women.children.values()] == [["TC01", "TC03"], ["TC04"]]
+    assert all(node.step == "filters" and not node.children for node in women.children.values())
+
+
+def test_rows_sharing_a_prefix_are_ordered_together():
+    assert [r["Scenario"] for r in order(ROWS)] == ["TC01", "TC03", "TC04", "TC02"]
+    assert order([]) == []
+
+
+def test_shared_steps_run_once_per_prefix():
+    assert step_counts(ROWS) == (8, 5)   # 2 categories + 3 filter sets, instead of 4 rows x 2 steps
+    assert step_counts([row("TC01"), row("TC02", qty=2), row("TC03", code="")]) == (6, 2)
@@ -0,0 +1,75 @@
+import os
+import threading
+
+from utills.screenshot_pipeline import ScreenshotPipeline
+
+KB = 1 / 1024   # budgets are in MB
+
+
+class FakePage:
+    """Hands out 1 KB frames; the same `frame` number gives the same bytes."""
+
+    def __init__(self):
+        self.frame = 0
+        self.calls = []
+
+    def screenshot(self, **options):
+        self.calls.append(options)
+        return bytes([self.frame % 256]) * 1024
+
+
+def shoot(pipeline, page, test_id, frames):
+    for frame in frames:
+        page.frame = frame
+        pipeline.capture(page, test_id, f"step {frame}")
+
+
+def test_a_full_queue_drops_frames_instead_of_blocking(tmp_path):
+    pipeline = ScreenshotPipeline(str(tmp_path), queue_size=2)
+    started, release = threading.Event(), threading.Event()
+    store = pipeline._store
+
+    def slow_store(*item):
+        started.set()
+        release.wait(5)
+        store(*item)
+
+    pipeline._store = slow_store
+    page = FakePage()
+    try:
+        shoot(pipeline, page, "t", [1])
+        assert started.wait(5)                  # the worker is busy with frame 1
+        shoot(pipeline, page, "t", [2, 3, 4, 5])
+        assert pipeline.dropped == 2
+    finally:
+        release.set()
+    assert [f.title for f in pipeline.frames_for("t")] == ["step 1", "step 2", "step 3"]
+    assert page.calls[0] == {"type": "jpeg", "quality": 70}
+    pipeline.close()
+
+
+def test_consecutive_identical_frames_are_stored_once(tmp_path):
+    pipeline = ScreenshotPipeline(str(tmp_path))
+    page = FakePage()
+    shoot(pipeline, page, "t", [1, 1, 2, 1])
+    assert [f.title for f in pipeline.frames_for("t")] == ["step 1", "step 2", "step 1"]
+
+    undeduped = ScreenshotPipeline(str(tmp_path / "all"), dedupe=False)
+    shoot(undeduped, page, "t", [1, 1])
+    assert len(undeduped.frames_for("t")) == 2
+    pipeline.close()
+    undeduped.close()
+
+
+def test_the_oldest_frames_are_deleted_to_stay_within_the_budgets(tmp_path):
+    pipeline = ScreenshotPipeline(str(tmp_path), per_test_budget_mb=2.5 * KB, per_run_budget_mb=3.5 * KB)
+    page = FakePage()
+    shoot(pipeline, page, "a", [1, 2, 3, 4])
+    pipeline.flush()
+    assert [f.title for f in pipeline._frames["a"]] == ["step 3", "step 4"]   # per test: 2 KB of 2.5 KB
+
+    shoot(pipeline, page, "b", [5, 6])                                         # per run: 3 KB of 3.5 KB
+    assert [f.title for f in pipeline.frames_for("a")] == ["step 4"]
+    assert [f.title for f in pipeline.frames_for("b")] == ["step 5", "step 6"]
+    assert len(os.listdir(tmp_path)) == 3
+    pipeline.close()
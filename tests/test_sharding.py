@@ -0,0 +1,59 @@
+import json
+
+from utills.sharding import DEFAULT_COST, DurationStore, balance, base_nodeid
+
+
+def store_with(tmp_path, durations):
+    path = tmp_path / "durations.json"
+    path.write_text(json.dumps(durations))
+    return DurationStore(str(path))
+
+
+def test_longest_tests_go_first_into_the_lightest_shard(tmp_path):
+    store = store_with(tmp_path, {"t[a]": 10, "t[b]": 8, "t[c]": 6, "t[d]": 5, "t[e]": 3})
+    assignment = balance(["t[e]", "t[d]", "t[c]", "t[b]", "t[a]"], store, 2)
+    # a: [10, 0], b: [10, 8], c: [10, 14], d: [15, 14], e: [15, 17]
+    assert assignment == {"t[a]": 0, "t[b]": 1, "t[c]": 1, "t[d]": 0, "t[e]": 1}
+
+
+def test_ties_are_broken_by_node_id_whatever_the_collection_order(tmp_path):
+    store = store_with(tmp_path, {})
+    nodeids = [f"t[{name}]" for name in "dcba"]
+    assert balance(nodeids, store, 2) == balance(sorted(nodeids), store, 2) == \
+        {"t[a]": 0, "t[b]": 1, "t[c]": 0, "t[d]": 1}
+
+
+def test_tests_with_the_same_key_share_a_shard(tmp_path):
+    store = store_with(tmp_path, {"t[TC01-chromium]": 50, "t[TC01-firefox]": 50, "t[TC02-chromium]": 60})
+    assignment = balance(list(store.durations), store, 2, key=lambda nodeid: nodeid.split("-")[0])
+    assert assignment["t[TC01-chromium]"] == assignment["t[TC01-firefox]"] != assignment["t[TC02-chromium]"]
+
+
+def test_unknown_tests_cost_the_median_or_the_default(tmp_path):
+    assert store_with(tmp_path, {"t[a]": 10, "t[b]": 20, "t[c]": 90}).cost("t[new]") == 20
+    assert DurationStore(str(tmp_path / "missing.json")).cost("t[new]") == DEFAULT_COST
+    (tmp_path / "broken.json").write_text("{")
+    assert DurationStore(str(tmp_path / "broken.json")).cost("t[new]") == DEFAULT_COST
+
+
+def test_xdist_group_suffixes_are_stripped():
+    assert base_nodeid("tests/test_main.py::test_order[TC01]@shard3") == "tests/test_main.py::test_order[TC01]"
+    assert base_nodeid("tests/test_main.py::test_order[TC01]") == "tests/test_main.py::test_order[TC01]"
+
+
+def test_concurrent_shards_merge_their_averages(tmp_path):
+    store_with(tmp_path, {"t[a]": 10, "t[b]": 20})
+    path = str(tmp_path / "durations.json")
+    first, second = DurationStore(path), DurationStore(path)     # both loaded before either saves
+    first.add("t[a]@shard0", 4)
+    first.add("t[a]@shard0", 26)                                # setup + call of one test
+    second.add("t[b]", 40)
+    second.add("t[c]", 7)
+    first.save()
+    second.save()
+    assert json.loads(open(path).read()) == {"t[a]": 20, "t[b]": 30, "t[c]": 7}
+
+    third = DurationStore(path)
+    third.add("t[a]", 40)
+    third.save()
+    assert DurationStore(path).cost("t[a]") == 30
@@ -0,0 +1,71 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+
+import pytest
+import requests
+from stub_store import MagentoStubServer
+
+
+@pytest.fixture(scope="module")
+def storefront():
+    with MagentoStubServer() as server:
+        yield server
+
+
+def _product_names(html):
+    return re.findall(r'class="product-item-link" href="[^"]+">([^<]+)</a>', html)
+
+
+def _filter_link(html, label):
+    swatch = re.search(rf'<a href="([^"]+)" aria-label="{re.escape(label)}"', html)
+    text = re.search(rf'<a href="([^"]+)">{re.escape(label)}<span class="count">', html)
+    return unescape((swatch or text).group(1))
+
+
+def test_layered_navigation_narrows_the_listing(storefront):
+    url = storefront.base_url + "women/tops-women/jackets-women.html"
+    html = requests.get(url).text
+    assert 'aria-label="XS" class="swatch-option-link-layered"><div class="swatch-option text"' in html
+    assert len(_product_names(html)) > 1
+
+    for label in ("XS", "Blue", "Solid", "Cold"):
+        html = requests.get(storefront.base_url + _filter_link(html, label).lstrip("/")).text
+
+    assert _product_names(html) == ["Olivia 1/4 Zip Light Jacket"]
+    # Applied filters leave the layered navigation, as on Magento.
+    assert '<div class="filter-options-title" data-role="title" role="tab">Size</div>' not in html
+
+
+def test_guest_checkout_places_an_order(storefront):
+    api = storefront.base_url + "rest/default/V1/guest-carts"
+    session = requests.Session()
+    cart_id = session.post(api).json()
+    session.post(f"{api}/{cart_id}/items", json={"cartItem": {"sku": "WJ12", "qty": 2}}).raise_for_status()
+    methods = session.post(f"{api}/{cart_id}/estimate-shipping-methods", json={"address": {"country_id": "NL"}}).json()
+    session.post(f"{api}/{cart_id}/shipping-information", json={"addressInformation": {
+        "shipping_address": {"country_id": "NL"},
+        "shipping_carrier_code": methods[0]["carrier_code"],
+        "shipping_method_code": methods[0]["method_code"],
+    }}).raise_for_status()
+    session.put(f"{api}/{cart_id}/coupons/20poff").raise_for_status()
+    order_number = session.post(f"{api}/{cart_id}/payment-information", json={"email": "qa@example.com"}).json()
+
+    session.cookies.set("guest_cart_id", cart_id)
+    success = session.get(storefront.base_url + "checkout/onepage/success/")
+    assert "Thank you for your purchase!" in success.text
+    assert f"<span>{order_number}</span>" in success.text
+    assert storefront.state.orders[order_number]["totals"]["discount_amount"] < 0
+
+
+def test_serves_hundreds_of_concurrent_clients(storefront):
+    def visit(_):
+        with requests.Session() as session:
+            page = session.get(storefront.base_url + "gear/bags.html", timeout=30)
+            cart = session.post(storefront.base_url + "rest/V1/guest-carts", timeout=30)
+            return page.status_code, cart.status_code
+
+    with ThreadPoolExecutor(max_workers=200) as pool:
+        results = list(pool.map(visit, range(400)))
+
+    assert results == [(200, 200)] * 400
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from utills import timing
+from utills.timing import StepRecorder, aggregate, format_table, percentile, write_jsonl, write_reports
+
+
+def row(kind, name, total_ms, selector=None, scenario="TC01", wait_ms=0.0):
+    return {"scenario": scenario, "test": "test_order", "attempt": 0, "kind": kind, "name": name,
+            "selector": selector, "page_object": "CartPage" if kind == "action" else None, "wait_ms": wait_ms,
+            "action_ms": total_ms - wait_ms, "total_ms": total_ms, "retries": 0, "status": "passed"}
+
+
+def test_percentile_takes_the_nearest_sample():
+    values = [float(ms) for ms in range(100, 0, -1)]
+    assert percentile(values, 50) == 51
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100 and percentile(values, 0) == 1
+    assert percentile([7.0], 99) == 7
+
+
+def test_worker_files_are_aggregated_by_selector_and_by_step(tmp_path):
+    write_jsonl(str(tmp_path / "gw0.jsonl"), [
+        row("action", "click", 100, "#checkout", wait_ms=80),
+        row("step", "Applying discount code: 20poff", 300),
+    ])
+    write_jsonl(str(tmp_path / "gw1.jsonl"), [
+        row("action", "click", 300, "#checkout", scenario="TC02", wait_ms=100),
+        row("step", "Applying discount code: 10poff", 500, scenario="TC02"),
+    ])
+    write_jsonl(str(tmp_path / "gw2.jsonl"), [])                        # nothing recorded, no file
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["gw0.jsonl", "gw1.jsonl"]
+
+    summary = aggregate(str(tmp_path))
+    assert summary["selector"]["click #checkout"] == {
+        "count": 2, "total_ms": 400, "wait_ms": 180, "action_ms": 220, "p50_ms": 100, "p95_ms": 300,
+        "max_ms": 300, "scenarios": ["TC01", "TC02"]}
+    assert list(summary["step"]) == ["Applying discount code"]
+    assert summary["step"]["Applying discount code"]["total_ms"] == 800
+
+
+def test_reports_rank_the_slowest_entries(tmp_path):
+    assert write_reports(str(tmp_path)) is None
+    write_jsonl(str(tmp_path / "gw0.jsonl"), [
+        row("action", "fill", 50, "#email"),
+        row("action", "click", 2000, '[name="pay"]', wait_ms=1500),
+        row("step", "Place order", 2500),
+    ])
+    report = write_reports(str(tmp_path), top_n=1)
+
+    lines = open(report).read().splitlines()
+    assert lines[0] == "Slowest selectors (by total time across all scenarios)"
+    assert lines[2].split() == ["2.00", "1", "2000", "2000", "75%", "click", '[name="pay"]']
+    assert lines[3] == "" and lines[4].startswith("Slowest steps")
+    assert "#email" not in "\n".join(lines)
+
+    metrics = (tmp_path / "metrics.prom").read_text().splitlines()
+    assert 'qa_step_duration_seconds_sum{kind="selector",name="click [name=\\"pay\\"]"} 2.000000' in metrics
+    assert metrics[-1] == "# EOF"
+    assert json.loads((tmp_path / "summary.json").read_text())["step"]["Place order"]["count"] == 1
+
+
+def test_format_table_shows_the_selector_of_actions():
+    table = format_table([row("action", "click", 12.5, "#next", wait_ms=10), row("step", "Open cart", 40)])
+    assert table.splitlines()[1].split() == ["action", "12.5", "10.0", "2.5", "click", "[#next]"]
+    assert table.splitlines()[2].endswith("Open cart")
+
+
+def test_step_timings_are_added_to_the_open_allure_step(monkeypatch):
+    allure = pytest.importorskip("allure")
+    import allure_commons
+    from allure_commons.model2 import TestResult, TestStepResult
+    from allure_commons.reporter import AllureReporter
+
+    class Listener:
+        """Keeps steps like allure-pytest does; its stop_step closes them."""
+
+        def __init__(self):
+            self.allure_logger = AllureReporter()
+            self.test = TestResult()
+            self.allure_logger.schedule_test("test", self.test)
+
+        @allure_commons.hookimpl
+        def start_step(self, uuid, title, params):
+            self.allure_logger.start_step(None, uuid, TestStepResult(name=title, parameters=[]))
+
+        @allure_commons.hookimpl
+        def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+            self.allure_logger.stop_step(uuid)
+
+    monkeypatch.setattr(timing.recorder, "enabled", False)   # the session's own recorder, if conftest registered it
+    recorder, listener = StepRecorder(), Listener()
+    recorder.enabled = True
+    recorder.start_test("test_order", "TC01")
+    allure_commons.plugin_manager.register(recorder)
+    allure_commons.plugin_manager.register(listener)
+    try:
+        with allure.step("Checkout"):
+            with allure.step("Open cart"):
+                pass
+            with recorder.action("click", "#pay", "CheckoutPage") as timer, timer.wait():
+                pass
+    finally:
+        allure_commons.plugin_manager.unregister(listener)
+        allure_commons.plugin_manager.unregister(recorder)
+
+    checkout = listener.test.steps[0]
+    assert [p.name for p in checkout.parameters] == ["duration_ms", "wait_ms", "action_ms"]
+    assert [p.name for p in checkout.steps[0].parameters] == ["duration_ms"]
+    rows = recorder.finish_test()
+    assert [(r["kind"], r["name"]) for r in rows] == [("step", "Open cart"), ("action", "click"), ("step", "Checkout")]
+    assert rows[2]["wait_ms"] == rows[1]["wait_ms"]
@@ -0,0 +1,247 @@
+# utills/adaptive.py - timeouts learned from past runs, retried waits and flaky-test tracking
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utills.timing import percentile
+
+DB_PATH = os.path.join(".cache", "adaptive.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS waits (
+    key TEXT NOT NULL, ms REAL NOT NULL, run_id TEXT, recorded REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS waits_key ON waits (key);
+CREATE TABLE IF NOT EXISTS outcomes (
+    nodeid TEXT NOT NULL, scenario TEXT, run_id TEXT, attempt INTEGER NOT NULL, passed INTEGER NOT NULL,
+    recorded REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS outcomes_nodeid ON outcomes (nodeid);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class TimingDB:
+    """Wait times and test outcomes of past runs, in a local SQLite file.
+
+    Each process writes its batch once, at the end of its session; WAL mode
+    and a busy timeout let pytest-xdist workers and shards do so concurrently.
+    Only the newest `keep` samples per wait are kept.
+    """
+
+    def __init__(self, path: str = DB_PATH, keep: int = 1000):
+        self.path = path
+        self.keep = keep
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def add_waits(self, samples: List[Tuple[str, float]], run_id: Optional[str]) -> None:
+        if not samples:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO waits VALUES (?, ?, ?, ?)", [(key, ms, run_id, now) for key, ms in samples])
+            conn.execute(
+                "DELETE FROM waits WHERE rowid IN (SELECT rowid FROM (SELECT rowid, ROW_NUMBER() OVER "
+                "(PARTITION BY key ORDER BY rowid DESC) AS n FROM waits) WHERE n > ?)", (self.keep,))
+
+    def add_outcomes(self, outcomes: List[Tuple[str, Optional[str], int, bool]], run_id: Optional[str]) -> None:
+        if not outcomes:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT INTO outcomes VALUES (?, ?, ?, ?, ?, ?)",
+                             [(nodeid, scenario, run_id, attempt, int(passed), now)
+                              for nodeid, scenario, attempt, passed in outcomes])
+
+    def percentiles(self, pct: float = 99, window: int = 200, min_samples: int = 20) -> Dict[str, float]:
+        """pct-th percentile of the newest `window` samples of every wait with at least `min_samples`."""
+        if not os.path.exists(self.path):
+            return {}
+        samples: Dict[str, List[float]] = defaultdict(list)
+        with closing(self._connect()) as conn:
+            for key, ms in conn.execute(
+                    "SELECT key, ms FROM (SELECT key, ms, ROW_NUMBER() OVER "
+                    "(PARTITION BY key ORDER BY rowid DESC) AS n FROM waits) WHERE n <= ?", (window,)):
+                samples[key].append(ms)
+        return {key: percentile(values, pct) for key, values in samples.items() if len(values) >= min_samples}
+
+    def history(self, window: int = 20) -> Dict[str, List[Tuple[Optional[str], bool]]]:
+        """Newest `window` outcomes of every test, oldest first, as (scenario, passed)."""
+        if not os.path.exists(self.path):
+            return {}
+        history: Dict[str, List[Tuple[Optional[str], bool]]] = defaultdict(list)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT nodeid, scenario, passed FROM (SELECT nodeid, scenario, passed, rowid, ROW_NUMBER() OVER "
+                "(PARTITION BY nodeid ORDER BY rowid DESC) AS n FROM outcomes) WHERE n <= ? ORDER BY rowid",
+                (window,))
+            for nodeid, scenario, passed in rows:
+                history[nodeid].append((scenario, bool(passed)))
+        return history
+
+
+@dataclass
+class Flakiness:
+    nodeid: str
+    scenario: Optional[str]
+    runs: int
+    failures: int
+    flips: int
+
+    @property
+    def flip_rate(self) -> float:
+        """Share of consecutive attempts whose outcome differs; 0 for stable and for always-failing tests."""
+        return self.flips / (self.runs - 1) if self.runs > 1 else 0.0
+
+
+def flakiness(history: Dict[str, List[Tuple[Optional[str], bool]]]) -> Dict[str, Flakiness]:
+    result = {}
+    for nodeid, outcomes in history.items():
+        passed = [ok for _, ok in outcomes]
+        result[nodeid] = Flakiness(
+            nodeid=nodeid,
+            scenario=outcomes[-1][0],
+            runs=len(passed),
+            failures=passed.count(False),
+            flips=sum(1 for before, after in zip(passed, passed[1:]) if before != after),
+        )
+    return result
+
+
+def flaky_tests(db: TimingDB, settings: Optional[dict]) -> Dict[str, Flakiness]:
+    """Tests whose recent outcomes flip between pass and fail often enough to be quarantined."""
+    settings = settings or {}
+    scores = flakiness(db.history(settings.get('window', 20)))
+    return {nodeid: score for nodeid, score in scores.items()
+            if score.runs >= settings.get('min_runs', 5) and score.flip_rate >= settings.get('threshold', 0.1)}
+
+
+class AdaptiveTimeouts:
+    """Timeouts for idempotent waits, learned from how long the same wait took before.
+
+    A wait with enough history first gets p99 x `headroom`. On timeout it is
+    retried after a short pause, each attempt `backoff` times longer than the
+    previous one, and all attempts together stay within p99 x `budget`. The
+    caller's timeout remains the ceiling. Waits without history get a single
+    attempt with the caller's timeout, as before. Successful waits are
+    buffered and written to the TimingDB at the end of the session.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.p99: Dict[str, float] = {}
+        self.headroom = 1.5
+        self.budget = 4.0
+        self.floor_ms = 500
+        self.max_attempts = 3
+        self.backoff = 2.0
+        self.retry_delay_ms = 100
+        self._samples: List[Tuple[str, float]] = []
+
+    def configure(self, settings: Optional[dict], db: Optional[TimingDB] = None) -> None:
+        settings = settings or {}
+        self.enabled = settings.get('enabled', False)
+        for name in ("headroom", "budget", "floor_ms", "max_attempts", "backoff", "retry_delay_ms"):
+            setattr(self, name, settings.get(name, getattr(self, name)))
+        if self.enabled and db is not None:
+            self.p99 = db.percentiles(99, settings.get('window', 200), settings.get('min_samples', 20))
+            logger.info(f"Adaptive timeouts learned for {len(self.p99)} wait(s)")
+
+    def plan(self, key: str, ceiling: int) -> List[int]:
+        """Timeouts (ms) of the successive attempts of wait `key`."""
+        p99 = self.p99.get(key) if self.enabled else None
+        if p99 is None:
+            return [ceiling]
+        remaining = int(min(ceiling, max(self.floor_ms, p99 * self.budget)))
+        timeout = int(min(remaining, max(self.floor_ms, p99 * self.headroom)))
+        attempts = []
+        while len(attempts) < self.max_attempts - 1 and timeout + self.floor_ms <= remaining:
+            attempts.append(timeout)
+            remaining -= timeout
+            timeout = int(timeout * self.backoff)
+        attempts.append(remaining)
+        return attempts
+
+    def observe(self, key: str, ms: float) -> None:
+        if self.enabled:
+            self._samples.append((key, ms))
+
+    def run(self, key: str, ceiling: int, wait: Callable[[int], object], retry_on: Tuple[type, ...],
+            on_retry: Optional[Callable[[], None]] = None):
+        """Call `wait(timeout)` per the plan for `key`, retrying on `retry_on` until the last attempt."""
+        attempts = self.plan(key, ceiling)
+        started = time.perf_counter()
+        for attempt, timeout in enumerate(attempts, 1):
+            try:
+                result = wait(timeout)
+            except retry_on:
+                if attempt == len(attempts):
+                    raise
+                self._log_retry(key, attempt, len(attempts), timeout, on_retry)
+                time.sleep(self.retry_delay_ms * attempt / 1000)
+                continue
+            self.observe(key, (time.perf_counter() - started) * 1000)
+            return result
+
+    async def arun(self, key: str, ceiling: int, wait, retry_on: Tuple[type, ...],
+                   on_retry: Optional[Callable[[], None]] = None):
+        """`run` for coroutine waits."""
+        attempts = self.plan(key, ceiling)
+        started = time.perf_counter()
+        for attempt, timeout in enumerate(attempts, 1):
+            try:
+                result = await wait(timeout)
+            except retry_on:
+                if attempt == len(attempts):
+                    raise
+                self._log_retry(key, attempt, len(attempts), timeout, on_retry)
+                await asyncio.sleep(self.retry_delay_ms * attempt / 1000)
+                continue
+            self.observe(key, (time.perf_counter() - started) * 1000)
+            return result
+
+    @staticmethod
+    def _log_retry(key: str, attempt: int, attempts: int, timeout: int, on_retry) -> None:
+        logger.info(f"Retrying '{key}' ({attempt}/{attempts}) after {timeout} ms")
+        if on_retry:
+            on_retry()
+
+    def flush(self, db: TimingDB, run_id: Optional[str]) -> None:
+        samples, self._samples = self._samples, []
+        db.add_waits(samples, run_id)
+
+
+class OutcomeTracker:
+    """Pass/fail of every test attempt in this process, written to the TimingDB at session end.
+
+    Nothing is recorded unless `adaptive.enabled` is set, so the quarantine
+    lane then works from the history recorded so far.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._outcomes: List[Tuple[str, Optional[str], int, bool]] = []
+
+    def record(self, nodeid: str, scenario: Optional[str], attempt: int, passed: bool) -> None:
+        if self.enabled:
+            self._outcomes.append((nodeid, scenario, attempt, passed))
+
+    def flush(self, db: TimingDB, run_id: Optional[str]) -> None:
+        outcomes, self._outcomes = self._outcomes, []
+        db.add_outcomes(outcomes, run_id)
+
+
+policy = AdaptiveTimeouts()
+outcomes = OutcomeTracker()
@@ -0,0 +1,408 @@
+# utills/allure_store.py - content-addressed Allure results with run compaction and retention
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from typing import Dict, Iterable, List, Optional, Set
+
+import allure_commons
+import attr
+from allure_commons.logger import AllureFileLogger
+
+MANIFEST_DIR = ".runs"
+ARCHIVE_PATH = "report/archive/allure-runs.zip"
+# Written by the framework itself, never part of a run.
+SCAFFOLDING = {"environment.properties", "categories.json", "executor.json"}
+_LOCK_STALE_SECONDS = 600
+
+logger = logging.getLogger(__name__)
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """Write `content` to `path` unless the file already holds exactly that."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
+    return True
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _extension(file_name: str) -> str:
+    # allure names attachments "<uuid>-attachment.<ext>"
+    return os.path.splitext(file_name)[1]
+
+
+def _cas_name(digest: str, file_name: str) -> str:
+    return f"{digest[:40]}-attachment{_extension(file_name)}"
+
+
+class ContentAddressedFileLogger(AllureFileLogger):
+    """Allure file logger that stores every attachment once, named by its hash.
+
+    Identical screenshots and logs from any test or run share one file. The
+    result and container JSON point at the hashed names, so `allure serve`
+    reads the directory as usual. Each result is written (atomically) as
+    soon as allure reports it, and listed in a per-run manifest under
+    `.runs/` that compaction and retention work from.
+    """
+
+    def __init__(self, report_dir: str, run_id: str, clean: bool = False):
+        super().__init__(report_dir, clean)
+        self.report_dir = str(self._report_dir)
+        self.run_id = run_id
+        self._sources: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        manifest_dir = os.path.join(self.report_dir, MANIFEST_DIR)
+        os.makedirs(manifest_dir, exist_ok=True)
+        self._manifest = open(os.path.join(manifest_dir, f"{run_id}.jsonl"), "a", encoding="utf-8")
+        self.stored = 0
+        self.deduplicated = 0
+
+    def _claim(self, digest: str, file_name: str) -> Optional[str]:
+        """Map allure's file name to the hashed one; None if that file already exists."""
+        name = _cas_name(digest, file_name)
+        with self._lock:
+            self._sources[file_name] = name
+        destination = os.path.join(self.report_dir, name)
+        if os.path.exists(destination):
+            self.deduplicated += 1
+            os.utime(destination)  # keeps it ahead of older runs for retention
+            return None
+        self.stored += 1
+        return destination
+
+    def _store_bytes(self, data: bytes, file_name: str) -> None:
+        destination = self._claim(hashlib.sha256(data).hexdigest(), file_name)
+        if destination:
+            _atomic_write_bytes(destination, data)
+
+    def _store_file(self, source: str, file_name: str) -> None:
+        sha = hashlib.sha256()
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        destination = self._claim(sha.hexdigest(), file_name)
+        if destination:
+            try:
+                os.link(source, destination)  # same disk: no second copy of the bytes
+            except OSError:
+                shutil.copyfile(source, destination)
+
+    @allure_commons.hookimpl
+    def report_attached_file(self, source, file_name):
+        self._store_file(str(source), file_name)
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        self._store_bytes(body if isinstance(body, bytes) else str(body).encode("utf-8"), file_name)
+
+    @allure_commons.hookimpl
+    def report_result(self, result):
+        self._report_item(result)
+
+    @allure_commons.hookimpl
+    def report_container(self, container):
+        self._report_item(container)
+
+    def _rewrite(self, node, attachments: Set[str]) -> None:
+        for attachment in getattr(node, "attachments", None) or ():
+            attachment.source = self._sources.pop(attachment.source, attachment.source)
+            attachments.add(attachment.source)
+        for child in (getattr(node, "steps", None) or []) + (getattr(node, "befores", None) or []) \
+                + (getattr(node, "afters", None) or []):
+            self._rewrite(child, attachments)
+
+    def _report_item(self, item):
+        attachments: Set[str] = set()
+        with self._lock:
+            self._rewrite(item, attachments)
+        file_name = item.file_pattern.format(prefix=uuid.uuid4())
+        data = attr.asdict(item, filter=lambda attribute, value: not (type(value) != bool and not bool(value)))
+        _atomic_write_bytes(os.path.join(self.report_dir, file_name),
+                            json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            self._manifest.write(json.dumps({"file": file_name, "attachments": sorted(attachments)}) + "\n")
+            self._manifest.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._manifest.close()
+        logger.info(f"Allure attachments: {self.stored} stored, {self.deduplicated} deduplicated")
+
+
+def install(pytest_config, report_dir: str, run_id: str) -> ContentAddressedFileLogger:
+    """Register the allure-pytest listener with the content-addressed logger.
+
+    Call from pytest_configure *before* allure-pytest configures itself, with
+    `config.option.allure_report_dir` cleared so it does not register its
+    own file logger as well.
+    """
+    from allure_pytest.listener import AllureListener
+
+    clean = False if pytest_config.option.collectonly else getattr(pytest_config.option, "clean_alluredir", False)
+    listener = AllureListener(pytest_config)
+    pytest_config.pluginmanager.register(listener, "allure_listener")
+    allure_commons.plugin_manager.register(listener)
+    file_logger = ContentAddressedFileLogger(os.path.abspath(report_dir), run_id, clean)
+    allure_commons.plugin_manager.register(file_logger)
+
+    def cleanup():
+        allure_commons.plugin_manager.unregister(listener)
+        allure_commons.plugin_manager.unregister(file_logger)
+        file_logger.close()
+
+    pytest_config.add_cleanup(cleanup)
+    return file_logger
+
+
+# --- compaction and retention -------------------------------------------------
+
+def _read_manifest(path: str) -> Dict[str, Set[str]]:
+    files, attachments = set(), set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # partial last line of a crashed run
+            files.add(entry["file"])
+            attachments.update(entry.get("attachments", ()))
+    return {"files": files, "attachments": attachments}
+
+
+def list_runs(report_dir: str) -> Dict[str, dict]:
+    """Runs in `report_dir`, oldest first.
+
+    Results written before this store existed (no manifest) are grouped into
+    one "legacy" run, treated as the oldest. Recent unlisted files are left
+    out: they may be attachments of a test another process is still running.
+    """
+    manifest_dir = os.path.join(report_dir, MANIFEST_DIR)
+    runs: Dict[str, dict] = {}
+    if os.path.isdir(manifest_dir):
+        manifests = sorted((os.path.getmtime(os.path.join(manifest_dir, n)), n)
+                           for n in os.listdir(manifest_dir) if n.endswith(".jsonl"))
+        for mtime, name in manifests:
+            run = _read_manifest(os.path.join(manifest_dir, name))
+            run["mtime"] = mtime
+            runs[name[:-len(".jsonl")]] = run
+
+    known = set(SCAFFOLDING)
+    for run in runs.values():
+        known |= run["files"] | run["attachments"]
+    cutoff = time.time() - _LOCK_STALE_SECONDS
+    legacy = set()
+    for name in os.listdir(report_dir) if os.path.isdir(report_dir) else ():
+        path = os.path.join(report_dir, name)
+        if (name not in known and not name.startswith(".") and not name.endswith(".tmp")
+                and os.path.isfile(path) and os.path.getmtime(path) < cutoff):
+            legacy.add(name)
+    if legacy:
+        results = {n for n in legacy if n.endswith(("-result.json", "-container.json"))}
+        runs = {"legacy": {"files": results, "attachments": legacy - results, "mtime": 0.0}, **runs}
+    return runs
+
+
+class _DirLock:
+    """Cross-process lock (lock file) so only one process compacts at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.acquired = False
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        try:
+            if time.time() - os.path.getmtime(self.path) > _LOCK_STALE_SECONDS:
+                os.remove(self.path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            self.acquired = True
+        except FileExistsError:
+            self.acquired = False
+        return self
+
+    def __exit__(self, *exc):
+        if self.acquired:
+            os.remove(self.path)
+
+
+def _archived_runs(archive: zipfile.ZipFile) -> Dict[str, dict]:
+    runs = {}
+    for name in archive.namelist():
+        if name.startswith("runs/") and name.endswith("/manifest.json"):
+            manifest = json.loads(archive.read(name))
+            runs[manifest["run_id"]] = manifest
+    return dict(sorted(runs.items(), key=lambda kv: kv[1]["mtime"]))
+
+
+def compact(report_dir: str, archive_path: str = ARCHIVE_PATH, keep_runs: int = 3,
+            protected: Iterable[str] = ()) -> List[str]:
+    """Move all but the newest `keep_runs` runs into one zip archive.
+
+    The archive keeps each run's result JSON under `runs/<run_id>/` and every
+    attachment once under `attachments/`. Attachments still referenced by a
+    run that stays live are copied, not moved. Returns the compacted run ids.
+    """
+    runs = list_runs(report_dir)
+    keep = set(protected) | (set(list(runs)[-keep_runs:]) if keep_runs > 0 else set())
+    old = [run_id for run_id in runs if run_id not in keep]
+    if not old:
+        return []
+
+    kept_attachments: Set[str] = set()
+    for run_id, run in runs.items():
+        if run_id not in old:
+            kept_attachments |= run["attachments"]
+
+    os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+    with zipfile.ZipFile(archive_path, "a", compression=zipfile.ZIP_DEFLATED) as archive:
+        existing = set(archive.namelist())
+        for run_id in old:
+            run = runs[run_id]
+            for name in sorted(run["files"]):
+                path = os.path.join(report_dir, name)
+                if os.path.exists(path) and f"runs/{run_id}/{name}" not in existing:
+                    archive.write(path, f"runs/{run_id}/{name}")
+            for name in sorted(run["attachments"]):
+                path = os.path.join(report_dir, name)
+                if os.path.exists(path) and f"attachments/{name}" not in existing:
+                    # Images are already compressed; deflating them again only costs time.
+                    compress = zipfile.ZIP_STORED if name.endswith((".png", ".jpg", ".webp")) else zipfile.ZIP_DEFLATED
+                    archive.write(path, f"attachments/{name}", compress_type=compress)
+                    existing.add(f"attachments/{name}")
+            manifest = {"run_id": run_id, "mtime": run["mtime"], "files": sorted(run["files"]),
+                        "attachments": sorted(run["attachments"])}
+            archive.writestr(f"runs/{run_id}/manifest.json", json.dumps(manifest))
+
+    for run_id in old:
+        run = runs[run_id]
+        for name in run["files"] | (run["attachments"] - kept_attachments):
+            try:
+                os.remove(os.path.join(report_dir, name))
+            except OSError:
+                pass
+        try:
+            os.remove(os.path.join(report_dir, MANIFEST_DIR, f"{run_id}.jsonl"))
+        except OSError:
+            pass
+    logger.info(f"Compacted {len(old)} run(s) into {archive_path}")
+    return old
+
+
+def _rewrite_archive(archive_path: str, drop: Set[str]) -> None:
+    """Rebuild the archive without the runs in `drop` (zip has no in-place delete)."""
+    tmp = archive_path + ".tmp"
+    with zipfile.ZipFile(archive_path, "r") as src, zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+        runs = _archived_runs(src)
+        needed: Set[str] = set()
+        for run_id, manifest in runs.items():
+            if run_id not in drop:
+                needed |= {f"attachments/{n}" for n in manifest["attachments"]}
+        for info in src.infolist():
+            name = info.filename
+            if name.startswith("runs/") and name.split("/")[1] in drop:
+                continue
+            if name.startswith("attachments/") and name not in needed:
+                continue
+            with src.open(info) as f:
+                dst.writestr(info, f.read())
+    os.replace(tmp, archive_path)
+
+
+def _disk_usage(report_dir: str, archive_path: str) -> int:
+    total = os.path.getsize(archive_path) if os.path.exists(archive_path) else 0
+    for root, _, names in os.walk(report_dir):
+        total += sum(os.path.getsize(os.path.join(root, n)) for n in names)
+    return total
+
+
+def enforce_retention(report_dir: str, archive_path: str = ARCHIVE_PATH, max_mb: float = 500,
+                      protected: Iterable[str] = ()) -> int:
+    """Drop the oldest archived runs, then the oldest live runs, until usage fits `max_mb`."""
+    limit = max_mb * 1024 * 1024
+    dropped = 0
+    while _disk_usage(report_dir, archive_path) > limit and os.path.exists(archive_path):
+        with zipfile.ZipFile(archive_path, "r") as archive:
+            archived = list(_archived_runs(archive))
+        if not archived:
+            os.remove(archive_path)
+            break
+        _rewrite_archive(archive_path, {archived[0]})
+        dropped += 1
+
+    protected = set(protected)
+    while _disk_usage(report_dir, archive_path) > limit:
+        runs = list_runs(report_dir)
+        candidates = [run_id for run_id in runs if run_id not in protected]
+        if not candidates:
+            logger.warning(f"Allure results exceed {max_mb} MB but only the current run is left")
+            break
+        oldest = candidates[0]
+        kept = set()
+        for run_id, run in runs.items():
+            if run_id != oldest:
+                kept |= run["attachments"]
+        for name in runs[oldest]["files"] | (runs[oldest]["attachments"] - kept):
+            try:
+                os.remove(os.path.join(report_dir, name))
+            except OSError:
+                pass
+        try:
+            os.remove(os.path.join(report_dir, MANIFEST_DIR, f"{oldest}.jsonl"))
+        except OSError:
+            pass
+        dropped += 1
+    return dropped
+
+
+def maintain(report_dir: str, settings: Optional[dict], current_run: str) -> None:
+    """Compact old runs and apply the disk budget; skipped if another process holds the lock."""
+    settings = settings or {}
+    archive_path = settings.get("archive", ARCHIVE_PATH)
+    with _DirLock(os.path.join(report_dir, MANIFEST_DIR, "maintenance.lock")) as lock:
+        if not lock.acquired:
+            logger.info("Allure store maintenance already running in another process")
+            return
+        compact(report_dir, archive_path, settings.get("keep_runs", 3), protected=[current_run])
+        dropped = enforce_retention(report_dir, archive_path, settings.get("max_disk_mb", 500),
+                                    protected=[current_run])
+        if dropped:
+            logger.info(f"Retention removed {dropped} run(s) to stay under {settings.get('max_disk_mb', 500)} MB")
+
+
+def restore(archive_path: str, run_id: str, target_dir: str) -> int:
+    """Extract one archived run into `target_dir`, ready for `allure serve target_dir`."""
+    os.makedirs(target_dir, exist_ok=True)
+    with zipfile.ZipFile(archive_path, "r") as archive:
+        members = set(archive.namelist())
+        manifest = json.loads(archive.read(f"runs/{run_id}/manifest.json"))
+        entries = [(f"runs/{run_id}/{name}", name) for name in manifest["files"]]
+        entries += [(f"attachments/{name}", name) for name in manifest["attachments"]]
+        for member, name in entries:
+            if member in members:
+                with open(os.path.join(target_dir, name), "wb") as f:
+                    f.write(archive.read(member))
+    return len(manifest["files"])
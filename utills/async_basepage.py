@@ -0,0 +1,248 @@
+# utills/async_basepage.py - BasePage for the playwright.async_api engine
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+
+from locators.registry import registry
+from utills import adaptive
+from utills.basepage import (POPUP_TIMEOUT, BasePage, FieldMap, _DOM_CHANGED_JS, _DOM_SIGNATURE_JS,
+                             _EXTRACT_DOCUMENT_JS, _EXTRACT_JS)
+
+
+class StepTrace:
+    """Steps of one scenario, recorded in order.
+
+    Allure's step stack is per thread, so concurrent scenarios in one event
+    loop cannot report through `allure.step`. Each scenario keeps its own
+    trace instead; the pytest integration attaches it once the loop is done.
+    """
+
+    def __init__(self, scenario: str):
+        self.scenario = scenario
+        self.steps: List[dict] = []
+
+    @asynccontextmanager
+    async def step(self, title: str) -> AsyncIterator[None]:
+        started = time.perf_counter()
+        status = "passed"
+        try:
+            yield
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            self.steps.append({"title": title, "status": status,
+                               "ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    def format(self) -> str:
+        return "\n".join(f"{s['status']:<7}{s['ms']:>10.1f} ms  {s['title']}" for s in self.steps)
+
+
+class AsyncBasePage:
+    """Async counterpart of `utills.basepage.BasePage`."""
+
+    def __init__(self, page: Page, skip_consent: bool = False, trace: Optional[StepTrace] = None):
+        self.page = page
+        self.skip_consent = skip_consent
+        self.trace = trace or StepTrace("")
+        self.logger = logging.getLogger(__name__)
+
+    def locate(self, selector, first: bool = False, **params):
+        """Cached Locator for a selector or a registry template rendered with `params`."""
+        return registry.locator(self.page, selector, first=first, **params)
+
+    def step(self, title: str):
+        return self.trace.step(title)
+
+    async def _wait(self, key: str, timeout: int, wait):
+        """Run an idempotent wait with the timeout learned for `key`; `timeout` is the ceiling."""
+        return await adaptive.policy.arun(key, timeout, wait, (PlaywrightTimeout,))
+
+    async def navigate(self, url: str, timeout: int = 30000) -> None:
+        async with self.step(f"Navigating to {url}"):
+            try:
+                await self.page.goto(url, timeout=timeout)
+                self.logger.info(f"Navigated to {url}")
+                await self.setup_page()
+            except PlaywrightTimeout:
+                self.logger.error(f"Navigation timeout to {url}")
+                raise
+            except Exception as e:
+                self.logger.error(f"Navigation failed: {e}")
+                raise
+
+    async def click(self, selector: str, timeout: int = 10000, force: bool = False) -> None:
+        async with self.step(f"Clicking element: {selector}"):
+            try:
+                await self._wait(f"click {selector}", timeout,
+                                 lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms))
+                await self.page.click(selector, force=force)
+                self.logger.info(f"Clicked {selector}")
+            except Exception as e:
+                self.logger.error(f"Click failed on {selector}: {e}")
+                raise
+
+    async def fill(self, selector: str, value: str, timeout: int = 10000) -> None:
+        async with self.step(f"Filling {selector} with '{value}'"):
+            try:
+                await self._wait(f"fill {selector}", timeout,
+                                 lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms))
+                await self.page.fill(selector, value)
+                self.logger.info(f"Filled {selector} with {value}")
+            except Exception as e:
+                self.logger.error(f"Fill failed on {selector}: {e}")
+                raise
+
+    async def get_text(self, selector: str, timeout: int = 10000) -> Optional[str]:
+        async with self.step(f"Getting text from {selector}"):
+            try:
+                await self._wait(f"get_text {selector}", timeout,
+                                 lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms))
+                text = await self.page.text_content(selector)
+                self.logger.info(f"Text from {selector}: {text}")
+                return text
+            except Exception as e:
+                self.logger.error(f"Get text failed for {selector}: {e}")
+                raise
+
+    async def is_element_visible(self, selector: str, timeout: int = 5000) -> bool:
+        try:
+            return await self.page.is_visible(selector, timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"Element {selector} not visible: {e}")
+            return False
+
+    async def wait_for_element(self, selector: str, timeout: int = 10000, state: str = "visible") -> None:
+        try:
+            await self._wait(f"wait_for_element {selector}", timeout,
+                             lambda ms: self.page.wait_for_selector(selector, state=state, timeout=ms))
+            self.logger.info(f"Element {selector} is now {state}")
+        except Exception as e:
+            self.logger.error(f"Wait for {selector} ({state}) failed: {e}")
+            raise
+
+    async def hover(self, selector: str, timeout: int = 10000) -> None:
+        async with self.step(f"Hovering over element: {selector}"):
+            try:
+                await self._wait(f"hover {selector}", timeout,
+                                 lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms))
+                await self.page.hover(selector)
+                self.logger.info(f"Hovered over {selector}")
+            except Exception as e:
+                self.logger.error(f"Hover failed on {selector}: {e}")
+                raise
+
+    async def wait_for_url_contains(self, partial_url: str, timeout: int = 10000) -> None:
+        try:
+            await self._wait(f"wait_for_url {partial_url}", timeout,
+                             lambda ms: self.page.wait_for_url(f"**{partial_url}**", timeout=ms))
+            self.logger.info(f"URL now contains '{partial_url}'")
+        except Exception as e:
+            self.logger.error(f"URL wait failed for '{partial_url}': {e}")
+            raise
+
+    async def extract_records(self, selector: str, fields: FieldMap) -> List[dict]:
+        """Read `fields` from every element matching `selector` in a single call."""
+        raw = await self.page.eval_on_selector_all(selector, _EXTRACT_JS, BasePage._field_spec(fields))
+        records = [BasePage._parse_fields(row, fields) for row in raw]
+        self.logger.info(f"Extracted {len(records)} record(s) from {selector}")
+        return records
+
+    async def extract_fields(self, fields: FieldMap) -> dict:
+        """Read page-level `fields` (first match of each selector) in a single call."""
+        raw = await self.page.evaluate(_EXTRACT_DOCUMENT_JS, BasePage._field_spec(fields))
+        return BasePage._parse_fields(raw, fields)
+
+    async def handle_consent_popup(self) -> None:
+        try:
+            consent = self.page.get_by_role("button", name="Consent", exact=True)
+            await self._wait("popup Consent", POPUP_TIMEOUT, lambda ms: consent.wait_for(timeout=ms))
+            await consent.click()
+            self.logger.info("Consent popup dismissed.")
+        except Exception as e:
+            self.logger.debug(f"No consent popup appeared: {e}")
+
+    async def dismiss_ads_or_modals(self) -> None:
+        try:
+            close_btn = self.page.get_by_role("button", name="Close", exact=True)
+            await self._wait("popup Close", POPUP_TIMEOUT, lambda ms: close_btn.wait_for(timeout=ms))
+            await close_btn.click()
+            self.logger.info("Ad/modal dismissed.")
+        except Exception as e:
+            self.logger.debug(f"No ad/modal to dismiss: {e}")
+
+    async def setup_page(self) -> None:
+        if not self.skip_consent:
+            await self.handle_consent_popup()
+        await self.dismiss_ads_or_modals()
+
+    async def wait_for_loader_to_disappear(self, timeout: int = 10000) -> None:
+        """Wait for the Magento loading mask (spinner) to be detached or hidden."""
+        try:
+            await self._wait("wait_for_loader .loading-mask", timeout,
+                             lambda ms: self.page.wait_for_selector(".loading-mask", state="hidden", timeout=ms))
+        except Exception as e:
+            self.logger.warning(f"Loader may not have disappeared in time: {e}")
+
+    @asynccontextmanager
+    async def expect_network_idle(self, *url_parts: str, quiet_ms: int = 500,
+                                  timeout: int = 10000) -> AsyncIterator[None]:
+        """Wait until XHRs whose URL contains any of `url_parts` have settled."""
+        pending = []
+
+        def matches(request) -> bool:
+            return any(part in request.url for part in url_parts)
+
+        def on_request(request) -> None:
+            if matches(request):
+                pending.append(request)
+
+        def on_done(request) -> None:
+            if request in pending:
+                pending.remove(request)
+
+        self.page.on("request", on_request)
+        self.page.on("requestfinished", on_done)
+        self.page.on("requestfailed", on_done)
+        try:
+            yield
+            deadline = time.monotonic() + timeout / 1000
+            while True:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    raise PlaywrightTimeout(f"Network did not settle for {url_parts} within {timeout} ms")
+                if pending:
+                    # A failed request leaves `pending` without a requestfinished event, so wait in slices.
+                    try:
+                        await self.page.wait_for_event("requestfinished",
+                                                       predicate=lambda request: all(r is request for r in pending),
+                                                       timeout=min(quiet_ms, remaining_ms))
+                    except PlaywrightTimeout:
+                        pass
+                    continue
+                try:
+                    await self.page.wait_for_event("request", predicate=matches,
+                                                   timeout=min(quiet_ms, remaining_ms))
+                except PlaywrightTimeout:
+                    self.logger.info(f"Network idle for {', '.join(url_parts)}")
+                    break
+        finally:
+            self.page.remove_listener("request", on_request)
+            self.page.remove_listener("requestfinished", on_done)
+            self.page.remove_listener("requestfailed", on_done)
+
+    @asynccontextmanager
+    async def expect_dom_change(self, selector: str, timeout: int = 10000) -> AsyncIterator[None]:
+        """Wait until the links matched by `selector` (or the page URL) change."""
+        before = await self.page.evaluate(_DOM_SIGNATURE_JS, selector)
+        yield
+        try:
+            await self.page.wait_for_function(_DOM_CHANGED_JS, arg=[selector, before], timeout=timeout)
+            self.logger.info(f"DOM updated for {selector}")
+        except Exception as e:
+            self.logger.error(f"DOM for {selector} did not change: {e}")
+            raise
@@ -0,0 +1,226 @@
+# utills/async_runner.py - drive many checkout scenarios from one event loop
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from utills.catalog_index import CACHE_DIR as CATALOG_DIR, CatalogIndex
+from utills.launch_profiles import LaunchProfile
+from utills.scenario_planner import STEPS, Fork, PrefixNode, build_tree, category_path, filters_of, step_counts
+
+# Playwright and the async page objects load when the scenarios run, not when tests are collected.
+if TYPE_CHECKING:
+    from pageobject.aio.page_factory import AsyncPageFactory
+    from utills.async_basepage import StepTrace
+    from utills.network_rules import ResourceTypeFilter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    passed: bool = False
+    seconds: float = 0.0
+    order_number: Optional[str] = None
+    error: Optional[str] = None
+    trace: Optional["StepTrace"] = None
+
+
+async def run_prefix_step(factory: "AsyncPageFactory", config: Dict, row, step: str) -> None:
+    """One of the navigation steps scenario_planner.STEPS can share between rows."""
+    if step == "category":
+        await factory.base.navigate(config['urls']['base_url'], timeout=config['timeouts']['page_load'])
+        await factory.home.navigate_to_category(category_path(row))
+    elif step == "filters":
+        await factory.product.apply_filters(filters_of(row))
+        await factory.product.click_first_visible_product()
+
+
+async def run_checkout_flow(factory: "AsyncPageFactory", config: Dict, row, customer: Dict,
+                            fork: Optional[Fork] = None) -> Optional[str]:
+    """The checkout journey of tests/test_main.py, on the async page objects.
+
+    With a `fork`, the page starts where that shared step left off and only the later steps run.
+    """
+    steps = STEPS
+    product_url = None
+    if fork is not None:
+        await factory.base.navigate(fork.url, timeout=config['timeouts']['page_load'])
+        steps = STEPS[STEPS.index(fork.step) + 1:]
+    elif await factory.open_indexed_product(category_path(row), filters_of(row)):
+        steps = ()
+    for step in steps:
+        await run_prefix_step(factory, config, row, step)
+    if "filters" in steps:
+        product_url = factory.page.url
+    await factory.product.customize_product_selection(size=row["Size"], color=row["Color"], quantity=row["Quantity"])
+    await factory.product.add_product_to_cart_and_verify()
+    factory.index_product(category_path(row), filters_of(row), product_url)
+    await factory.product.open_mini_cart()
+    await factory.product.click_proceed_to_checkout()
+    await factory.checkout.fill_shipping_address(
+        email=customer["email"],
+        first_name=customer["first_name"],
+        last_name=customer["last_name"],
+        street=customer["street"],
+        city=customer["city"],
+        zip_code=customer["zip_code"],
+        country=customer["country"],
+        phone=str(customer["phone"])
+    )
+    if not await factory.checkout.get_shipping_methods():
+        raise AssertionError("No shipping methods available")
+    await factory.checkout.click_next_button()
+    await factory.checkout.apply_and_verify_discount(row["DiscountCode"])
+    return await factory.place_order.place_order_and_capture_number()
+
+
+async def _block_requests(route) -> None:
+    await route.abort()
+
+
+def _resource_filter_handler(resource_filter: "ResourceTypeFilter"):
+    async def handle(route, request) -> None:
+        if resource_filter.blocks(request.resource_type, request.url):
+            await route.abort()
+        else:
+            await route.fallback()
+    return handle
+
+
+class _Runner:
+    """Everything the scenarios of one run share: browser, settings, catalog index and concurrency limit."""
+
+    def __init__(self, browser, config: Dict, profile: LaunchProfile, block_pattern,
+                 catalog: Optional[CatalogIndex], customer: Dict, semaphore: asyncio.Semaphore):
+        self.browser = browser
+        self.config = config
+        self.profile = profile
+        self.block_pattern = block_pattern
+        self.catalog = catalog
+        self.customer = customer
+        self.semaphore = semaphore
+
+    async def _new_context(self, fork: Optional[Fork] = None):
+        context = await self.browser.new_context(viewport=self.profile.viewport, locale='en-US',
+                                                 storage_state=fork.state if fork is not None else None)
+        if self.block_pattern is not None:
+            await context.route(self.block_pattern, _block_requests)
+        resource_filter = self.profile.resource_filter(self.config['urls']['base_url'])
+        if resource_filter is not None and resource_filter.pattern is not None:
+            await context.route(resource_filter.pattern, _resource_filter_handler(resource_filter))
+        context.set_default_timeout(self.config['timeouts']['element_wait'])
+        return context
+
+    async def run_one(self, row, fork: Optional[Fork] = None, shared_steps: List[dict] = ()) -> ScenarioResult:
+        from pageobject.aio.page_factory import AsyncPageFactory
+        from utills.async_basepage import StepTrace
+
+        result = ScenarioResult(scenario=str(row["Scenario"]), trace=StepTrace(str(row["Scenario"])))
+        result.trace.steps.extend(shared_steps)
+        async with self.semaphore:
+            started = time.perf_counter()
+            context = await self._new_context(fork)
+            try:
+                page = await context.new_page()
+                factory = AsyncPageFactory(page, self.config, result.trace, prewarmed=False, catalog=self.catalog)
+                result.order_number = await run_checkout_flow(factory, self.config, row, self.customer, fork)
+                result.passed = True
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+                logger.error(f"Scenario {result.scenario} failed: {result.error}")
+            finally:
+                await context.close()
+                result.seconds = time.perf_counter() - started
+        return result
+
+    async def _fork(self, node: PrefixNode, fork: Optional[Fork]) -> Tuple[Fork, List[dict]]:
+        """Run a shared step once, in a context of its own, and capture where it left the browser."""
+        from pageobject.aio.page_factory import AsyncPageFactory
+        from utills.async_basepage import StepTrace
+
+        trace = StepTrace(node.key)
+        async with self.semaphore:
+            context = await self._new_context(fork)
+            try:
+                page = await context.new_page()
+                factory = AsyncPageFactory(page, self.config, trace, prewarmed=False, catalog=self.catalog)
+                if fork is not None:
+                    await factory.base.navigate(fork.url, timeout=self.config['timeouts']['page_load'])
+                await run_prefix_step(factory, self.config, node.rows[0], node.step)
+                return Fork(node.step, page.url, await context.storage_state()), trace.steps
+            except Exception as e:
+                raise SharedStepError(node, trace.steps, e) from e
+            finally:
+                await context.close()
+
+    async def run_node(self, node: PrefixNode, fork: Optional[Fork] = None,
+                       shared_steps: List[dict] = ()) -> List[ScenarioResult]:
+        """Run the rows below `node`, forking after each step more than one of them shares."""
+        if len(node.rows) == 1:
+            return [await self.run_one(node.rows[0], fork, shared_steps)]
+        if node.step is not None:
+            try:
+                fork, steps = await self._fork(node, fork)
+            except SharedStepError as e:
+                return [e.result_for(row, shared_steps) for row in node.rows]
+            shared_steps = list(shared_steps) + [dict(step, title=f"{step['title']} (shared)") for step in steps]
+        if not node.children:
+            return list(await asyncio.gather(*(self.run_one(row, fork, shared_steps) for row in node.rows)))
+        groups = await asyncio.gather(*(self.run_node(child, fork, shared_steps) for child in node.children.values()))
+        return [result for group in groups for result in group]
+
+
+class SharedStepError(Exception):
+    """A step shared by several rows failed; each of them fails with it."""
+
+    def __init__(self, node: PrefixNode, steps: List[dict], error: Exception):
+        super().__init__(f"shared step '{node.step}' failed: {type(error).__name__}: {error}")
+        self.steps = steps
+
+    def result_for(self, row, shared_steps: List[dict]) -> ScenarioResult:
+        from utills.async_basepage import StepTrace
+
+        trace = StepTrace(str(row["Scenario"]))
+        trace.steps.extend(list(shared_steps) + [dict(step, title=f"{step['title']} (shared)") for step in self.steps])
+        logger.error(f"Scenario {row['Scenario']} failed: {self}")
+        return ScenarioResult(scenario=str(row["Scenario"]), error=str(self), trace=trace)
+
+
+async def run_scenarios(config: Dict, rows: List, customer: Dict,
+                        browser_name: Optional[str] = None) -> List[ScenarioResult]:
+    """Run every row in its own context, `engine.concurrency` at a time, on one browser.
+
+    With `engine.shared_prefix`, rows that go through the same category and
+    filters share those steps (see utills/scenario_planner.py). Results come
+    back in the order of `rows` either way. `browser_name` defaults to
+    environment.browser.
+    """
+    from playwright.async_api import async_playwright
+    from utills.network_rules import InterceptionEngine
+
+    settings = config.get('engine') or {}
+    semaphore = asyncio.Semaphore(settings.get('concurrency', 8))
+    # Block rules are matched in the driver; the static cache handlers are sync-only and stay off here.
+    block_pattern = InterceptionEngine.from_config(config.get('network')).block_pattern
+    profile = LaunchProfile.from_config(config.get('launch'), config['environment'])
+    browser_name = browser_name or config['environment'].get('browser', 'chromium')
+    catalog_settings = config.get('catalog_index') or {}
+    catalog = CatalogIndex(config['urls']['base_url'], catalog_settings.get('dir', CATALOG_DIR),
+                           catalog_settings.get('ttl_seconds', 86400)) if catalog_settings.get('enabled') else None
+    async with async_playwright() as p:
+        browser_type = getattr(p, browser_name)
+        browser = await browser_type.launch(**profile.launch_options(browser_name))
+        try:
+            runner = _Runner(browser, config, profile, block_pattern, catalog, customer, semaphore)
+            if not settings.get('shared_prefix'):
+                return list(await asyncio.gather(*(runner.run_one(row) for row in rows)))
+            naive, planned = step_counts(rows)
+            logger.info(f"Shared-prefix plan: {planned} navigation steps instead of {naive}")
+            by_scenario = {result.scenario: result for result in await runner.run_node(build_tree(rows))}
+            return [by_scenario[str(row["Scenario"])] for row in rows]
+        finally:
+            await browser.close()
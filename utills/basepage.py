@@ -1,20 +1,100 @@
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 import logging
-from typing import Optional
+import re
+import time
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import allure
+from locators.registry import registry
+from utills import adaptive
+from utills.timing import recorder
+
+# Signature of a DOM region: current URL plus the hrefs of the links inside it.
+# Layered navigation either reloads the page or swaps the grid in place, and
+# both change this string.
+_DOM_SIGNATURE_JS = """
+(selector) => location.href + '|' +
+    Array.from(document.querySelectorAll(selector)).map(a => a.href).join(',')
+"""
+
+_DOM_CHANGED_JS = """
+([selector, before]) => {
+    if (document.readyState === 'loading') return false;
+    const now = location.href + '|' +
+        Array.from(document.querySelectorAll(selector)).map(a => a.href).join(',');
+    return now !== before;
+}
+"""
+
+
+# Read a declarative field map off each root element in one round-trip.
+# fields: {name: [selector relative to the root ("" = the root itself), "text" or attribute name]}
+_EXTRACT_JS = """
+(roots, fields) => roots.map(root => {
+    const record = {};
+    for (const [name, [selector, attribute]] of Object.entries(fields)) {
+        const el = selector ? root.querySelector(selector) : root;
+        record[name] = !el ? null : attribute === 'text' ? el.innerText.trim() : el.getAttribute(attribute);
+    }
+    return record;
+})
+"""
+
+_EXTRACT_DOCUMENT_JS = f"(fields) => ({_EXTRACT_JS})([document.documentElement], fields)[0]"
+
+# A field map entry: (selector, "text" or attribute name, kind); kind is "str" or "money".
+FieldMap = Dict[str, Tuple[str, str, str]]
+
+
+def parse_money(text: Optional[str]) -> Optional[Decimal]:
+    """Parse a storefront price such as '$1,234.50' or '-$20.00' into a Decimal."""
+    if text is None:
+        return None
+    cleaned = re.sub(r"[^\d.\-]", "", text)
+    try:
+        return Decimal(cleaned) if cleaned else None
+    except InvalidOperation:
+        return None
+
+
+# Ceiling for consent/ad popups, which are usually absent.
+POPUP_TIMEOUT = 3000
+
+_FIELD_PARSERS = {
+    "str": lambda value: value,
+    "money": parse_money,
+}
 
 
 class BasePage:
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, skip_consent: bool = False):
         self.page = page
+        self.skip_consent = skip_consent
         self.logger = logging.getLogger(__name__)
 
+    def locate(self, selector, first: bool = False, **params):
+        """Cached Locator for a selector or a registry template rendered with `params`."""
+        return registry.locator(self.page, selector, first=first, **params)
+
+    def _timed(self, name: str, selector: Optional[str] = None):
+        """Time a BasePage call, split into wait and action time."""
+        return recorder.action(name, selector, type(self).__name__)
+
+    def _wait(self, key: str, timeout: int, wait: Callable[[int], object], timer=None):
+        """Run an idempotent wait with the timeout learned for `key`; `timeout` is the ceiling."""
+        def count_retry():
+            timer.retries += 1
+        return adaptive.policy.run(key, timeout, wait, (PlaywrightTimeout,), count_retry if timer else None)
+
     def navigate(self, url: str, timeout: int = 30000) -> None:
-        with allure.step(f"Navigating to {url}"):
+        with allure.step(f"Navigating to {url}"), self._timed("navigate", url) as t:
             try:
-                self.page.goto(url, timeout=timeout)
+                with t.act():
+                    self.page.goto(url, timeout=timeout)
                 self.logger.info(f"Navigated to {url}")
-                self.setup_page()
+                with t.wait():
+                    self.setup_page()
             except PlaywrightTimeout:
                 self.logger.error(f"Navigation timeout to {url}")
                 raise
@@ -23,30 +103,39 @@ class BasePage:
                 raise
 
     def click(self, selector: str, timeout: int = 10000, force: bool = False) -> None:
-        with allure.step(f"Clicking element: {selector}"):
+        with allure.step(f"Clicking element: {selector}"), self._timed("click", selector) as t:
             try:
-                self.page.wait_for_selector(selector, state="visible", timeout=timeout)
-                self.page.click(selector, force=force)
+                with t.wait():
+                    self._wait(f"click {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms), t)
+                with t.act():
+                    self.page.click(selector, force=force)
                 self.logger.info(f"Clicked {selector}")
             except Exception as e:
                 self.logger.error(f"Click failed on {selector}: {e}")
                 raise
 
     def fill(self, selector: str, value: str, timeout: int = 10000) -> None:
-        with allure.step(f"Filling {selector} with '{value}'"):
+        with allure.step(f"Filling {selector} with '{value}'"), self._timed("fill", selector) as t:
             try:
-                self.page.wait_for_selector(selector, state="visible", timeout=timeout)
-                self.page.fill(selector, value)
+                with t.wait():
+                    self._wait(f"fill {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms), t)
+                with t.act():
+                    self.page.fill(selector, value)
                 self.logger.info(f"Filled {selector} with {value}")
             except Exception as e:
                 self.logger.error(f"Fill failed on {selector}: {e}")
                 raise
 
     def get_text(self, selector: str, timeout: int = 10000) -> Optional[str]:
-        with allure.step(f"Getting text from {selector}"):
+        with allure.step(f"Getting text from {selector}"), self._timed("get_text", selector) as t:
             try:
-                self.page.wait_for_selector(selector, state="visible", timeout=timeout)
-                text = self.page.text_content(selector)
+                with t.wait():
+                    self._wait(f"get_text {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms), t)
+                with t.act():
+                    text = self.page.text_content(selector)
                 self.logger.info(f"Text from {selector}: {text}")
                 return text
             except Exception as e:
@@ -54,37 +143,46 @@ class BasePage:
                 raise
 
     def is_element_visible(self, selector: str, timeout: int = 5000) -> bool:
-        with allure.step(f"Checking visibility of {selector}"):
+        with allure.step(f"Checking visibility of {selector}"), self._timed("is_element_visible", selector) as t:
             try:
-                return self.page.is_visible(selector, timeout=timeout)
+                with t.act():
+                    return self.page.is_visible(selector, timeout=timeout)
             except Exception as e:
                 self.logger.warning(f"Element {selector} not visible: {e}")
                 return False
 
     def wait_for_element(self, selector: str, timeout: int = 10000, state: str = "visible") -> None:
-        with allure.step(f"Waiting for element: {selector} to be {state}"):
+        with allure.step(f"Waiting for element: {selector} to be {state}"), self._timed("wait_for_element", selector) as t:
             try:
-                self.page.wait_for_selector(selector, state=state, timeout=timeout)
+                with t.wait():
+                    self._wait(f"wait_for_element {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, state=state, timeout=ms), t)
                 self.logger.info(f"Element {selector} is now {state}")
             except Exception as e:
                 self.logger.error(f"Wait for {selector} ({state}) failed: {e}")
                 raise
 
     def hover(self, selector: str, timeout: int = 10000) -> None:
-        with allure.step(f"Hovering over element: {selector}"):
+        with allure.step(f"Hovering over element: {selector}"), self._timed("hover", selector) as t:
             try:
-                self.page.wait_for_selector(selector, state="visible", timeout=timeout)
-                self.page.hover(selector)
+                with t.wait():
+                    self._wait(f"hover {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms), t)
+                with t.act():
+                    self.page.hover(selector)
                 self.logger.info(f"Hovered over {selector}")
             except Exception as e:
                 self.logger.error(f"Hover failed on {selector}: {e}")
                 raise
 
     def press_key(self, selector: str, key: str, timeout: int = 5000) -> None:
-        with allure.step(f"Pressing '{key}' on {selector}"):
+        with allure.step(f"Pressing '{key}' on {selector}"), self._timed("press_key", selector) as t:
             try:
-                self.page.wait_for_selector(selector, timeout=timeout)
-                self.page.press(selector, key)
+                with t.wait():
+                    self._wait(f"press_key {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, timeout=ms), t)
+                with t.act():
+                    self.page.press(selector, key)
                 self.logger.info(f"Pressed '{key}' on {selector}")
             except Exception as e:
                 self.logger.error(f"Failed to press '{key}' on {selector}: {e}")
@@ -101,10 +199,13 @@ class BasePage:
                 raise
 
     def scroll_into_view(self, selector: str, timeout: int = 10000) -> None:
-        with allure.step(f"Scrolling {selector} into view"):
+        with allure.step(f"Scrolling {selector} into view"), self._timed("scroll_into_view", selector) as t:
             try:
-                self.page.wait_for_selector(selector, state="visible", timeout=timeout)
-                self.page.locator(selector).scroll_into_view_if_needed()
+                with t.wait():
+                    self._wait(f"scroll_into_view {selector}", timeout,
+                               lambda ms: self.page.wait_for_selector(selector, state="visible", timeout=ms), t)
+                with t.act():
+                    self.page.locator(selector).scroll_into_view_if_needed()
                 self.logger.info(f"Scrolled into view: {selector}")
             except Exception as e:
                 self.logger.error(f"Scroll into view failed: {e}")
@@ -120,11 +221,39 @@ class BasePage:
             self.logger.error(f"Failed to count elements for {selector}: {e}")
             raise
 
+    def extract_records(self, selector: str, fields: FieldMap) -> List[dict]:
+        """Read `fields` from every element matching `selector` in a single call.
+
+        Returns one dict per row; missing elements give None and "money"
+        fields are parsed into Decimal.
+        """
+        with self._timed("extract_records", selector) as t, t.act():
+            raw = self.page.eval_on_selector_all(selector, _EXTRACT_JS, self._field_spec(fields))
+        records = [self._parse_fields(row, fields) for row in raw]
+        self.logger.info(f"Extracted {len(records)} record(s) from {selector}")
+        return records
+
+    def extract_fields(self, fields: FieldMap) -> dict:
+        """Read page-level `fields` (first match of each selector) in a single call."""
+        with self._timed("extract_fields", ",".join(fields)) as t, t.act():
+            raw = self.page.evaluate(_EXTRACT_DOCUMENT_JS, self._field_spec(fields))
+        return self._parse_fields(raw, fields)
+
+    @staticmethod
+    def _field_spec(fields: FieldMap) -> Dict[str, List[str]]:
+        return {name: [selector, attribute] for name, (selector, attribute, _) in fields.items()}
+
+    @staticmethod
+    def _parse_fields(raw: dict, fields: FieldMap) -> dict:
+        return {name: _FIELD_PARSERS[kind](raw.get(name)) for name, (_, _, kind) in fields.items()}
+
     def wait_for_url_contains(self, partial_url: str, timeout: int = 10000) -> None:
         """Wait for URL to contain a substring (e.g., 'success')"""
-        with allure.step(f"Waiting for URL to contain '{partial_url}'"):
+        with allure.step(f"Waiting for URL to contain '{partial_url}'"), self._timed("wait_for_url", partial_url) as t:
             try:
-                self.page.wait_for_url(f"**{partial_url}**", timeout=timeout)
+                with t.wait():
+                    self._wait(f"wait_for_url {partial_url}", timeout,
+                               lambda ms: self.page.wait_for_url(f"**{partial_url}**", timeout=ms), t)
                 self.logger.info(f"URL now contains '{partial_url}'")
             except Exception as e:
                 self.logger.error(f"URL wait failed for '{partial_url}': {e}")
@@ -133,7 +262,9 @@ class BasePage:
     def handle_consent_popup(self) -> None:
         """Handle cookie or consent popups."""
         try:
-            self.page.get_by_role("button", name="Consent", exact=True).click(timeout=3000)
+            consent = self.page.get_by_role("button", name="Consent", exact=True)
+            self._wait("popup Consent", POPUP_TIMEOUT, lambda ms: consent.wait_for(timeout=ms))
+            consent.click()
             self.logger.info("Consent popup dismissed.")
         except Exception as e:
             self.logger.debug(f"No consent popup appeared: {e}")
@@ -142,23 +273,98 @@ class BasePage:
         """Dismiss modal ads or popups."""
         try:
             close_btn = self.page.get_by_role("button", name="Close", exact=True)
-            close_btn.wait_for(timeout=3000)
+            self._wait("popup Close", POPUP_TIMEOUT, lambda ms: close_btn.wait_for(timeout=ms))
             close_btn.click()
             self.logger.info("Ad/modal dismissed.")
         except Exception as e:
             self.logger.debug(f"No ad/modal to dismiss: {e}")
 
     def setup_page(self) -> None:
-        """Handle popups and modals immediately after navigation."""
-        self.handle_consent_popup()
+        """Handle popups and modals immediately after navigation.
+
+        The consent popup is skipped when the context was loaded from a
+        storage_state snapshot that already has consent accepted.
+        """
+        if not self.skip_consent:
+            self.handle_consent_popup()
         self.dismiss_ads_or_modals()
 
     @allure.step("Waiting for Magento loading spinner to disappear")
     def wait_for_loader_to_disappear(self, timeout: int = 10000) -> None:
-        """Wait for the Magento loading mask (spinner) to disappear."""
+        """Wait for the Magento loading mask (spinner) to be detached or hidden."""
         try:
             self.logger.info("Waiting for Magento loader to disappear...")
-            self.page.wait_for_selector(".loading-mask", state="hidden", timeout=timeout)
+            with self._timed("wait_for_loader", ".loading-mask") as t, t.wait():
+                self._wait("wait_for_loader .loading-mask", timeout,
+                           lambda ms: self.page.wait_for_selector(".loading-mask", state="hidden", timeout=ms), t)
             self.logger.info("Loading spinner disappeared.")
         except Exception as e:
             self.logger.warning(f"Loader may not have disappeared in time: {e}")
+
+    @contextmanager
+    def expect_network_idle(self, *url_parts: str, quiet_ms: int = 500, timeout: int = 10000) -> Iterator[None]:
+        """Wait until XHRs whose URL contains any of `url_parts` have settled.
+
+        Requests fired inside the block are tracked; on exit every one of them
+        must finish or fail, and no new matching request may start for
+        `quiet_ms`, all within `timeout`.
+        """
+        pending = []
+
+        def matches(request) -> bool:
+            return any(part in request.url for part in url_parts)
+
+        def on_request(request) -> None:
+            if matches(request):
+                pending.append(request)
+
+        def on_done(request) -> None:
+            if request in pending:
+                pending.remove(request)
+
+        self.page.on("request", on_request)
+        self.page.on("requestfinished", on_done)
+        self.page.on("requestfailed", on_done)
+        try:
+            yield
+            with self._timed("network_idle", ",".join(url_parts)) as t, t.wait():
+                self._drain_requests(pending, matches, url_parts, quiet_ms, timeout)
+        finally:
+            self.page.remove_listener("request", on_request)
+            self.page.remove_listener("requestfinished", on_done)
+            self.page.remove_listener("requestfailed", on_done)
+
+    def _drain_requests(self, pending, matches, url_parts, quiet_ms: int, timeout: int) -> None:
+        """Wait for `pending` to empty and no new match for `quiet_ms`, raising past `timeout`."""
+        deadline = time.monotonic() + timeout / 1000
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                raise PlaywrightTimeout(f"Network did not settle for {url_parts} within {timeout} ms")
+            if pending:
+                # A failed request leaves `pending` without a requestfinished event, so wait in slices.
+                try:
+                    self.page.wait_for_event("requestfinished",
+                                             predicate=lambda request: all(r is request for r in pending),
+                                             timeout=min(quiet_ms, remaining_ms))
+                except PlaywrightTimeout:
+                    pass
+                continue
+            try:
+                self.page.wait_for_event("request", predicate=matches, timeout=min(quiet_ms, remaining_ms))
+            except PlaywrightTimeout:
+                self.logger.info(f"Network idle for {', '.join(url_parts)}")
+                return
+
+    @contextmanager
+    def expect_dom_change(self, selector: str, timeout: int = 10000) -> Iterator[None]:
+        """Wait until the links matched by `selector` (or the page URL) change."""
+        before = self.page.evaluate(_DOM_SIGNATURE_JS, selector)
+        yield
+        try:
+            with self._timed("dom_change", selector) as t, t.wait():
+                self.page.wait_for_function(_DOM_CHANGED_JS, arg=[selector, before], timeout=timeout)
+            self.logger.info(f"DOM updated for {selector}")
+        except Exception as e:
+            self.logger.error(f"DOM for {selector} did not change: {e}")
+            raise
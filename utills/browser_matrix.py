@@ -0,0 +1,100 @@
+# utills/browser_matrix.py - run the browser tests on several browser types in one session
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utills.sharding import DurationStore, balance, base_nodeid
+
+BROWSER_TYPES = ("chromium", "firefox", "webkit")
+
+
+def parse_browsers(option: Optional[str], configured: Optional[Iterable[str]]) -> List[str]:
+    """Browser types from --browsers ("chromium,firefox") or matrix.browsers, in order, without repeats."""
+    names = option.split(",") if option else list(configured or [])
+    browsers = []
+    for name in (n.strip() for n in names):
+        if name not in BROWSER_TYPES:
+            raise ValueError(f"Unknown browser type '{name}'; expected one of {', '.join(BROWSER_TYPES)}")
+        if name not in browsers:
+            browsers.append(name)
+    return browsers
+
+
+def split_nodeid(nodeid: str, browsers: Iterable[str]) -> Tuple[str, Optional[str]]:
+    """(node id without its browser, browser) of a matrix test; (nodeid, None) outside the matrix.
+
+    The browser is the last parameter of the test id, so the runs of one
+    test on every browser share the first element.
+    """
+    nodeid = base_nodeid(nodeid)
+    for browser in browsers:
+        if nodeid.endswith(f"-{browser}]"):
+            return nodeid[:-len(browser) - 2] + "]", browser
+        if nodeid.endswith(f"[{browser}]"):
+            return nodeid[:-len(browser) - 2], browser
+    return nodeid, None
+
+
+def assign(nodeids: List[str], browsers: List[str], store: DurationStore, shards: int,
+           cascade: bool = False) -> Dict[str, int]:
+    """Spread the browser x test matrix over `shards` processes.
+
+    Each process launches a browser per type it is given, so the shards are
+    split between the browser types first and each type's tests are balanced
+    within its shards. A cascade needs every browser's run of a test in the
+    process that runs it on the first browser, so those stay together instead.
+    """
+    if cascade:
+        return balance(nodeids, store, shards, key=lambda nodeid: split_nodeid(nodeid, browsers)[0])
+    by_browser: Dict[Optional[str], List[str]] = defaultdict(list)
+    for nodeid in nodeids:
+        by_browser[split_nodeid(nodeid, browsers)[1]].append(nodeid)
+    matrix = [browser for browser in browsers if by_browser.get(browser)]
+    if shards < len(matrix) or not matrix:
+        return balance(nodeids, store, shards, key=lambda nodeid: split_nodeid(nodeid, browsers)[1] or nodeid)
+
+    assignment: Dict[str, int] = {}
+    for position, browser in enumerate(matrix):
+        own = list(range(position, shards, len(matrix)))
+        for nodeid, shard in balance(by_browser[browser], store, len(own)).items():
+            assignment[nodeid] = own[shard]
+    # Tests outside the matrix (no browser) go wherever there is room.
+    loads = [0.0] * shards
+    for nodeid, shard in assignment.items():
+        loads[shard] += store.cost(nodeid)
+    for nodeid in sorted(by_browser.get(None, []), key=lambda n: (-store.cost(n), n)):
+        shard = min(range(shards), key=lambda i: (loads[i], i))
+        assignment[nodeid] = shard
+        loads[shard] += store.cost(nodeid)
+    return assignment
+
+
+class Cascade:
+    """Run the first browser of the matrix everywhere, the others only where it passed.
+
+    Items are ordered so a test's first-browser run comes first in its
+    process; `assign(cascade=True)` keeps all of a test's runs in that process.
+    """
+
+    def __init__(self, browsers: List[str]):
+        self.browsers = browsers
+        self.first = browsers[0]
+        self.passed: Dict[str, bool] = {}
+
+    def order(self, nodeid: str) -> int:
+        browser = split_nodeid(nodeid, self.browsers)[1]
+        return self.browsers.index(browser) if browser else 0
+
+    def record(self, report) -> None:
+        """Keep the outcome of a first-browser run: its call, or a failed setup."""
+        key, browser = split_nodeid(report.nodeid, self.browsers)
+        if browser == self.first and (report.when == "call" or (report.when == "setup" and report.failed)):
+            self.passed[key] = report.passed
+
+    def skip_reason(self, nodeid: str) -> Optional[str]:
+        key, browser = split_nodeid(nodeid, self.browsers)
+        if browser is None or browser == self.first or self.passed.get(key):
+            return None
+        if key not in self.passed:
+            return f"cascade: not run on {self.first}"
+        return f"cascade: failed on {self.first}"
@@ -0,0 +1,132 @@
+# utills/cart_seeder.py - build guest carts through the Magento REST API
+
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+
+def _is_valid(value) -> bool:
+    return value is not None and str(value).strip() != "" and not (isinstance(value, float) and math.isnan(value))
+
+
+@dataclass
+class SeededCart:
+    cart_id: str
+    items: List[dict] = field(default_factory=list)
+    shipping: Optional[dict] = None
+
+
+class GuestCartSeeder:
+    """Create guest carts with the REST guest-cart endpoints instead of the UI.
+
+    SKUs come from an `SKU` column in the Excel row, or from
+    `cart_seeding.skus` keyed by scenario ID. Size and color labels are
+    resolved to configurable option IDs through `cart_seeding.attributes`.
+    The masked cart ID is handed to the browser in the `cart_seeding.cookie`
+    cookie, which only the stub store reads: real Magento binds the guest
+    quote to the PHP session, so there the browser opens an empty checkout.
+    """
+
+    def __init__(self, session, api_base_url: str, settings: Dict):
+        self.session = session
+        self.api_base_url = api_base_url.rstrip("/") + "/"
+        self.settings = settings or {}
+        self.timeout = self.settings.get("timeout_seconds", 30)
+        self.logger = logging.getLogger(__name__)
+
+    def _url(self, path: str) -> str:
+        return self.api_base_url + path.lstrip("/")
+
+    def _call(self, method: str, path: str, payload=None):
+        response = self.session.request(method, self._url(path), json=payload, timeout=self.timeout)
+        if not response.ok:
+            self.logger.error(f"{method} {path} failed with {response.status_code}: {response.text}")
+            response.raise_for_status()
+        return response.json()
+
+    def create_cart(self) -> str:
+        cart_id = self._call("POST", "V1/guest-carts")
+        self.logger.info(f"Created guest cart {cart_id}")
+        return cart_id
+
+    def add_item(self, cart_id: str, sku: str, qty: int, options: Optional[Dict[int, int]] = None) -> dict:
+        cart_item = {"sku": sku, "qty": qty, "quote_id": cart_id}
+        if options:
+            cart_item["product_option"] = {"extension_attributes": {"configurable_item_options": [
+                {"option_id": str(attribute_id), "option_value": int(value_id)}
+                for attribute_id, value_id in options.items()
+            ]}}
+        item = self._call("POST", f"V1/guest-carts/{cart_id}/items", {"cartItem": cart_item})
+        self.logger.info(f"Added {qty} x {sku} to cart {cart_id}")
+        return item
+
+    def estimate_shipping_methods(self, cart_id: str, address: dict) -> List[dict]:
+        return self._call("POST", f"V1/guest-carts/{cart_id}/estimate-shipping-methods", {"address": address})
+
+    def set_shipping_information(self, cart_id: str, address: dict, carrier_code: str, method_code: str) -> dict:
+        payload = {"addressInformation": {
+            "shipping_address": address,
+            "billing_address": address,
+            "shipping_carrier_code": carrier_code,
+            "shipping_method_code": method_code,
+        }}
+        return self._call("POST", f"V1/guest-carts/{cart_id}/shipping-information", payload)
+
+    def resolve_sku(self, row) -> str:
+        if _is_valid(row.get("SKU")):
+            return str(row["SKU"]).strip()
+        sku = (self.settings.get("skus") or {}).get(row.get("Scenario"))
+        if not sku:
+            raise ValueError(f"No SKU for scenario {row.get('Scenario')}: add an SKU column or cart_seeding.skus entry")
+        return sku
+
+    def resolve_options(self, row) -> Dict[int, int]:
+        options = {}
+        for column, attribute in (self.settings.get("attributes") or {}).items():
+            label = row.get(column)
+            if not _is_valid(label):
+                continue
+            option_id = attribute["options"].get(str(label).strip())
+            if option_id is None:
+                raise ValueError(f"Unknown {column} option '{label}' for cart seeding")
+            options[attribute["attribute_id"]] = option_id
+        return options
+
+    def address_from_customer(self, customer) -> dict:
+        country = str(customer["country"]).strip()
+        return {
+            "email": customer["email"],
+            "firstname": customer["first_name"],
+            "lastname": customer["last_name"],
+            "street": [customer["street"]],
+            "city": customer["city"],
+            "postcode": str(customer["zip_code"]),
+            "country_id": (self.settings.get("country_codes") or {}).get(country, country),
+            "telephone": str(customer["phone"]),
+        }
+
+    def seed_from_row(self, row, customer=None) -> SeededCart:
+        """Create a cart for an Order_Details row and, optionally, set shipping."""
+        cart = SeededCart(self.create_cart())
+        qty = int(row["Quantity"]) if _is_valid(row.get("Quantity")) else 1
+        cart.items.append(self.add_item(cart.cart_id, self.resolve_sku(row), qty, self.resolve_options(row)))
+        if customer is not None:
+            address = self.address_from_customer(customer)
+            methods = self.estimate_shipping_methods(cart.cart_id, address)
+            if methods:
+                cart.shipping = self.set_shipping_information(
+                    cart.cart_id, address, methods[0]["carrier_code"], methods[0]["method_code"])
+        return cart
+
+    def attach_to_context(self, context, cart: SeededCart, storefront_url: str) -> None:
+        """Hand the cart to a BrowserContext through the stub store's cart cookie."""
+        host = urlparse(storefront_url).hostname
+        context.add_cookies([{
+            "name": self.settings.get("cookie", "guest_cart_id"),
+            "value": cart.cart_id,
+            "domain": host,
+            "path": "/",
+        }])
+        self.logger.info(f"Attached cart {cart.cart_id} to browser context for {host}")
@@ -0,0 +1,148 @@
+# utills/catalog_index.py - menu paths and filter combinations mapped to storefront URLs, kept on disk
+
+import json
+import math
+import os
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+CACHE_DIR = ".cache/catalog"
+
+# Label chain and href of every link in the top navigation, e.g.
+# {labels: ["Women", "Tops", "Jackets"], href: "https://.../jackets-women.html"}.
+SCRAPE_MENU_JS = """
+() => Array.from(document.querySelectorAll('nav.navigation li > a[href]')).map(a => {
+    const labels = [];
+    for (let li = a.parentElement; li && li.closest('nav.navigation'); li = li.parentElement.closest('li')) {
+        const link = li.querySelector(':scope > a');
+        if (link) labels.unshift(link.textContent.trim());
+    }
+    return {labels: labels, href: a.href};
+})
+"""
+
+
+def _valid(value) -> bool:
+    return value is not None and not (isinstance(value, float) and math.isnan(value)) and str(value).strip() != ""
+
+
+def category_key(menu_path: List) -> Optional[str]:
+    """Key of an Excel menu path (Category, SubCategory1, SubCategory2); empty cells are left out."""
+    labels = [str(label).strip().lower() for label in menu_path if _valid(label)]
+    return " > ".join(labels) or None
+
+
+def product_key(menu_path: List, filters: Dict[str, object]) -> Optional[str]:
+    category = category_key(menu_path)
+    if category is None:
+        return None
+    applied = sorted((str(name).strip().lower(), str(value).strip().lower())
+                     for name, value in filters.items() if _valid(value))
+    return category + " | " + "&".join(f"{name}={value}" for name, value in applied)
+
+
+class CatalogIndex:
+    """Direct URLs of categories and of the first product of a filtered category.
+
+    Category URLs come from one scrape of the navigation menu and from the
+    page the hover/click path ended on; product URLs from the product the
+    click path opened. Entries are stored relative to the base URL in one
+    JSON file per storefront host and expire after `ttl_seconds`. An entry
+    that leads to the wrong page is forgotten and the click path re-learns it.
+    """
+
+    def __init__(self, base_url: str, cache_dir: str = CACHE_DIR, ttl_seconds: float = 86400):
+        self.base_url = base_url
+        self.ttl = ttl_seconds
+        self.path = os.path.join(cache_dir, f"{urlsplit(base_url).hostname or 'default'}.json")
+        self._data = self._load()
+        self._mtime = self._disk_mtime()
+
+    def _disk_mtime(self) -> float:
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return 0.0
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        cutoff = time.time() - self.ttl
+        return {
+            "menu_scraped": data.get("menu_scraped", 0) if data.get("menu_scraped", 0) > cutoff else 0,
+            "categories": {k: v for k, v in (data.get("categories") or {}).items() if v.get("saved", 0) > cutoff},
+            "products": {k: v for k, v in (data.get("products") or {}).items() if v.get("saved", 0) > cutoff},
+        }
+
+    def _save(self, dropped: Optional[tuple] = None) -> None:
+        # Merge with what other workers wrote since we loaded; the newer entry wins.
+        on_disk = self._load()
+        for section in ("categories", "products"):
+            for key, entry in on_disk[section].items():
+                if (section, key) != dropped and entry["saved"] > self._data[section].get(key, {}).get("saved", 0):
+                    self._data[section][key] = entry
+        self._data["menu_scraped"] = max(self._data["menu_scraped"], on_disk["menu_scraped"])
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._mtime = self._disk_mtime()
+
+    def _relative(self, url: str) -> str:
+        parts = urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def _lookup(self, section: str, key: Optional[str]) -> Optional[str]:
+        if key and key not in self._data[section] and self._disk_mtime() != self._mtime:
+            # Another worker may have learned it since; pick up what it wrote.
+            on_disk = self._load()
+            self._mtime = self._disk_mtime()
+            for name in ("categories", "products"):
+                self._data[name] = {**on_disk[name], **self._data[name]}
+        entry = self._data[section].get(key) if key else None
+        return urljoin(self.base_url, entry["path"]) if entry else None
+
+    def _store(self, section: str, key: Optional[str], url: str) -> None:
+        if key and urlsplit(url).scheme in ("http", "https"):
+            self._data[section][key] = {"path": self._relative(url), "saved": time.time()}
+            self._save()
+
+    def _forget(self, section: str, key: Optional[str]) -> None:
+        if self._data[section].pop(key, None) is not None:
+            self._save(dropped=(section, key))
+
+    @property
+    def menu_indexed(self) -> bool:
+        return bool(self._data["menu_scraped"])
+
+    def learn_menu(self, items: List[dict]) -> None:
+        now = time.time()
+        for item in items:
+            key = category_key(item.get("labels") or [])
+            if key and key not in self._data["categories"]:
+                self._data["categories"][key] = {"path": self._relative(item["href"]), "saved": now}
+        self._data["menu_scraped"] = now
+        self._save()
+
+    def category_url(self, menu_path: List) -> Optional[str]:
+        return self._lookup("categories", category_key(menu_path))
+
+    def remember_category(self, menu_path: List, url: str) -> None:
+        self._store("categories", category_key(menu_path), url)
+
+    def forget_category(self, menu_path: List) -> None:
+        self._forget("categories", category_key(menu_path))
+
+    def product_url(self, menu_path: List, filters: Dict[str, object]) -> Optional[str]:
+        return self._lookup("products", product_key(menu_path, filters))
+
+    def remember_product(self, menu_path: List, filters: Dict[str, object], url: str) -> None:
+        self._store("products", product_key(menu_path, filters), url)
+
+    def forget_product(self, menu_path: List, filters: Dict[str, object]) -> None:
+        self._forget("products", product_key(menu_path, filters))
@@ -0,0 +1,115 @@
+# utills/checkpoints.py - storage_state checkpoints of a scenario, to resume late-stage failures
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+CACHE_DIR = ".cache/checkpoints"
+
+# In the order a checkout reaches them.
+STAGES = ("cart_built", "shipping_filled", "payment_reached")
+
+# Put the checkpoint's localStorage back for the page's origin.
+_RESTORE_STORAGE_JS = """
+(origins) => {
+    const origin = origins.find(o => o.origin === location.origin);
+    for (const item of (origin ? origin.localStorage : [])) localStorage.setItem(item.name, item.value);
+}
+"""
+
+
+def data_digest(*parts) -> str:
+    """Digest of the test data a checkpoint was taken with (Excel row, customer, base URL)."""
+    payload = json.dumps([dict(p) if hasattr(p, "keys") else p for p in parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class Checkpoint:
+    stage: str
+    url: str
+    state_path: str
+    saved: float
+
+
+class ScenarioCheckpoints:
+    """Checkpoints of one scenario: storage_state plus URL after each stage.
+
+    Files are shared by all workers under `.cache/checkpoints`, since a rerun
+    may land on another worker. A checkpoint is only used while it is younger
+    than `ttl_seconds` and was taken with the same test data; stale ones are
+    deleted when found. `resume` is off for a first attempt, so a normal run
+    always exercises the whole flow.
+    """
+
+    def __init__(self, key: str, digest: str, cache_dir: str = CACHE_DIR, ttl_seconds: float = 1800,
+                 resume: bool = False):
+        self.key = re.sub(r"[^A-Za-z0-9_.-]+", "_", key)
+        self.digest = digest
+        self.cache_dir = cache_dir
+        self.ttl = ttl_seconds
+        self.resume = resume
+        self.logger = logging.getLogger(__name__)
+
+    def _paths(self, stage: str):
+        base = os.path.join(self.cache_dir, f"{self.key}.{stage}")
+        return base + ".json", base + ".state.json"
+
+    def save(self, page, stage: str) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown checkpoint stage: {stage}. Expected one of {STAGES}")
+        meta_path, state_path = self._paths(stage)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        page.context.storage_state(path=state_path + suffix)
+        os.replace(state_path + suffix, state_path)
+        with open(meta_path + suffix, "w") as f:
+            json.dump({"stage": stage, "url": page.url, "digest": self.digest, "saved": time.time()}, f)
+        os.replace(meta_path + suffix, meta_path)
+        # Later stages of an earlier attempt no longer follow from this one.
+        self._discard(STAGES[STAGES.index(stage) + 1:])
+
+    def latest(self) -> Optional[Checkpoint]:
+        """The furthest valid checkpoint; expired ones and those of other test data are deleted."""
+        for stage in reversed(STAGES):
+            meta_path, state_path = self._paths(stage)
+            try:
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if meta.get("digest") != self.digest or time.time() - meta.get("saved", 0) > self.ttl \
+                    or not os.path.exists(state_path):
+                self._discard([stage])
+                continue
+            return Checkpoint(stage, meta["url"], state_path, meta["saved"])
+        return None
+
+    def restore(self, page, checkpoint: Checkpoint, timeout: int) -> None:
+        """Load the checkpoint's cookies and localStorage into the page's context and open its URL."""
+        with open(checkpoint.state_path, "r") as f:
+            state = json.load(f)
+        self.logger.info(f"Resuming {self.key} from checkpoint '{checkpoint.stage}' at {checkpoint.url}")
+        if state.get("cookies"):
+            page.context.add_cookies(state["cookies"])
+        page.goto(checkpoint.url, timeout=timeout)
+        if any(origin.get("localStorage") for origin in state.get("origins", [])):
+            page.evaluate(_RESTORE_STORAGE_JS, state["origins"])
+            page.reload(timeout=timeout)
+
+    def clear(self) -> None:
+        """Drop every checkpoint, e.g. once the order is placed and the cart is gone."""
+        self._discard(STAGES)
+
+    def _discard(self, stages: Iterable[str]) -> None:
+        for stage in stages:
+            for path in self._paths(stage):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -0,0 +1,161 @@
+# utills/context_pool.py - warm, recycled browser contexts for per-test isolation
+
+import json
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+# Clear the current origin's storage and put back the snapshot's localStorage for it.
+_RESET_STORAGE_JS = """
+(snapshot) => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+        const origin = snapshot.find(o => o.origin === location.origin);
+        for (const item of (origin ? origin.localStorage : [])) localStorage.setItem(item.name, item.value);
+    } catch (e) { /* about:blank and opaque origins have no storage */ }
+}
+"""
+
+_HEAP_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class PooledContext:
+    __slots__ = ("context", "page", "uses", "crashed", "created", "origins")
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+        self.created = time.monotonic()
+        self.origins: Set[str] = set()
+        page.on("crash", lambda _: setattr(self, "crashed", True))
+        page.on("framenavigated", self._navigated)
+
+    def _navigated(self, frame) -> None:
+        if frame == self.page.main_frame:
+            parts = urlsplit(frame.url)
+            if parts.scheme in ("http", "https"):
+                self.origins.add(f"{parts.scheme}://{parts.netloc}")
+
+
+class ContextPool:
+    """Keeps `size` ready-to-use contexts created by `factory`.
+
+    Contexts come out of `factory` with routes, default timeouts and viewport
+    already applied, each with one open page that is reused across tests.
+    On release the context is reset: cookies and permissions are cleared,
+    local and session storage of the origin the page is on too (then the
+    storage_state snapshot, if any, is put back), and the page goes to
+    about:blank. The page can only clear storage of its own origin, so a
+    context whose page visited more than one origin is recycled instead.
+    Contexts are also recycled after `max_uses` tests, when the JS heap of
+    the page exceeds `memory_limit_mb`, or when the page crashed or stops
+    responding.
+    """
+
+    def __init__(self, factory: Callable[[], object], storage_state: Optional[str] = None, size: int = 2,
+                 max_uses: int = 20, memory_limit_mb: float = 512, health_timeout_ms: int = 2000):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self.health_timeout_ms = health_timeout_ms
+        self.snapshot = self._load_snapshot(storage_state)
+        self.created = 0
+        self.recycled = 0
+        self._idle: Deque[PooledContext] = deque()
+        self._in_use: List[PooledContext] = []
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _load_snapshot(storage_state: Optional[str]) -> Dict:
+        if not storage_state:
+            return {"cookies": [], "origins": []}
+        with open(storage_state, "r") as f:
+            return json.load(f)
+
+    def _create(self) -> PooledContext:
+        context = self.factory()
+        pooled = PooledContext(context, context.new_page())
+        self.created += 1
+        return pooled
+
+    def warm(self) -> None:
+        while len(self._idle) + len(self._in_use) < self.size:
+            self._idle.append(self._create())
+
+    def is_healthy(self, pooled: PooledContext) -> bool:
+        if pooled.crashed or pooled.page.is_closed():
+            return False
+        try:
+            pooled.page.wait_for_function("() => true", timeout=self.health_timeout_ms)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> PooledContext:
+        while self._idle:
+            pooled = self._idle.popleft()
+            if self.is_healthy(pooled):
+                break
+            self.logger.warning("Discarding unhealthy pooled context.")
+            self._close(pooled)
+        else:
+            pooled = self._create()
+        pooled.uses += 1
+        self._in_use.append(pooled)
+        return pooled
+
+    def release(self, pooled: PooledContext) -> None:
+        self._in_use.remove(pooled)
+        if (pooled.uses >= self.max_uses or len(pooled.origins) > 1 or not self.is_healthy(pooled)
+                or self._over_memory(pooled)):
+            self.recycled += 1
+            self._close(pooled)
+            self.warm()
+            return
+        try:
+            self._reset(pooled)
+        except Exception as e:
+            self.logger.warning(f"Failed to reset pooled context, recycling it: {e}")
+            self.recycled += 1
+            self._close(pooled)
+            self.warm()
+            return
+        self._idle.append(pooled)
+
+    def _over_memory(self, pooled: PooledContext) -> bool:
+        try:
+            return pooled.page.evaluate(_HEAP_JS) > self.memory_limit
+        except Exception:
+            return True
+
+    def _reset(self, pooled: PooledContext) -> None:
+        context = pooled.context
+        for extra in context.pages:
+            if extra is not pooled.page:
+                extra.close()
+        pooled.page.evaluate(_RESET_STORAGE_JS, self.snapshot["origins"])
+        pooled.page.goto("about:blank")
+        pooled.origins.clear()
+        context.clear_cookies()
+        context.clear_permissions()
+        if self.snapshot["cookies"]:
+            context.add_cookies(self.snapshot["cookies"])
+
+    def _close(self, pooled: PooledContext) -> None:
+        try:
+            pooled.context.close()
+        except Exception as e:
+            self.logger.debug(f"Failed to close pooled context: {e}")
+
+    def close(self) -> None:
+        for pooled in list(self._idle) + self._in_use:
+            self._close(pooled)
+        self._idle.clear()
+        self._in_use.clear()
+        self.logger.info(f"Context pool closed: {self.created} created, {self.recycled} recycled.")
@@ -0,0 +1,437 @@
+# utills/coordinator.py - hand the Excel scenarios to pytest workers on any host
+#
+#   python -m utills.coordinator --bind 0.0.0.0:8765                  # then, on each machine:
+#   pytest tests/test_main.py --coordinator build-01:8765
+#   python -m utills.coordinator --spawn-local 4 tests/test_main.py   # coordinator + 4 workers on this box
+#
+# The coordinator reads the scenario IDs from data/test_data.xlsx and serves
+# them, longest first, over a TCP or Unix socket ("unix:/path") as JSON lines.
+# A worker is a normal pytest session started with --coordinator: it collects
+# the suite, keeps its browser and other session fixtures up, and runs the tests
+# of one scenario at a time. After each scenario it sends the outcome and the
+# new files of its --alluredir, which the coordinator merges into one results
+# directory. A worker that disconnects or stops sending heartbeats is dropped
+# and its scenario goes back to the queue, up to `coordinator.max_attempts`.
+
+import argparse
+import base64
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from utills.sharding import DEFAULT_COST, DurationStore
+
+CONFIG_PATH = "config/config.yaml"
+EXCEL_PATH = "data/test_data.xlsx"
+DURATIONS_PATH = ".cache/durations.json"
+MANIFEST_DIR = ".runs"   # allure_store.MANIFEST_DIR, without importing allure here
+
+logger = logging.getLogger(__name__)
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """Socket family and address of "host:port" or "unix:/path/to.sock"."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"Expected host:port or unix:/path, got '{address}'")
+    return socket.AF_INET, (host, int(port))
+
+
+class Channel:
+    """JSON lines over a socket; sends may come from several threads."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._reader = sock.makefile("r", encoding="utf-8", newline="\n")
+        self._lock = threading.Lock()
+
+    def send(self, message: dict) -> None:
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self._lock:
+            self.sock.sendall(data)
+
+    def receive(self) -> Optional[dict]:
+        """The next message; None once the other side has gone."""
+        try:
+            line = self._reader.readline()
+        except (OSError, ValueError):
+            return None
+        return json.loads(line) if line else None
+
+    def close(self) -> None:
+        # The reader holds the socket open too; shut it down so the other side sees EOF now.
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._reader.close()
+        self.sock.close()
+
+
+def scenario_cost(store: DurationStore, scenario: str) -> float:
+    """Longest recorded duration of any test of `scenario`, e.g. test_complete_checkout_flow[TC01-firefox]."""
+    costs = [seconds for nodeid, seconds in store.durations.items()
+             if f"[{scenario}]" in nodeid or f"[{scenario}-" in nodeid]
+    return max(costs) if costs else DEFAULT_COST
+
+
+# --- coordinator ----------------------------------------------------------------
+
+class Coordinator:
+    """Queue of scenarios, what each worker holds, and the merged results directory."""
+
+    def __init__(self, scenarios: List[str], report_dir: str, run_id: str, max_attempts: int = 2):
+        self.pending = deque(scenarios)
+        self.total = len(scenarios)
+        self.report_dir = report_dir
+        self.run_id = run_id
+        self.max_attempts = max_attempts
+        self.attempts: Dict[str, int] = {}
+        self.in_flight: Dict[str, str] = {}      # scenario -> worker
+        self.results: Dict[str, dict] = {}
+        self.workers = 0
+        self.cond = threading.Condition()
+        os.makedirs(os.path.join(report_dir, MANIFEST_DIR), exist_ok=True)
+
+    @property
+    def finished(self) -> bool:
+        return len(self.results) == self.total
+
+    def connect(self, worker: str) -> None:
+        with self.cond:
+            self.workers += 1
+        logger.info(f"Worker {worker} connected")
+
+    def next_for(self, worker: str) -> Optional[str]:
+        """The next scenario for `worker`; waits while others might still hand theirs back."""
+        with self.cond:
+            while not self.pending and self.in_flight:
+                self.cond.wait(1.0)
+            if not self.pending:
+                return None
+            scenario = self.pending.popleft()
+            self.in_flight[scenario] = worker
+            self.attempts[scenario] = self.attempts.get(scenario, 0) + 1
+            return scenario
+
+    def complete(self, worker: str, scenario: str, outcomes: Dict[str, str], seconds: float) -> None:
+        if not outcomes:
+            status = "missing"      # the worker collected no test of this scenario
+        elif "failed" in outcomes.values():
+            status = "failed"
+        elif set(outcomes.values()) == {"skipped"}:
+            status = "skipped"
+        else:
+            status = "passed"
+        with self.cond:
+            self.in_flight.pop(scenario, None)
+            self.results[scenario] = {"status": status, "worker": worker, "seconds": seconds,
+                                      "attempts": self.attempts.get(scenario, 1), "tests": outcomes}
+            self.cond.notify_all()
+        logger.info(f"{scenario} {status} on {worker} in {seconds:.1f}s ({len(self.results)}/{self.total})")
+
+    def disconnect(self, worker: str) -> None:
+        """Requeue the scenarios a worker held when it went away."""
+        with self.cond:
+            self.workers -= 1
+            for scenario in [s for s, w in self.in_flight.items() if w == worker]:
+                del self.in_flight[scenario]
+                if self.attempts[scenario] >= self.max_attempts:
+                    self.results[scenario] = {"status": "lost", "worker": worker, "seconds": 0.0,
+                                              "attempts": self.attempts[scenario], "tests": {}}
+                    logger.error(f"{scenario} lost with worker {worker} after {self.attempts[scenario]} attempts")
+                else:
+                    self.pending.appendleft(scenario)
+                    logger.warning(f"Worker {worker} went away; {scenario} is queued again")
+            self.cond.notify_all()
+
+    def give_up(self) -> None:
+        """No worker is left to run what is still queued."""
+        with self.cond:
+            while self.pending:
+                scenario = self.pending.popleft()
+                self.results[scenario] = {"status": "lost", "worker": None, "seconds": 0.0,
+                                          "attempts": self.attempts.get(scenario, 0), "tests": {}}
+            self.cond.notify_all()
+
+    def store_file(self, name: str, data: bytes) -> None:
+        path = os.path.join(self.report_dir, os.path.basename(name))
+        # Attachments are named by their hash (allure_store), so an existing one is the same file.
+        if "-attachment" in name and os.path.exists(path):
+            return
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def store_manifest(self, lines: List[str]) -> None:
+        with self.cond, open(os.path.join(self.report_dir, MANIFEST_DIR, f"{self.run_id}.jsonl"), "a",
+                             encoding="utf-8") as f:
+            f.writelines(line if line.endswith("\n") else line + "\n" for line in lines)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator: Coordinator = self.server.coordinator
+        self.request.settimeout(self.server.heartbeat_timeout)
+        channel = Channel(self.request)
+        hello = channel.receive()
+        if not hello or hello.get("type") != "hello":
+            return
+        worker = hello.get("worker") or str(self.client_address)
+        coordinator.connect(worker)
+        try:
+            channel.send({"type": "welcome", "run_id": coordinator.run_id,
+                          "heartbeat_seconds": self.server.heartbeat_seconds})
+            while True:
+                message = channel.receive()
+                if message is None:
+                    break
+                kind = message.get("type")
+                if kind == "next":
+                    scenario = coordinator.next_for(worker)
+                    channel.send({"type": "scenario", "scenario": scenario} if scenario else {"type": "done"})
+                elif kind == "file":
+                    coordinator.store_file(message["name"], base64.b64decode(message["data"]))
+                elif kind == "manifest":
+                    coordinator.store_manifest(message["lines"])
+                elif kind == "result":
+                    coordinator.complete(worker, message["scenario"], message.get("tests") or {},
+                                         message.get("seconds", 0.0))
+                elif kind == "bye":
+                    break
+        except OSError as e:
+            logger.warning(f"Connection to {worker} failed: {e}")
+        finally:
+            coordinator.disconnect(worker)
+            channel.close()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(coordinator: Coordinator, address: str, heartbeat_seconds: float, heartbeat_timeout: float):
+    """Start the socket server in a thread; returns it and the address workers connect to."""
+    family, bind = parse_address(address)
+    if family == socket.AF_UNIX:
+        if os.path.exists(bind):
+            os.remove(bind)
+        server = _UnixServer(bind, _Handler)
+        public = address
+    else:
+        server = _TCPServer(bind, _Handler)
+        host, port = server.server_address[:2]
+        public = f"{'127.0.0.1' if host in ('0.0.0.0', '') else host}:{port}"
+    server.coordinator = coordinator
+    server.heartbeat_seconds = heartbeat_seconds
+    server.heartbeat_timeout = heartbeat_timeout
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, public
+
+
+# --- worker ---------------------------------------------------------------------
+
+class WorkerPlugin:
+    """pytest plugin of a worker: runs the scenarios the coordinator hands out instead of the whole suite."""
+
+    def __init__(self, address: str, scenario_of: Callable, name: Optional[str] = None):
+        self.scenario_of = scenario_of
+        family, target = parse_address(address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.connect(target)
+        self.channel = Channel(sock)
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.channel.send({"type": "hello", "worker": self.name})
+        welcome = self.channel.receive()
+        if not welcome or welcome.get("type") != "welcome":
+            raise ConnectionError(f"Coordinator at {address} did not answer")
+        self.run_id = welcome["run_id"]
+        self.report_dir: Optional[str] = None
+        self._sent = set()
+        self._manifest_offset = 0
+        self._outcomes: Dict[str, str] = {}
+        self._stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(welcome.get("heartbeat_seconds", 10),), daemon=True).start()
+
+    def _heartbeat(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.channel.send({"type": "heartbeat"})
+            except OSError:
+                return
+
+    def _ship_results(self) -> None:
+        """Send the files of --alluredir written since the last call, and the new manifest lines."""
+        if not self.report_dir or not os.path.isdir(self.report_dir):
+            return
+        for entry in sorted(os.scandir(self.report_dir), key=lambda e: e.name):
+            if not entry.is_file() or entry.name.endswith(".tmp") or entry.name in self._sent:
+                continue
+            with open(entry.path, "rb") as f:
+                data = f.read()
+            self.channel.send({"type": "file", "name": entry.name, "data": base64.b64encode(data).decode("ascii")})
+            self._sent.add(entry.name)
+        manifest = os.path.join(self.report_dir, MANIFEST_DIR, f"{self.run_id}.jsonl")
+        if os.path.exists(manifest):
+            with open(manifest, "r", encoding="utf-8") as f:
+                f.seek(self._manifest_offset)
+                lines = [line for line in f.readlines() if line.endswith("\n")]
+            self._manifest_offset += sum(len(line.encode("utf-8")) for line in lines)
+            if lines:
+                self.channel.send({"type": "manifest", "lines": lines})
+
+    def pytest_runtest_logreport(self, report):
+        # Failed attempts the quarantine lane reran are reported as "rerun", not failed.
+        if report.failed:
+            self._outcomes[report.nodeid] = "failed"
+        elif report.when == "call" or report.skipped:
+            self._outcomes.setdefault(report.nodeid, report.outcome)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.config.option.collectonly:
+            return True
+        by_scenario: Dict[str, list] = {}
+        for item in session.items:
+            if "order_test_data" in getattr(item, "fixturenames", ()):
+                by_scenario.setdefault(self.scenario_of(item), []).append(item)
+        setupstate = session._setupstate
+        while True:
+            try:
+                self.channel.send({"type": "next"})
+            except OSError as e:
+                # Dropped, e.g. for missed heartbeats; the coordinator has queued our scenario again.
+                logger.warning(f"Lost the coordinator: {e}")
+                break
+            message = self.channel.receive()
+            if not message or message.get("type") != "scenario":
+                break
+            scenario = message["scenario"]
+            items = by_scenario.get(scenario, [])
+            started = time.perf_counter()
+            self._outcomes = {}
+            for index, item in enumerate(items):
+                if index == 0:
+                    # The previous scenario kept its module fixtures up; drop what this one does not share.
+                    setupstate.teardown_exact(item)
+                # Keep session and module fixtures (the browser) up for the next scenario.
+                nextitem = items[index + 1] if index + 1 < len(items) else item.parent
+                item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+                if session.shouldfail or session.shouldstop:
+                    break
+            try:
+                self._ship_results()
+                self.channel.send({"type": "result", "scenario": scenario, "tests": self._outcomes,
+                                   "seconds": time.perf_counter() - started})
+            except OSError as e:
+                logger.warning(f"Lost the coordinator before reporting {scenario}: {e}")
+                break
+            if session.shouldfail or session.shouldstop:
+                break
+        setupstate.teardown_exact(None)
+        return True
+
+    def pytest_unconfigure(self, config):
+        # Session-scoped containers and the report scaffolding are written at the very end.
+        try:
+            self._ship_results()
+            self.channel.send({"type": "bye"})
+        except OSError:
+            pass
+        self._stop.set()
+        self.channel.close()
+
+
+def configure_worker(config, scenario_of: Callable) -> WorkerPlugin:
+    """Connect to --coordinator and register the worker plugin; call first thing in pytest_configure.
+
+    Results go to --alluredir, or a temporary directory without it; only
+    files written during this session are sent.
+    """
+    worker = WorkerPlugin(config.getoption("coordinator"), scenario_of)
+    os.environ["RUN_ID"] = worker.run_id
+    if not getattr(config.option, "allure_report_dir", None):
+        config.option.allure_report_dir = tempfile.mkdtemp(prefix="allure-worker-")
+    worker.report_dir = os.path.abspath(config.option.allure_report_dir)
+    if os.path.isdir(worker.report_dir):
+        worker._sent.update(entry.name for entry in os.scandir(worker.report_dir))
+    config.pluginmanager.register(worker, "coordinator-worker")
+    return worker
+
+
+# --- command line ---------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the Excel scenarios to pytest workers on any host.")
+    parser.add_argument("--bind", default=None, help="host:port or unix:/path (default coordinator.bind)")
+    parser.add_argument("--spawn-local", type=int, default=0, metavar="N",
+                        help="also start N worker processes on this machine")
+    parser.add_argument("--alluredir", default=None, help="merged results (default reporting.allure_report_dir)")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER, help="arguments of the spawned workers")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    from utills import run_summary
+    from utills.excel_reader import ExcelReader
+
+    cfg = run_summary.load_config(CONFIG_PATH)
+    settings = cfg.get('coordinator') or {}
+    report_dir = args.alluredir or cfg['reporting']['allure_report_dir']
+    run_id = os.environ.setdefault("RUN_ID", datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
+
+    durations = DurationStore(DURATIONS_PATH)
+    scenarios = [str(row["Scenario"]) for row in ExcelReader(EXCEL_PATH).get_order_test_cases()]
+    scenarios.sort(key=lambda scenario: scenario_cost(durations, scenario), reverse=True)
+    coordinator = Coordinator(scenarios, report_dir, run_id, settings.get('max_attempts', 2))
+    bind = args.bind or settings.get('bind', "0.0.0.0:8765")
+    if args.spawn_local and not args.bind:
+        bind = "127.0.0.1:0"
+    server, address = serve(coordinator, bind, settings.get('heartbeat_seconds', 10),
+                            settings.get('heartbeat_timeout', 60))
+    logger.info(f"Serving {len(scenarios)} scenarios of run {run_id} on {address}")
+
+    procs = [subprocess.Popen([sys.executable, "-m", "pytest", f"--coordinator={address}", *args.pytest_args])
+             for _ in range(args.spawn_local)]
+    with coordinator.cond:
+        while not coordinator.finished:
+            coordinator.cond.wait(1.0)
+            if procs and all(proc.poll() is not None for proc in procs) and not coordinator.workers:
+                coordinator.give_up()
+    for proc in procs:
+        proc.wait()
+    server.shutdown()
+
+    counts: Dict[str, int] = {}
+    for scenario, result in sorted(coordinator.results.items()):
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        print(f"{scenario:<12}{result['status']:<9}{result['seconds']:>8.1f}s  {result['worker'] or '-'}"
+              f"  attempt {result['attempts']}")
+    print(", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+
+    # Workers on this machine share the timing directory; remote workers keep theirs.
+    run_summary.write(cfg, run_id, report_dir)
+    return 0 if set(counts) <= {"passed", "skipped"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# utills/data_provider.py - parse the test workbook once and serve rows from a binary cache
+
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CACHE_DIR = ".cache/data"
+CHUNK_SIZE = 1000
+
+
+class Record:
+    """Read-only, dict-like view of one sheet row.
+
+    All rows of a sheet share one column -> index map, so a record only holds
+    a reference to that map and a tuple of values.
+    """
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: Dict[str, int], values: Tuple):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._index.get(key)
+        return default if position is None else self._values[position]
+
+    def keys(self):
+        return self._index.keys()
+
+    def items(self):
+        return ((key, self._values[i]) for key, i in self._index.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Record):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __getstate__(self):
+        return self._index, self._values
+
+    def __setstate__(self, state):
+        self._index, self._values = state
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+class DataProvider:
+    """Serve workbook rows from an on-disk pickle cache.
+
+    The workbook is parsed with openpyxl in read-only mode the first time and
+    whenever its mtime/size changes and its SHA-256 no longer matches. Each
+    sheet is cached as a stream of pickled chunks so rows can be read lazily.
+    """
+
+    def __init__(self, file_path: str, cache_dir: str = CACHE_DIR):
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Excel file not found: {file_path}")
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        self._prefix = os.path.join(cache_dir, stem)
+        self._meta: Optional[dict] = None
+
+    @property
+    def meta(self) -> dict:
+        if self._meta is None:
+            self._meta = self._load_or_build()
+        return self._meta
+
+    @property
+    def sheets(self) -> List[str]:
+        return list(self.meta["sheets"])
+
+    @property
+    def content_hash(self) -> str:
+        return self.meta["sha256"]
+
+    def rows(self, sheet: str) -> Iterator[Record]:
+        """Yield the non-empty rows of `sheet` one chunk at a time."""
+        if sheet not in self.meta["sheets"]:
+            raise ValueError(f"Missing '{sheet}' sheet in Excel.")
+        with open(self._sheet_path(sheet), "rb") as f:
+            index = {name: i for i, name in enumerate(pickle.load(f))}
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                for values in chunk:
+                    yield Record(index, values)
+
+    def first(self, sheet: str) -> Record:
+        for record in self.rows(sheet):
+            return record
+        raise ValueError(f"Sheet '{sheet}' has no data rows.")
+
+    def get_order_test_cases(self) -> List[Record]:
+        return list(self.rows("Order_Details"))
+
+    def get_customer(self) -> Record:
+        return self.first("Customer_Details")
+
+    def _sheet_path(self, sheet: str) -> str:
+        return f"{self._prefix}.{sheet}.pkl"
+
+    def _meta_path(self) -> str:
+        return f"{self._prefix}.meta.json"
+
+    def _file_hash(self) -> str:
+        digest = hashlib.sha256()
+        with open(self.file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load_or_build(self) -> dict:
+        stat = os.stat(self.file_path)
+        meta = None
+        if os.path.exists(self._meta_path()):
+            try:
+                with open(self._meta_path(), "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = None
+        cached = meta is not None and all(os.path.exists(self._sheet_path(s)) for s in meta["sheets"])
+
+        if cached and meta["mtime"] == stat.st_mtime and meta["size"] == stat.st_size:
+            return meta
+        sha256 = self._file_hash()
+        if cached and meta["sha256"] == sha256:
+            meta.update(mtime=stat.st_mtime, size=stat.st_size)
+            self._write_meta(meta)
+            return meta
+        return self._build(stat, sha256)
+
+    def _build(self, stat: os.stat_result, sha256: str) -> dict:
+        from openpyxl import load_workbook
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        sheets = []
+        try:
+            for worksheet in workbook.worksheets:
+                self._write_sheet(worksheet)
+                sheets.append(worksheet.title)
+        finally:
+            workbook.close()
+        meta = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": sha256, "sheets": sheets}
+        self._write_meta(meta)
+        return meta
+
+    def _write_sheet(self, worksheet) -> None:
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, ())
+        columns = [i for i, name in enumerate(header) if name is not None]
+        tmp_path = f"{self._sheet_path(worksheet.title)}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump([str(header[i]).strip() for i in columns], f, protocol=pickle.HIGHEST_PROTOCOL)
+            chunk = []
+            for row in rows:
+                values = tuple(row[i] if i < len(row) else None for i in columns)
+                if all(value is None or str(value).strip() == "" for value in values):
+                    continue
+                chunk.append(values)
+                if len(chunk) >= CHUNK_SIZE:
+                    pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    chunk = []
+            if chunk:
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._sheet_path(worksheet.title))
+
+    def _write_meta(self, meta: dict) -> None:
+        tmp_path = f"{self._meta_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, self._meta_path())
+
+
+@lru_cache(maxsize=None)
+def get_data_provider(file_path: str) -> DataProvider:
+    """Process-wide provider, so the workbook is checked once per session."""
+    return DataProvider(file_path)
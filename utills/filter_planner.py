@@ -0,0 +1,99 @@
+# utills/filter_planner.py - apply layered-navigation filters with one navigation
+
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Every filter section of the category page with the label and href of each
+# option. The options are in the DOM while their section is collapsed, so no
+# clicks are needed. Swatches carry the label in aria-label; list options in
+# their text, minus the item count.
+SCRAPE_FILTERS_JS = """
+() => Array.from(document.querySelectorAll('div.filter-options-item')).map(section => {
+    const title = section.querySelector('div.filter-options-title');
+    return {
+        title: title ? title.textContent.trim() : '',
+        options: Array.from(section.querySelectorAll('a[href]')).map(a => {
+            let label = a.getAttribute('aria-label');
+            if (!label) {
+                const copy = a.cloneNode(true);
+                copy.querySelectorAll('.count').forEach(count => count.remove());
+                label = copy.textContent.trim();
+            }
+            return {label: label, href: a.href};
+        }),
+    };
+})
+"""
+
+# filter title (lower case) -> option label (lower case) -> (query parameter, value)
+FilterMap = Dict[str, Dict[str, Tuple[str, str]]]
+
+
+def category_key(url: str) -> str:
+    """The category URL without query and fragment."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _option_param(category_url: str, href: str) -> Optional[Tuple[str, str]]:
+    """The query parameter an option link adds to the category URL, e.g. ('color', '50')."""
+    if category_key(href) != category_key(category_url):
+        return None
+    current = dict(parse_qsl(urlsplit(category_url).query))
+    added = [(name, value) for name, value in parse_qsl(urlsplit(href).query) if current.get(name) != value]
+    return added[0] if len(added) == 1 else None
+
+
+class FilterPlanner:
+    """Resolves filter labels to the query parameters of Magento's layered navigation.
+
+    The filter block of a category is scraped once per session (`learn`) and
+    kept per category URL; `plan` then builds the filtered URL, so all filters
+    cost one page load instead of an expand click, an option click and a
+    reload each. A filter or option that is not in the map makes `plan`
+    return None, and the caller clicks through the filters as before.
+    """
+
+    def __init__(self):
+        self._maps: Dict[str, FilterMap] = {}
+
+    def knows(self, category_url: str) -> bool:
+        return category_key(category_url) in self._maps
+
+    def learn(self, category_url: str, sections: List[dict]) -> FilterMap:
+        filter_map: FilterMap = {}
+        for section in sections:
+            options = {}
+            for option in section.get("options", []):
+                param = _option_param(category_url, option.get("href", ""))
+                if param and option.get("label"):
+                    options[option["label"].strip().lower()] = param
+            if options:
+                filter_map[section.get("title", "").strip().lower()] = options
+        self._maps[category_key(category_url)] = filter_map
+        return filter_map
+
+    def _section(self, filter_map: FilterMap, filter_name: str) -> Optional[Dict[str, Tuple[str, str]]]:
+        name = filter_name.strip().lower()
+        if name in filter_map:
+            return filter_map[name]
+        # The click path finds the section by a case-insensitive substring of its title.
+        return next((options for title, options in filter_map.items() if name in title), None)
+
+    def plan(self, category_url: str, filters: Dict[str, str]) -> Optional[str]:
+        """URL of `category_url` with every filter applied, or None if any cannot be resolved."""
+        filter_map = self._maps.get(category_key(category_url))
+        if filter_map is None:
+            return None
+        params = parse_qsl(urlsplit(category_url).query)
+        for filter_name, option_text in filters.items():
+            options = self._section(filter_map, filter_name)
+            param = options.get(str(option_text).strip().lower()) if options else None
+            if param is None:
+                return None
+            params = [(name, value) for name, value in params if name != param[0]] + [param]
+        parts = urlsplit(category_url)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), ""))
+
+
+planner = FilterPlanner()
@@ -0,0 +1,96 @@
+# utills/forensics.py - Playwright traces and video kept only for failing tests
+
+import logging
+import os
+import shutil
+import tempfile
+from typing import List, Optional
+
+try:
+    import allure_commons
+except ImportError:  # allure is optional for the recorder itself
+    allure_commons = None
+
+_hookimpl = allure_commons.hookimpl if allure_commons else (lambda func: func)
+
+DEFAULT_VIDEO_SIZE = {"width": 640, "height": 360}
+
+
+class FailureTrace:
+    """Playwright tracing for one test, exported only if the test fails.
+
+    The trace stays in the driver while the test runs; Allure steps up to
+    `group_depth` levels deep (1 = steps in the test, 2 = also the page-object
+    steps inside them) open a trace group, so the viewer shows the same
+    outline as the report. `finish(failed=True)` writes the trace to a temp
+    file once; on a pass it is discarded without being serialized.
+    """
+
+    def __init__(self, context, group_depth: int = 2, snapshots: bool = True, screenshots: bool = True):
+        self.context = context
+        self.group_depth = group_depth
+        self.snapshots = snapshots
+        self.screenshots = screenshots
+        self.work_dir = tempfile.mkdtemp(prefix="trace-")
+        self._groups: List[bool] = []   # per open step: whether it opened a trace group
+        self._active = False
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        self.context.tracing.start(screenshots=self.screenshots, snapshots=self.snapshots, sources=False)
+        self._active = True
+        if allure_commons:
+            allure_commons.plugin_manager.register(self)
+
+    @_hookimpl
+    def start_step(self, uuid, title, params):
+        grouped = self._active and len(self._groups) < self.group_depth
+        if grouped:
+            try:
+                self.context.tracing.group(title)
+            except Exception as e:
+                self.logger.debug(f"Could not open trace group: {e}")
+                grouped = False
+        self._groups.append(grouped)
+
+    @_hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        if self._groups and self._groups.pop() and self._active:
+            try:
+                self.context.tracing.group_end()
+            except Exception as e:
+                self.logger.debug(f"Could not close trace group: {e}")
+
+    def finish(self, failed: bool) -> Optional[str]:
+        """Stop tracing; return the path of the exported trace if the test failed."""
+        if allure_commons and self._active:
+            allure_commons.plugin_manager.unregister(self)
+        if not self._active:
+            return None
+        self._active = False
+        path = os.path.join(self.work_dir, "trace.zip") if failed else None
+        try:
+            self.context.tracing.stop(path=path)
+        except Exception as e:
+            self.logger.debug(f"Could not stop tracing: {e}")
+            return None
+        return path
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+def video_options(settings: Optional[dict]) -> dict:
+    """`new_context` keyword arguments for low-resolution video, or {} if disabled."""
+    settings = settings or {}
+    if not settings.get("video"):
+        return {}
+    return {
+        "record_video_dir": tempfile.mkdtemp(prefix="videos-"),
+        "record_video_size": settings.get("video_size") or DEFAULT_VIDEO_SIZE,
+    }
+
+
+def item_failed(item) -> bool:
+    """True if setup or call of `item` failed (reports are stored on the item by conftest)."""
+    return any(getattr(getattr(item, f"rep_{when}", None), "failed", False) for when in ("setup", "call"))
@@ -0,0 +1,88 @@
+# utills/har_diff.py - show what changed between two recordings of a scenario
+#
+#   python -m utills.har_diff data/har/chromium/test_complete_checkout_flow_TC001_.har \
+#       /tmp/rerecord/chromium/test_complete_checkout_flow_TC001_.har
+#
+# Entries are matched on the same normalized key the replay uses, with the
+# har.volatile_params of config.yaml, so form keys and quote IDs do not show
+# up as changes.
+
+import argparse
+import hashlib
+import sys
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from utills.har_manager import VOLATILE_PARAMS, entry_key, load_entries, response_body
+
+CONFIG_PATH = "config/config.yaml"
+
+
+def configured_volatile_params(config_path: str = CONFIG_PATH) -> Tuple[str, ...]:
+    """har.volatile_params of config.yaml, as the replay uses them."""
+    import yaml
+
+    try:
+        with open(config_path, "r") as f:
+            settings = (yaml.safe_load(f) or {}).get("har") or {}
+    except OSError:
+        settings = {}
+    return tuple(settings.get("volatile_params", VOLATILE_PARAMS))
+
+
+def summarize(har_path: str, volatile_params=VOLATILE_PARAMS) -> Dict[Tuple[str, str, str], List[dict]]:
+    entries: Dict[Tuple[str, str, str], List[dict]] = OrderedDict()
+    for entry in load_entries(har_path):
+        body = response_body(entry)
+        entries.setdefault(entry_key(entry, volatile_params), []).append({
+            "status": entry["response"]["status"],
+            "mime": (entry["response"].get("content") or {}).get("mimeType", ""),
+            "size": len(body),
+            "sha1": hashlib.sha1(body).hexdigest()[:12],
+        })
+    return entries
+
+
+def diff(old_path: str, new_path: str, volatile_params=VOLATILE_PARAMS, ignore_body: bool = False) -> List[str]:
+    old, new = summarize(old_path, volatile_params), summarize(new_path, volatile_params)
+    lines = []
+    for key in old:
+        if key not in new:
+            lines.append(f"- {key[0]} {key[1]}")
+    for key in new:
+        if key not in old:
+            lines.append(f"+ {key[0]} {key[1]}")
+    for key in old:
+        if key not in new:
+            continue
+        before, after = old[key], new[key]
+        if len(before) != len(after):
+            lines.append(f"~ {key[0]} {key[1]}: called {len(before)}x -> {len(after)}x")
+        for b, a in zip(before, after):
+            changes = [f"{field} {b[field]} -> {a[field]}" for field in ("status", "mime")
+                       if b[field] != a[field]]
+            if not ignore_body and b["sha1"] != a["sha1"]:
+                changes.append(f"body {b['size']}B/{b['sha1']} -> {a['size']}B/{a['sha1']}")
+            if changes:
+                lines.append(f"~ {key[0]} {key[1]}: " + ", ".join(changes))
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Diff two HAR recordings of the same scenario.")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--ignore-body", action="store_true", help="only report added/removed calls and status/type changes")
+    parser.add_argument("--volatile-param", action="append", default=list(configured_volatile_params()),
+                        help="query/body parameter to ignore when matching requests (default har.volatile_params)")
+    args = parser.parse_args()
+
+    lines = diff(args.old, args.new, args.volatile_param, args.ignore_body)
+    for line in lines:
+        print(line)
+    print(f"\n{len(lines)} difference(s)")
+    return 1 if lines else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+# utills/har_manager.py - record and replay storefront traffic per test
+
+import base64
+import json
+import logging
+import os
+import re
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utills.network_rules import compile_rules
+
+HAR_DIR = "data/har"
+MODES = ("off", "record", "replay")
+# Used when config.yaml has no har.volatile_params.
+VOLATILE_PARAMS = ("form_key", "_", "uenc", "force_new_section_timestamp")
+
+# Path segments that carry per-session values (masked quote IDs, form keys,
+# encoded return URLs, static deploy versions).
+_PATH_RULES = [
+    (re.compile(r"/guest-carts/[^/]+"), "/guest-carts/{cart_id}"),
+    (re.compile(r"/carts/mine"), "/carts/{cart_id}"),
+    (re.compile(r"/form_key/[^/]+"), "/form_key/{form_key}"),
+    (re.compile(r"/uenc/[^/]+"), "/uenc/{uenc}"),
+    (re.compile(r"/version\d+/"), "/version{n}/"),
+]
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def normalize_url(url: str, volatile_params: Iterable[str] = ()) -> str:
+    """URL with per-session path segments and volatile query params replaced."""
+    parts = urlsplit(url)
+    path = parts.path
+    for pattern, replacement in _PATH_RULES:
+        path = pattern.sub(replacement, path)
+    volatile = set(volatile_params)
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in volatile))
+    return urlunsplit((parts.scheme, parts.netloc, path, query, ""))
+
+
+def normalize_body(body: Optional[str], volatile_params: Iterable[str] = ()) -> str:
+    """Request body with form keys and quote IDs dropped, in a stable order."""
+    if not body:
+        return ""
+    volatile = set(volatile_params) | {"cartId", "quote_id", "masked_id"}
+    try:
+        data = json.loads(body)
+    except ValueError:
+        pairs = parse_qsl(body, keep_blank_values=True)
+        return urlencode(sorted((k, v) for k, v in pairs if k not in volatile))
+
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k not in volatile}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    return json.dumps(strip(data), sort_keys=True)
+
+
+def entry_key(entry: dict, volatile_params: Iterable[str] = ()) -> Tuple[str, str, str]:
+    request = entry["request"]
+    body = (request.get("postData") or {}).get("text")
+    return request["method"], normalize_url(request["url"], volatile_params), normalize_body(body, volatile_params)
+
+
+def load_entries(har_path: str) -> List[dict]:
+    with open(har_path, "r", encoding="utf-8") as f:
+        return json.load(f)["log"]["entries"]
+
+
+def response_body(entry: dict) -> bytes:
+    content = entry["response"].get("content") or {}
+    text = content.get("text") or ""
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+class HarManager:
+    """Attach HAR recording or replay to a browser context.
+
+    In record mode all traffic of the context is written to
+    `<dir>/<browser>/<test name>.har` when the context closes, e.g.
+    `chromium/test_complete_checkout_flow_TC001_.har`; tests of the same
+    Excel scenario load different pages and each browser type sends its own
+    requests, so each test and browser has its own archive. In
+    replay mode the archive is served with `route_from_har`; requests to the
+    dynamic Magento endpoints are matched on a normalized key instead (form
+    keys, quote IDs and cache busters removed) and answered in recorded order.
+    """
+
+    def __init__(self, settings: Optional[Dict], mode: Optional[str] = None, har_dir: Optional[str] = None):
+        settings = settings or {}
+        self.mode = mode or settings.get("mode", "off")
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown HAR mode '{self.mode}', expected one of {MODES}")
+        self.har_dir = har_dir or settings.get("dir", HAR_DIR)
+        self.not_found = settings.get("not_found", "abort")
+        self.volatile_params = tuple(settings.get("volatile_params", VOLATILE_PARAMS))
+        self.dynamic_pattern = compile_rules(globs=settings.get("dynamic_endpoints", ()))
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def path_for(self, test_name: str, browser: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_name)
+        return os.path.join(self.har_dir, browser, f"{safe}.har")
+
+    def prepare(self, context, test_name: str, browser: str) -> None:
+        path = self.path_for(test_name, browser)
+        if self.mode == "record":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            context.route_from_har(path, update=True, update_content="embed", update_mode="full")
+            self.logger.info(f"Recording HAR for {test_name} on {browser} to {path}")
+        elif self.mode == "replay":
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"No HAR archive for {test_name}: {path}. Record it first.")
+            context.route_from_har(path, not_found=self.not_found)
+            if self.dynamic_pattern is not None:
+                # Registered after route_from_har, so it takes precedence for dynamic endpoints.
+                context.route(self.dynamic_pattern, self._dynamic_handler(path))
+            self.logger.info(f"Replaying HAR for {test_name} on {browser} from {path}")
+
+    def _dynamic_handler(self, path: str):
+        responses: Dict[Tuple[str, str, str], Deque[dict]] = defaultdict(deque)
+        for entry in load_entries(path):
+            if self.dynamic_pattern.search(entry["request"]["url"]):
+                responses[entry_key(entry, self.volatile_params)].append(entry)
+
+        def handler(route, request):
+            key = (request.method, normalize_url(request.url, self.volatile_params),
+                   normalize_body(request.post_data, self.volatile_params))
+            recorded = responses.get(key)
+            if not recorded:
+                self.logger.debug(f"No recorded response for {key}")
+                if self.not_found == "fallback":
+                    route.fallback()
+                else:
+                    route.abort()
+                return
+            # Repeated calls are answered in recorded order; the last answer is reused.
+            entry = recorded.popleft() if len(recorded) > 1 else recorded[0]
+            response = entry["response"]
+            route.fulfill(
+                status=response["status"],
+                headers={h["name"]: h["value"] for h in response.get("headers", [])
+                         if h["name"].lower() not in _SKIPPED_HEADERS},
+                body=response_body(entry),
+            )
+
+        return handler
@@ -0,0 +1,182 @@
+# utills/launch_profiles.py - named browser launch profiles and their cost per test
+
+import glob
+import json
+import os
+import statistics
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from utills.network_rules import ResourceTypeFilter
+
+DEFAULT_PROFILE = "fidelity"
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+
+
+@dataclass
+class LaunchProfile:
+    """How the browser is launched and what its pages load.
+
+    Profiles live under `launch.profiles` in config.yaml; `launch.profile`
+    (or --launch-profile) picks one. Without a `launch` section the
+    fidelity profile is the old behaviour: environment.headless and a full
+    HD viewport, nothing blocked.
+    """
+    name: str
+    headless: bool
+    viewport: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_VIEWPORT))
+    chromium_args: List[str] = field(default_factory=list)
+    slow_mo: int = 0
+    block_resource_types: List[str] = field(default_factory=list)
+    block_third_party_images: bool = False
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict], environment: dict) -> "LaunchProfile":
+        settings = settings or {}
+        name = settings.get('profile', DEFAULT_PROFILE)
+        profiles = settings.get('profiles') or {}
+        if name not in profiles and not (name == DEFAULT_PROFILE and not profiles):
+            raise ValueError(f"Unknown launch profile '{name}'; configured: {', '.join(profiles)}")
+        profile = profiles.get(name) or {}
+        return cls(
+            name=name,
+            headless=profile.get('headless', environment.get('headless', False)),
+            viewport=profile.get('viewport') or dict(DEFAULT_VIEWPORT),
+            chromium_args=list(profile.get('chromium_args') or []),
+            slow_mo=profile.get('slow_mo', 0),
+            block_resource_types=list(profile.get('block_resource_types') or []),
+            block_third_party_images=profile.get('block_third_party_images', False),
+        )
+
+    def launch_options(self, browser_type: str) -> dict:
+        """`browser_type.launch` keyword arguments; the Chromium flags only go to Chromium."""
+        options = {"headless": self.headless}
+        if self.slow_mo:
+            options["slow_mo"] = self.slow_mo
+        if self.chromium_args and browser_type == "chromium":
+            options["args"] = list(self.chromium_args)
+        return options
+
+    def resource_filter(self, base_url: str) -> Optional["ResourceTypeFilter"]:
+        """Filter for the blocked resource types; images are first-party on the host of `base_url`."""
+        if not self.block_resource_types and not self.block_third_party_images:
+            return None
+        from utills.network_rules import ResourceTypeFilter
+
+        host = urlsplit(base_url).hostname
+        return ResourceTypeFilter(self.block_resource_types, self.block_third_party_images,
+                                  [host] if host else [])
+
+
+def _proc_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def browser_rss_mb() -> Optional[float]:
+    """Summed RSS of this process' descendants: the Playwright driver and the browsers it started.
+
+    Uses psutil when it is installed, /proc otherwise; None elsewhere.
+    Shared pages are counted once per process, so this overstates the
+    footprint a little, but equally for every profile.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / 2 ** 20
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces and parentheses; the fields after it do not.
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total_kb = 0
+    pending = list(children.get(os.getpid(), []))
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        total_kb += _proc_rss_kb(pid)
+    return total_kb / 1024
+
+
+class ProfileRecorder:
+    """Duration and browser memory of every test in this process, per launch profile."""
+
+    def __init__(self):
+        self._rows: List[dict] = []
+
+    def record(self, profile: str, browser: str, test: str, scenario: str, seconds: float,
+               rss_mb: Optional[float]) -> None:
+        self._rows.append({"profile": profile, "browser": browser, "test": test, "scenario": scenario,
+                           "seconds": seconds, "rss_mb": rss_mb})
+
+    def flush(self, path: str) -> None:
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+def summarize(run_dir: str) -> Optional[str]:
+    """Per profile and browser: test count, median/max test time and median/max RSS, as text and JSON."""
+    samples: Dict[str, List[dict]] = {}
+    for path in glob.glob(os.path.join(run_dir, "profiles", "*.jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                samples.setdefault(f"{row['profile']}/{row['browser']}", []).append(row)
+    if not samples:
+        return None
+
+    summary = {}
+    lines = [f"{'profile/browser':<22}{'tests':>6}{'p50 s':>8}{'max s':>8}{'p50 RSS MB':>12}{'max RSS MB':>12}"]
+    for key, rows in sorted(samples.items()):
+        seconds = [r["seconds"] for r in rows]
+        rss = [r["rss_mb"] for r in rows if r["rss_mb"] is not None]
+        summary[key] = {
+            "tests": len(rows),
+            "p50_s": statistics.median(seconds),
+            "max_s": max(seconds),
+            "p50_rss_mb": statistics.median(rss) if rss else None,
+            "max_rss_mb": max(rss) if rss else None,
+        }
+        stats = summary[key]
+        lines.append(f"{key:<22}{stats['tests']:>6}{stats['p50_s']:>8.1f}{stats['max_s']:>8.1f}"
+                     f"{stats['p50_rss_mb'] or 0:>12.0f}{stats['max_rss_mb'] or 0:>12.0f}")
+
+    with open(os.path.join(run_dir, "profiles.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    report_path = os.path.join(run_dir, "profiles.txt")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return report_path
+
+
+recorder = ProfileRecorder()
@@ -0,0 +1,236 @@
+# utills/network_rules.py - request blocking and static asset caching for browser contexts
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+CACHE_DIR = ".cache/http"
+DEFAULT_STATIC_EXTENSIONS = ("js", "css", "woff", "woff2", "ttf", "otf", "eot",
+                             "png", "jpg", "jpeg", "gif", "svg", "webp", "ico")
+# Headers that describe the wire encoding of the original response, not the decoded body we replay.
+_HOP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+# File extensions a request of each Playwright resource type usually has.
+RESOURCE_TYPE_EXTENSIONS = {
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "mov"),
+    "image": ("png", "jpg", "jpeg", "gif", "svg", "webp", "avif", "ico"),
+    "stylesheet": ("css",),
+    "script": ("js", "mjs"),
+}
+_SCHEME = "^[a-z]+://"
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate a Playwright-style URL glob into a regex source.
+
+    `**` matches anything, `*` matches anything but '/'. The result only uses
+    syntax shared by Python and JavaScript, so Playwright can match it in the
+    driver without calling back into Python.
+    """
+    out = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        else:
+            out.append(re.escape(glob[i]).replace("\\-", "-"))
+            i += 1
+    return "^" + "".join(out) + "$"
+
+
+def domains_to_regex(domains: Iterable[str]) -> Optional[str]:
+    """One alternation matching the domains and all of their subdomains."""
+    escaped = sorted({re.escape(d.strip().lower().lstrip(".")) for d in domains if d and d.strip()})
+    if not escaped:
+        return None
+    return r"^[a-z]+://(?:[^/?#]*\.)?(?:" + "|".join(escaped) + r")(?::\d+)?(?:[/?#]|$)"
+
+
+def compile_rules(domains: Iterable[str] = (), globs: Iterable[str] = ()) -> Optional["re.Pattern"]:
+    """Compile every block rule into a single case-insensitive regex."""
+    sources = [glob_to_regex(g) for g in globs]
+    domain_source = domains_to_regex(domains)
+    if domain_source:
+        sources.insert(0, domain_source)
+    if not sources:
+        return None
+    return re.compile("|".join(f"(?:{s})" for s in sources), re.IGNORECASE)
+
+
+def static_asset_regex(extensions: Iterable[str]) -> "re.Pattern":
+    alternation = "|".join(sorted({re.escape(e.lower()) for e in extensions}))
+    return re.compile(r"^https?://[^?#]*\.(?:" + alternation + r")(?:[?#].*)?$", re.IGNORECASE)
+
+
+class ResourceTypeFilter:
+    """Abort requests by Playwright resource type, and images from third-party hosts.
+
+    `request.resource_type` is only known in Python, so the route is narrowed
+    in the driver to the URLs that can be one of the blocked types: their
+    usual file extensions, and every URL off the first-party hosts when
+    third-party images are blocked. Blocking a type without known extensions
+    routes every request through Python.
+    """
+
+    def __init__(self, resource_types: Iterable[str] = (), third_party_images: bool = False,
+                 first_party: Iterable[str] = ()):
+        self.resource_types = frozenset(resource_types)
+        first_party_source = domains_to_regex(first_party)
+        self.third_party_images = third_party_images and first_party_source is not None
+        self.first_party = re.compile(first_party_source, re.IGNORECASE) if self.third_party_images else None
+
+        sources = []
+        if any(t not in RESOURCE_TYPE_EXTENSIONS for t in self.resource_types):
+            sources.append(".*")
+        extensions = [ext for t in self.resource_types for ext in RESOURCE_TYPE_EXTENSIONS.get(t, ())]
+        if extensions:
+            sources.append(static_asset_regex(extensions).pattern)
+        if self.third_party_images:
+            sources.append(_SCHEME + "(?!" + first_party_source[len(_SCHEME):] + ")")
+        self.pattern = re.compile("|".join(f"(?:{s})" for s in sources), re.IGNORECASE) if sources else None
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        return resource_type == "image" and self.third_party_images and not self.first_party.match(url)
+
+
+@dataclass
+class NetworkStats:
+    blocked: int = 0
+    cached: int = 0
+    cached_bytes: int = 0
+    fetched: int = 0
+    fetched_bytes: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class StaticAssetCache:
+    """On-disk cache of static responses, shared by all workers."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_age_seconds: int = 86400):
+        self.cache_dir = cache_dir
+        self.max_age = max_age_seconds
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def get(self, url: str) -> Optional[Tuple[dict, str]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            if time.time() - os.path.getmtime(meta_path) > self.max_age:
+                return None
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return (meta, body_path) if os.path.exists(body_path) else None
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        with open(body_path + suffix, "wb") as f:
+            f.write(body)
+        os.replace(body_path + suffix, body_path)
+        meta = {"url": url, "status": status, "headers": headers}
+        with open(meta_path + suffix, "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+
+class InterceptionEngine:
+    """Install block rules and the static asset cache on a browser context.
+
+    Only requests matching the compiled block regex or the static asset regex
+    are routed; Playwright matches both in the driver, so all other traffic
+    never crosses into Python.
+    """
+
+    def __init__(self, block_pattern: Optional["re.Pattern"], static_pattern: Optional["re.Pattern"] = None,
+                 cache: Optional[StaticAssetCache] = None, resource_filter: Optional[ResourceTypeFilter] = None):
+        self.block_pattern = block_pattern
+        self.static_pattern = static_pattern if cache else None
+        self.cache = cache
+        self.resource_filter = resource_filter if resource_filter and resource_filter.pattern else None
+        self.stats = NetworkStats()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict],
+                    resource_filter: Optional[ResourceTypeFilter] = None) -> "InterceptionEngine":
+        settings = settings or {}
+        block = settings.get("block") or {}
+        static = settings.get("static_cache") or {}
+        cache = None
+        if static.get("enabled"):
+            cache = StaticAssetCache(static.get("dir", CACHE_DIR), static.get("max_age_seconds", 86400))
+        return cls(
+            compile_rules(block.get("domains", ()), block.get("globs", ())),
+            static_asset_regex(static.get("extensions", DEFAULT_STATIC_EXTENSIONS)),
+            cache,
+            resource_filter,
+        )
+
+    def install(self, context, static_cache: bool = True) -> None:
+        # Routes registered later take precedence, so blocking wins over caching.
+        if static_cache and self.static_pattern is not None:
+            context.route(self.static_pattern, self._serve_static)
+        if self.block_pattern is not None:
+            context.route(self.block_pattern, self._block)
+        if self.resource_filter is not None:
+            context.route(self.resource_filter.pattern, self._filter)
+
+    def reset_stats(self) -> NetworkStats:
+        stats, self.stats = self.stats, NetworkStats()
+        return stats
+
+    def _block(self, route) -> None:
+        self.stats.blocked += 1
+        route.abort()
+
+    def _filter(self, route, request) -> None:
+        if self.resource_filter.blocks(request.resource_type, request.url):
+            self.stats.blocked += 1
+            route.abort()
+        else:
+            route.fallback()
+
+    def _serve_static(self, route, request) -> None:
+        if request.method != "GET":
+            route.fallback()
+            return
+        hit = self.cache.get(request.url)
+        if hit:
+            meta, body_path = hit
+            self.stats.cached += 1
+            self.stats.cached_bytes += os.path.getsize(body_path)
+            route.fulfill(status=meta["status"], headers=meta["headers"], path=body_path)
+            return
+        try:
+            response = route.fetch()
+        except Exception as e:
+            self.logger.debug(f"Static fetch failed for {request.url}: {e}")
+            route.continue_()
+            return
+        body = response.body()
+        self.stats.fetched += 1
+        self.stats.fetched_bytes += len(body)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS}
+        if response.status == 200 and "no-store" not in response.headers.get("cache-control", ""):
+            self.cache.put(request.url, response.status, headers, body)
+        route.fulfill(status=response.status, headers=headers, body=body)
@@ -0,0 +1,46 @@
+# utills/parallel_runner.py - built-in scheduler for machines without pytest-xdist
+#
+#   python -m utills.parallel_runner -n 4 tests/test_main.py
+#
+# Starts N pytest processes, each running one cost-balanced shard of the
+# scenarios (--shard-index/--shard-count) with its own Playwright and browser.
+# Once all of them have exited, it writes the run-wide timing reports and
+# maintains the Allure store (utills.run_summary).
+
+import argparse
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from utills import run_summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the suite in N sharded pytest processes.")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    # Shards of one run share its timing directory and Allure run manifest.
+    os.environ.setdefault("RUN_ID", datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
+    procs = []
+    for index in range(args.workers):
+        cmd = [
+            sys.executable, "-m", "pytest",
+            f"--shard-index={index}", f"--shard-count={args.workers}",
+            *args.pytest_args,
+        ]
+        procs.append(subprocess.Popen(cmd))
+
+    exit_codes = [proc.wait() for proc in procs]
+    # pytest exit code 5 means "no tests collected", which is expected for
+    # shards that end up empty when there are more workers than scenarios.
+    failures = [code for code in exit_codes if code not in (0, 5)]
+    run_summary.write(run_summary.load_config(), os.environ["RUN_ID"],
+                      run_summary.option_value(args.pytest_args, "--alluredir"))
+    return max(failures) if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# utills/reruns.py - rerun a failed test in place, keeping its module and session fixtures up
+
+from typing import Optional
+
+from _pytest.runner import runtestprotocol
+
+
+def run(item, nextitem, reruns: int) -> bool:
+    """Run `item` up to `reruns` + 1 times; failed attempts before the last are reported as reruns.
+
+    Between attempts only the function-scoped fixtures are torn down. Once an
+    attempt passes, the higher-scoped ones are torn down as pytest would have
+    for `nextitem`. Returns True, as a pytest_runtest_protocol implementation.
+    """
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    for attempt in range(1, reruns + 2):
+        item.execution_count = attempt
+        last = attempt == reruns + 1
+        reports = runtestprotocol(item, nextitem=nextitem if last else item.parent, log=False)
+        retry = not last and any(report.failed for report in reports)
+        for report in reports:
+            if retry and report.failed:
+                report.outcome = "rerun"
+            item.ihook.pytest_runtest_logreport(report=report)
+        if not retry:
+            if not last:
+                item.session._setupstate.teardown_exact(nextitem)
+            break
+        item._initrequest()
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+
+def report_status(report) -> Optional[tuple]:
+    """pytest_report_teststatus result of a rerun attempt: counted as "rerun", shown as R."""
+    if report.outcome == "rerun":
+        return "rerun", "R", ("RERUN", {"yellow": True})
+    return None
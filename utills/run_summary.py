@@ -0,0 +1,72 @@
+# utills/run_summary.py - run-wide reports, written once every process of a run has finished
+#
+#   python -m utills.run_summary --run-id 2024-05-01_10-00-00 --alluredir report/allure-results
+#
+# A single pytest session writes these itself at the end. Sharded and
+# distributed runs leave them to utills.parallel_runner and utills.coordinator,
+# which call `write` after their workers have exited; run the module by hand
+# after shards started with --shard-index on their own.
+
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from utills import launch_profiles, timing
+
+CONFIG_PATH = "config/config.yaml"
+
+logger = logging.getLogger(__name__)
+
+
+def timing_run_dir(cfg: dict, run_id: str) -> str:
+    """Directory every process of run `run_id` writes its timing and launch-profile lines to."""
+    return os.path.join((cfg.get('timing') or {}).get('output_dir', 'report/timings'), run_id)
+
+
+def option_value(args: List[str], name: str) -> Optional[str]:
+    """Value of `name` in a pytest argument list, as `--name value` or `--name=value`."""
+    for index, arg in enumerate(args):
+        if arg == name and index + 1 < len(args):
+            return args[index + 1]
+        if arg.startswith(name + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+def write(cfg: dict, run_id: str, results_dir: Optional[str]) -> None:
+    """Timing and launch-profile reports of the whole run, then Allure store maintenance."""
+    run_dir = timing_run_dir(cfg, run_id)
+    if (cfg.get('timing') or {}).get('enabled', True):
+        report = timing.write_reports(run_dir, (cfg.get('timing') or {}).get('top_n', 15))
+        if report:
+            logger.info(f"Step timing report written to {report}")
+    report = launch_profiles.summarize(run_dir)
+    if report:
+        logger.info(f"Launch profile report written to {report}")
+    store = cfg['reporting'].get('store') or {}
+    if results_dir and store.get('enabled', True):
+        from utills import allure_store
+        allure_store.maintain(results_dir, store, run_id)
+
+
+def load_config(path: str = CONFIG_PATH) -> dict:
+    import yaml
+
+    with open(path, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write the run-wide reports of a sharded run.")
+    parser.add_argument("--run-id", default=os.environ.get("RUN_ID"), required="RUN_ID" not in os.environ)
+    parser.add_argument("--alluredir", default=None, help="Allure results of the run, for store maintenance")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    write(load_config(), args.run_id, args.alluredir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# utills/scenario_planner.py - prefix tree of the Excel scenarios, to run shared navigation once
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from utills.catalog_index import category_key, product_key
+
+# Steps that only navigate, so their result can be forked into several contexts
+# through storage_state and a URL: the category page, then the product the
+# filters lead to. Everything after them changes the server-side cart (quote),
+# which a copied cookie would share between rows, so each row runs it alone.
+STEPS = ("category", "filters")
+
+
+def category_path(row) -> list:
+    return [row.get("Category"), row.get("SubCategory1"), row.get("SubCategory2")]
+
+
+def filters_of(row) -> Dict[str, object]:
+    return {
+        "SIZE": row["Size"],
+        "COLOR": row["Color"],
+        "Pattern": row["Pattern"],
+        "Climate": row["Climate"],
+        "Style": row["Style"]
+    }
+
+
+def step_key(step: str, row) -> str:
+    if step == "category":
+        return category_key(category_path(row)) or ""
+    return product_key(category_path(row), filters_of(row)) or ""
+
+
+@dataclass
+class Fork:
+    """Browser state after a shared step: where the page was and its storage_state."""
+    step: str
+    url: str
+    state: dict
+
+
+@dataclass
+class PrefixNode:
+    step: Optional[str]          # None for the root
+    key: Optional[str]
+    rows: List = field(default_factory=list)
+    children: Dict[str, "PrefixNode"] = field(default_factory=dict)
+
+    def walk(self):
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+
+def build_tree(rows: List) -> PrefixNode:
+    """Rows grouped by category, then by category and filters; children keep the rows' first-seen order."""
+    root = PrefixNode(None, None)
+    for row in rows:
+        node = root
+        node.rows.append(row)
+        for step in STEPS:
+            key = step_key(step, row)
+            node = node.children.setdefault(key, PrefixNode(step, key))
+            node.rows.append(row)
+    return root
+
+
+def order(rows: List) -> List:
+    """Rows with the same prefix next to each other, so a warm catalog index serves the later ones."""
+    return [row for node in build_tree(rows).walk() if not node.children for row in node.rows]
+
+
+def step_counts(rows: List) -> Tuple[int, int]:
+    """Shared steps run without and with the tree: every row runs all, versus once per node."""
+    return len(rows) * len(STEPS), sum(1 for node in build_tree(rows).walk() if node.step is not None)
@@ -0,0 +1,174 @@
+# utills/screenshot_pipeline.py - background encoding and storage of log screenshots
+
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Deque, Dict, List, Optional
+
+EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+
+@dataclass
+class Frame:
+    test_id: str
+    title: str
+    path: str
+    size: int
+    digest: str
+
+
+class ScreenshotPipeline:
+    """Encode, deduplicate and store screenshots on a background thread.
+
+    The test thread only grabs the raw bytes from the browser and calls
+    `submit`, which never blocks: when the bounded queue is full the frame is
+    dropped. Frames are kept within a per-test and a per-run disk budget by
+    deleting the oldest ones.
+    """
+
+    def __init__(self, output_dir: str, fmt: str = "jpeg", quality: int = 70, queue_size: int = 64,
+                 dedupe: bool = True, per_test_budget_mb: float = 5, per_run_budget_mb: float = 100):
+        self.logger = logging.getLogger(__name__)
+        self._image = None
+        if fmt == "webp":
+            try:
+                from PIL import Image  # only needed for WebP output
+                self._image = Image
+            except ImportError:
+                self.logger.warning("Pillow is not installed; falling back to JPEG screenshots.")
+                fmt = "jpeg"
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {fmt}")
+        self.output_dir = output_dir
+        self.format = fmt
+        self.quality = quality
+        self.dedupe = dedupe
+        self.per_test_budget = int(per_test_budget_mb * 1024 * 1024)
+        self.per_run_budget = int(per_run_budget_mb * 1024 * 1024)
+        self.dropped = 0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._frames: Dict[str, Deque[Frame]] = {}
+        self._run_frames: Deque[Frame] = deque()
+        self._run_bytes = 0
+        self._last_digest: Dict[str, str] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._worker, name="screenshot-pipeline", daemon=True)
+        os.makedirs(output_dir, exist_ok=True)
+        self._thread.start()
+
+    @property
+    def capture_type(self) -> str:
+        """Image type to request from Playwright; WebP is converted from PNG."""
+        return "png" if self.format in ("png", "webp") else "jpeg"
+
+    @property
+    def extension(self) -> str:
+        return EXTENSIONS[self.format]
+
+    def capture(self, page, test_id: str, title: str) -> None:
+        """Take a viewport screenshot on the calling thread and queue it."""
+        options = {"type": self.capture_type}
+        if self.capture_type == "jpeg":
+            options["quality"] = self.quality
+        self.submit(test_id, title, page.screenshot(**options))
+
+    def submit(self, test_id: str, title: str, data: bytes) -> None:
+        try:
+            self._queue.put_nowait((test_id, title, data))
+        except queue.Full:
+            self.dropped += 1
+            self.logger.debug(f"Screenshot queue full, dropped frame: {title}")
+
+    def flush(self) -> None:
+        """Block until every queued frame has been written."""
+        self._queue.join()
+
+    def frames_for(self, test_id: str) -> List[Frame]:
+        """Flush and return the frames of a test that are still on disk."""
+        self.flush()
+        with self._lock:
+            frames = list(self._frames.pop(test_id, ()))
+            self._last_digest.pop(test_id, None)
+        return [frame for frame in frames if os.path.exists(frame.path)]
+
+    def close(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._store(*item)
+            except Exception as e:
+                self.logger.debug(f"Failed to store screenshot: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _encode(self, data: bytes) -> bytes:
+        if self.format != "webp":
+            return data
+        out = BytesIO()
+        self._image.open(BytesIO(data)).save(out, format="WEBP", quality=self.quality)
+        return out.getvalue()
+
+    def _store(self, test_id: str, title: str, data: bytes) -> None:
+        digest = hashlib.sha1(data).hexdigest()
+        if self.dedupe and self._last_digest.get(test_id) == digest:
+            return
+        self._last_digest[test_id] = digest
+
+        encoded = self._encode(data)
+        self._sequence += 1
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_id)[-80:]
+        path = os.path.join(self.output_dir, f"{slug}_{self._sequence:05d}.{self.extension}")
+        with open(path, "wb") as f:
+            f.write(encoded)
+
+        frame = Frame(test_id, title, path, len(encoded), digest)
+        with self._lock:
+            frames = self._frames.setdefault(test_id, deque())
+            frames.append(frame)
+            self._run_frames.append(frame)
+            self._run_bytes += frame.size
+            while sum(f.size for f in frames) > self.per_test_budget and len(frames) > 1:
+                self._evict(frames[0])
+            while self._run_bytes > self.per_run_budget and len(self._run_frames) > 1:
+                self._evict(self._run_frames[0])
+
+    def _evict(self, frame: Frame) -> None:
+        test_frames = self._frames.get(frame.test_id)
+        if test_frames and frame in test_frames:
+            test_frames.remove(frame)
+        if frame in self._run_frames:
+            self._run_frames.remove(frame)
+            self._run_bytes -= frame.size
+        try:
+            os.remove(frame.path)
+        except OSError:
+            pass
+
+
+def create_pipeline(output_dir: str, settings: Optional[dict]) -> ScreenshotPipeline:
+    """Build a pipeline from the `screenshots` section of config.yaml."""
+    settings = settings or {}
+    return ScreenshotPipeline(
+        output_dir,
+        fmt=settings.get("format", "jpeg"),
+        quality=settings.get("quality", 70),
+        queue_size=settings.get("queue_size", 64),
+        dedupe=settings.get("dedupe", True),
+        per_test_budget_mb=settings.get("per_test_budget_mb", 5),
+        per_run_budget_mb=settings.get("per_run_budget_mb", 100),
+    )
@@ -0,0 +1,86 @@
+# utills/sharding.py to split scenarios across parallel workers
+
+import json
+import os
+import statistics
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+DEFAULT_COST = 60.0
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Strip the '@group' suffix pytest-xdist appends under --dist loadgroup."""
+    return nodeid.split("@", 1)[0]
+
+
+class DurationStore:
+    """Per-test durations from earlier runs, kept as an exponential moving average."""
+
+    def __init__(self, path: str, smoothing: float = 0.5):
+        self.path = path
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        self._current: Dict[str, float] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.durations = json.load(f)
+            except (OSError, ValueError):
+                self.durations = {}
+
+    def cost(self, nodeid: str) -> float:
+        """Expected duration of a test; unknown tests get the median known cost."""
+        nodeid = base_nodeid(nodeid)
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+        if self.durations:
+            return statistics.median(self.durations.values())
+        return DEFAULT_COST
+
+    def add(self, nodeid: str, seconds: float) -> None:
+        """Accumulate one phase (setup/call/teardown) of a test in this run."""
+        nodeid = base_nodeid(nodeid)
+        self._current[nodeid] = self._current.get(nodeid, 0.0) + seconds
+
+    def save(self) -> None:
+        if not self._current:
+            return
+        # Re-read first: sibling shard processes may have saved in the meantime.
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    self.durations.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+        for nodeid, seconds in self._current.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = seconds if previous is None else (
+                self.smoothing * seconds + (1 - self.smoothing) * previous
+            )
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.durations, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def balance(nodeids: Iterable[str], store: DurationStore, shards: int,
+            key: Optional[Callable[[str], str]] = None) -> Dict[str, int]:
+    """Assign tests to `shards` bins, longest first into the lightest bin (LPT).
+
+    Tests with the same `key` are kept in one bin. Ties are broken by node id
+    so every worker computes the same assignment.
+    """
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for nodeid in nodeids:
+        groups[key(nodeid) if key else nodeid].append(nodeid)
+    costs = {group: sum(store.cost(n) for n in members) for group, members in groups.items()}
+    loads = [0.0] * shards
+    assignment = {}
+    for group in sorted(groups, key=lambda g: (-costs[g], g)):
+        shard = min(range(shards), key=lambda i: (loads[i], i))
+        for nodeid in groups[group]:
+            assignment[nodeid] = shard
+        loads[shard] += costs[group]
+    return assignment
@@ -0,0 +1,112 @@
+# utills/state_snapshots.py - pre-warmed storage_state files for new browser contexts
+
+import logging
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from pageobject.account_page import AccountPage
+from pageobject.product_page import ProductPage
+from utills.basepage import BasePage
+
+CACHE_DIR = ".cache/state"
+
+# Each snapshot is built on top of the previous layer.
+LAYERS = ("consent", "customer", "cart")
+
+
+class StateSnapshotManager:
+    """Build, cache and hand out Playwright storage_state files.
+
+    Snapshots are layered: "consent" has the consent popup accepted,
+    "customer" adds a signed-in session from config `credentials.valid` and
+    "cart" adds the product configured under `state_snapshots.cart`. Files are
+    cached per worker under `.cache/state` and rebuilt once older than
+    `state_snapshots.ttl_seconds`.
+
+    A snapshot with a cart shares the server-side quote of the session that
+    built it, so it suits read-only checkout tests, not order placement. A
+    test that changes the quote (a coupon, say) marks the snapshot consumed,
+    and it is discarded afterwards so the next test gets a new quote.
+    """
+
+    def __init__(self, browser, config: Dict, cache_dir: str = CACHE_DIR):
+        self.browser = browser
+        self.config = config
+        self.settings = config.get("state_snapshots") or {}
+        self.ttl = self.settings.get("ttl_seconds", 3600)
+        self.cache_dir = cache_dir
+        self.worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self.logger = logging.getLogger(__name__)
+        self._builders: Dict[str, Callable] = {
+            "consent": self._build_consent,
+            "customer": self._build_customer,
+            "cart": self._build_cart,
+        }
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}-{self.worker}.json")
+
+    def is_fresh(self, name: str) -> bool:
+        path = self.path_for(name)
+        return os.path.exists(path) and time.time() - os.path.getmtime(path) < self.ttl
+
+    def get(self, name: Optional[str]) -> Optional[str]:
+        """Return the storage_state path for `name`, building it if needed."""
+        if not name:
+            return None
+        if name not in self._builders:
+            raise ValueError(f"Unknown storage state snapshot: {name}. Expected one of {LAYERS}")
+        if not self.is_fresh(name):
+            self._build(name)
+        return self.path_for(name)
+
+    def discard(self, name: str) -> None:
+        """Drop `name` and the layers built on it; the next `get` rebuilds them."""
+        for layer in LAYERS[LAYERS.index(name):]:
+            try:
+                os.remove(self.path_for(layer))
+            except OSError:
+                pass
+
+    def _build(self, name: str) -> None:
+        layer = LAYERS.index(name)
+        base = None
+        if layer > 0:
+            previous = LAYERS[layer - 1]
+            if previous == "customer" and not self.settings.get("login", False):
+                previous = "consent"
+            base = self.get(previous)
+
+        started = time.perf_counter()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        context = self.browser.new_context(storage_state=base, locale="en-US")
+        context.set_default_timeout(self.config["timeouts"]["element_wait"])
+        try:
+            page = context.new_page()
+            self._builders[name](page)
+            tmp_path = f"{self.path_for(name)}.{os.getpid()}.tmp"
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, self.path_for(name))
+            self.logger.info(f"Built '{name}' storage state in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            self.logger.error(f"Failed to build '{name}' storage state: {e}")
+            raise
+        finally:
+            context.close()
+
+    def _build_consent(self, page) -> None:
+        BasePage(page).navigate(self.config["urls"]["base_url"], timeout=self.config["timeouts"]["page_load"])
+
+    def _build_customer(self, page) -> None:
+        credentials = self.config["credentials"]["valid"]
+        AccountPage(page, self.config).login(credentials["username"], credentials["password"])
+
+    def _build_cart(self, page) -> None:
+        cart = self.settings.get("cart") or {}
+        if not cart.get("product_url"):
+            raise ValueError("state_snapshots.cart.product_url must be set to build the 'cart' snapshot.")
+        BasePage(page, skip_consent=True).navigate(cart["product_url"], timeout=self.config["timeouts"]["page_load"])
+        product = ProductPage(page, self.config)
+        product.customize_product_selection(cart.get("size"), cart.get("color"), cart.get("quantity"))
+        product.add_product_to_cart_and_verify()
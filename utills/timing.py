@@ -0,0 +1,254 @@
+# utills/timing.py - low-overhead timing of BasePage actions and Allure steps
+
+import glob
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import allure_commons
+except ImportError:  # allure is optional for the recorder itself
+    allure_commons = None
+
+_hookimpl = allure_commons.hookimpl if allure_commons else (lambda func: func)
+# Before allure-pytest's own stop_step, which closes the step result.
+_hookimpl_first = allure_commons.hookimpl(tryfirst=True) if allure_commons else (lambda func: func)
+
+
+def _open_step_result(uuid):
+    """The allure-pytest step result of `uuid` while the step is still open, or None."""
+    if allure_commons is None:
+        return None
+    for plugin in allure_commons.plugin_manager.get_plugins():
+        reporter = getattr(plugin, "allure_logger", None)
+        if reporter is not None:
+            return reporter.get_item(uuid)
+    return None
+
+
+class ActionTimer:
+    """Splits one BasePage call into time spent waiting and time spent acting."""
+    __slots__ = ("wait_ns", "action_ns", "retries")
+
+    def __init__(self):
+        self.wait_ns = 0
+        self.action_ns = 0
+        self.retries = 0
+
+    @contextmanager
+    def wait(self) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.wait_ns += time.perf_counter_ns() - started
+
+    @contextmanager
+    def act(self) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.action_ns += time.perf_counter_ns() - started
+
+
+class StepRecorder:
+    """Collects timing records for the running test.
+
+    BasePage reports actions through `action()`; every `allure.step` is
+    timed through the allure_commons `start_step`/`stop_step` hooks, so page
+    objects need no changes. Records are plain tuples until the test ends.
+    When a step stops, its duration and the wait/action time of the actions
+    inside it are also added to the step in the Allure report as parameters.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.scenario: Optional[str] = None
+        self.test: Optional[str] = None
+        self.attempt = 0
+        self._records: List[tuple] = []
+        self._open_steps: Dict[str, tuple] = {}
+
+    def start_test(self, test: str, scenario: str, attempt: int = 0) -> None:
+        self.test, self.scenario, self.attempt = test, scenario, attempt
+        self._records = []
+        self._open_steps = {}
+
+    @contextmanager
+    def action(self, name: str, selector: Optional[str], page_object: str) -> Iterator[ActionTimer]:
+        timer = ActionTimer()
+        if not self.enabled:
+            yield timer
+            return
+        started = time.perf_counter_ns()
+        status = "passed"
+        try:
+            yield timer
+        except BaseException:
+            status = "failed"
+            raise
+        finally:
+            total = time.perf_counter_ns() - started
+            if self._open_steps:
+                # Counted toward the innermost open step.
+                spent = self._open_steps[next(reversed(self._open_steps))][2]
+                spent[0] += timer.wait_ns
+                spent[1] += timer.action_ns
+            self._records.append(("action", name, selector, page_object, timer.wait_ns, timer.action_ns,
+                                  total, timer.retries, status))
+
+    @_hookimpl
+    def start_step(self, uuid, title, params):
+        if self.enabled:
+            self._open_steps[uuid] = (title, time.perf_counter_ns(), [0, 0])
+
+    @_hookimpl_first
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        opened = self._open_steps.pop(uuid, None)
+        if opened is None:
+            return
+        title, started, (wait_ns, action_ns) = opened
+        total_ns = time.perf_counter_ns() - started
+        self._records.append(("step", title, None, None, wait_ns, action_ns, total_ns, 0,
+                              "failed" if exc_type else "passed"))
+        self._annotate(uuid, total_ns, wait_ns, action_ns)
+
+    @staticmethod
+    def _annotate(uuid, total_ns: int, wait_ns: int, action_ns: int) -> None:
+        step = _open_step_result(uuid)
+        if step is None:
+            return
+        from allure_commons.model2 import Parameter
+
+        timings = {"duration_ms": total_ns}
+        if wait_ns or action_ns:
+            timings.update(wait_ms=wait_ns, action_ms=action_ns)
+        step.parameters.extend(Parameter(name=name, value=f"{ns / 1e6:.0f}") for name, ns in timings.items())
+
+    def finish_test(self) -> List[dict]:
+        """Return the records of the current test as dicts and reset."""
+        rows = []
+        for record in self._records:
+            kind, name, selector, page_object, wait_ns, action_ns, total_ns, retries, status = record
+            rows.append({
+                "scenario": self.scenario,
+                "test": self.test,
+                "attempt": self.attempt,
+                "kind": kind,
+                "name": name,
+                "selector": selector,
+                "page_object": page_object,
+                "wait_ms": wait_ns / 1e6,
+                "action_ms": action_ns / 1e6,
+                "total_ms": total_ns / 1e6,
+                "retries": retries,
+                "status": status,
+            })
+        self._records = []
+        return rows
+
+
+recorder = StepRecorder()
+
+
+def write_jsonl(path: str, rows: List[dict]) -> None:
+    if not rows:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def format_table(rows: List[dict]) -> str:
+    lines = [f"{'kind':<7}{'total ms':>10}{'wait ms':>10}{'action ms':>11}  name / selector"]
+    for row in rows:
+        target = row["name"] + (f" [{row['selector']}]" if row["selector"] else "")
+        lines.append(f"{row['kind']:<7}{row['total_ms']:>10.1f}{row['wait_ms']:>10.1f}{row['action_ms']:>11.1f}  {target}")
+    return "\n".join(lines)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """`pct`-th percentile of a non-empty list, as the nearest sample (no interpolation)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _step_group(name: str) -> str:
+    # Step titles embed their arguments ("Applying discount code: 20poff"); group on the template part.
+    return name.split(":", 1)[0].strip()
+
+
+def aggregate(run_dir: str) -> Dict[str, Dict[str, dict]]:
+    """Aggregate every worker's JSON lines in `run_dir` by selector and by step."""
+    samples: Dict[str, Dict[str, List[dict]]] = {"selector": defaultdict(list), "step": defaultdict(list)}
+    for path in glob.glob(os.path.join(run_dir, "*.jsonl")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                if row["kind"] == "action":
+                    samples["selector"][f"{row['name']} {row['selector'] or ''}".strip()].append(row)
+                else:
+                    samples["step"][_step_group(row["name"])].append(row)
+
+    summary: Dict[str, Dict[str, dict]] = {}
+    for group, entries in samples.items():
+        summary[group] = {}
+        for key, rows in entries.items():
+            totals = [r["total_ms"] for r in rows]
+            summary[group][key] = {
+                "count": len(rows),
+                "total_ms": sum(totals),
+                "wait_ms": sum(r["wait_ms"] for r in rows),
+                "action_ms": sum(r["action_ms"] for r in rows),
+                "p50_ms": percentile(totals, 50),
+                "p95_ms": percentile(totals, 95),
+                "max_ms": max(totals),
+                "scenarios": sorted({str(r["scenario"]) for r in rows}),
+            }
+    return summary
+
+
+def write_reports(run_dir: str, top_n: int = 15) -> Optional[str]:
+    """Write the slowest-selectors/steps report and an OpenMetrics file."""
+    summary = aggregate(run_dir)
+    if not any(summary.values()):
+        return None
+
+    lines = []
+    for group, title in (("selector", "Slowest selectors"), ("step", "Slowest steps")):
+        lines.append(f"{title} (by total time across all scenarios)")
+        lines.append(f"{'total s':>9}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'wait %':>8}  {group}")
+        ranked = sorted(summary.get(group, {}).items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:top_n]
+        for key, stats in ranked:
+            wait_pct = 100 * stats["wait_ms"] / stats["total_ms"] if stats["total_ms"] else 0
+            lines.append(f"{stats['total_ms'] / 1000:>9.2f}{stats['count']:>7}{stats['p50_ms']:>9.0f}"
+                         f"{stats['p95_ms']:>9.0f}{wait_pct:>7.0f}%  {key}")
+        lines.append("")
+    report_path = os.path.join(run_dir, "summary.txt")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+    metrics = [
+        "# TYPE qa_step_duration_seconds summary",
+        "# UNIT qa_step_duration_seconds seconds",
+        "# HELP qa_step_duration_seconds Time spent in BasePage actions and Allure steps.",
+    ]
+    for group, entries in summary.items():
+        for key, stats in entries.items():
+            label = key.replace("\\", "\\\\").replace('"', '\\"')
+            metrics.append(f'qa_step_duration_seconds_count{{kind="{group}",name="{label}"}} {stats["count"]}')
+            metrics.append(f'qa_step_duration_seconds_sum{{kind="{group}",name="{label}"}} {stats["total_ms"] / 1000:.6f}')
+            metrics.append(f'qa_step_duration_seconds{{kind="{group}",name="{label}",quantile="0.95"}} '
+                           f'{stats["p95_ms"] / 1000:.6f}')
+    metrics.append("# EOF")
+    with open(os.path.join(run_dir, "metrics.prom"), "w", encoding="utf-8") as f:
+        f.write("\n".join(metrics) + "\n")
+
+    with open(os.path.join(run_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return report_path